@@ -194,5 +194,25 @@ class Dashboard(tkinter.Toplevel):
                 that will be added to the drone table.
         """
         self._clear_table(self.drone_tree)
-        for entry in drone_dict:
-            self.add_drone_to_tree(entry)
+        drones = list(drone_dict)
+        fleets = {id(drone.fleet): drone.fleet for drone in drones}
+        if len(fleets) != 1:
+            for entry in drones:
+                self.add_drone_to_tree(entry)
+            return
+        # the stats of the whole fleet are read from its arrays at once
+        rows = drones[0].fleet.rows(drone.slot for drone in drones)
+        for drone, (state, health, _, moves) in zip(drones, rows):
+            self.drone_tree.insert(
+                "",
+                "end",
+                text="Listbox",
+                values=(
+                    id(drone),
+                    type(drone).__name__,
+                    state,
+                    health,
+                    drone.capacity,
+                    moves,
+                ),
+            )
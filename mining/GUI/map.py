@@ -3,9 +3,12 @@ import tkinter
 from typing import TYPE_CHECKING
 
 from mining.utils import Icon, Tile
+from mining.utils.grid import Grid
 
 if TYPE_CHECKING:
-    from mining.utils import Map
+    from typing import List
+
+    from mining.utils import Coordinate, Map
 
 
 class GUI_Map(tkinter.Toplevel):
@@ -32,6 +35,10 @@ class GUI_Map(tkinter.Toplevel):
         self.minsize(600, 600)
         self.title(title)
         self.physical_map = physical_map
+        # the version of the physical map last drawn, none at first
+        self._drawn_version = -1
+        # the coordinates drones were last drawn on
+        self._drawn_zerg: List[Coordinate] = []
         self.log = tkinter.Text(
             self, width=100, height=100, state="normal", wrap="none"
         )
@@ -48,12 +55,35 @@ class GUI_Map(tkinter.Toplevel):
         self.log.config(state="disabled")
 
     def update(self, zerg_on_map) -> None:
-        """Update GUI Map with any updated coordinates."""
-        for tile in self.physical_map._stored_tiles_.values():
+        """Update GUI Map with any updated coordinates.
+
+        Only the tiles that changed since the last update are redrawn,
+        along with the tiles drones were drawn on. If the map can no longer
+        list its changes that far back, every tile of the chunks with a
+        change is redrawn.
+        """
+        physical_map = self.physical_map
+        version = self._drawn_version
+        changes = physical_map.changes_since(version)
+        self._drawn_version = physical_map.version
+        if changes is None:
+            dirty = physical_map.dirty_chunks(version)
+            changes = [
+                coordinate
+                for coordinate in physical_map
+                if Grid.chunk_key(*coordinate) in dirty
+            ]
+        tiles = (
+            physical_map.get(coordinate, Tile(coordinate))
+            for coordinate in dict.fromkeys([*self._drawn_zerg, *changes])
+        )
+        for tile in tiles:
             self.translate_tile(tile)
+        self._drawn_zerg = []
         for drone_info in zerg_on_map:
             zerg_tile = Tile(drone_info["coord"], drone_info["icon"])
             self.translate_tile(zerg_tile)
+            self._drawn_zerg.append(zerg_tile.coordinate)
 
     def translate_tile(self, new_tile: "Tile") -> None:
         """Write a tile object to the map.
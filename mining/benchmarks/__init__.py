@@ -0,0 +1 @@
+"""Benchmarks for the mining package, runnable as modules."""
@@ -0,0 +1,165 @@
+"""Micro-benchmarks of coordinate operations and of packed searches.
+
+The neighbour and direction lookups of Coordinate and of packed keys are
+timed against LegacyCoordinate, the way Coordinate computed them before
+packed keys were added. A* on a random map is timed with a weight function
+on coordinates, and on packed keys as Map runs it. Run with ``python -m
+mining.benchmarks.coordinates``.
+"""
+import argparse
+import random
+import timeit
+from functools import singledispatchmethod
+from typing import Callable, List, NamedTuple, Tuple
+
+from mining.utils import Coordinate, Directions, Icon, Map, Tile, packed
+from mining.utils.search import astar
+
+
+class LegacyCoordinate(NamedTuple):
+    """Coordinate as it was before packed keys, for comparison."""
+
+    x: int
+    y: int
+
+    @singledispatchmethod
+    def direction(self, other_coord: "LegacyCoordinate") -> str:
+        """Get the direction of another coordinate on the same axis."""
+        return self.direction(*other_coord)
+
+    @direction.register
+    def _(self, x: int, y: int) -> str:
+        x_offset, y_offset = (x - self.x, y - self.y)
+        if x_offset and y_offset:
+            return ""
+        if x_offset > 0:
+            return "east"
+        elif x_offset < 0:
+            return "west"
+        elif y_offset < 0:
+            return "north"
+        elif y_offset > 0:
+            return "south"
+        return "center"
+
+    def cardinals(self) -> Tuple["LegacyCoordinate", ...]:
+        """Return the coordinates to the north, south, east and west."""
+        return (
+            self.translate_one(Directions.NORTH),
+            self.translate_one(Directions.SOUTH),
+            self.translate_one(Directions.EAST),
+            self.translate_one(Directions.WEST),
+        )
+
+    def translate_one(self, direction: Directions) -> "LegacyCoordinate":
+        """Translate this coordinate a step in a direction."""
+        if direction == Directions.NORTH:
+            return self._replace(y=self.y - 1)
+        elif direction == Directions.SOUTH:
+            return self._replace(y=self.y + 1)
+        elif direction == Directions.EAST:
+            return self._replace(x=self.x + 1)
+        elif direction == Directions.WEST:
+            return self._replace(x=self.x - 1)
+        return LegacyCoordinate(*self)
+
+
+def per_call(function: Callable[[], object], number: int) -> float:
+    """Return the best time of a call, in nanoseconds, over 5 repeats."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e9
+
+
+def operations(number: int) -> List[Tuple[str, str, float]]:
+    """Time neighbour and direction lookups.
+
+    Args:
+        number (int): The calls timed per repeat.
+
+    Returns:
+        List[Tuple[str, str, float]]: Rows of operation, implementation and
+            nanoseconds per call.
+    """
+    legacy, other_legacy = LegacyCoordinate(5, 7), LegacyCoordinate(6, 7)
+    coord, other = Coordinate(5, 7), Coordinate(6, 7)
+    key, other_key = packed.pack(*coord), packed.pack(*other)
+    return [
+        ("cardinals", "legacy", per_call(legacy.cardinals, number)),
+        ("cardinals", "Coordinate", per_call(coord.cardinals, number)),
+        (
+            "cardinals",
+            "packed",
+            per_call(lambda: packed.neighbors(key), number),
+        ),
+        (
+            "direction",
+            "legacy",
+            per_call(lambda: legacy.direction(other_legacy), number),
+        ),
+        (
+            "direction",
+            "Coordinate",
+            per_call(lambda: coord.direction(other), number),
+        ),
+        (
+            "direction",
+            "packed",
+            per_call(lambda: packed.direction(key, other_key), number),
+        ),
+    ]
+
+
+def searches(size: int, queries: int, seed: int) -> List[Tuple[str, float]]:
+    """Time A* with a coordinate weight function and on packed keys.
+
+    Args:
+        size (int): The width and height of the random map.
+        queries (int): The number of searches.
+        seed (int): The random seed.
+
+    Returns:
+        List[Tuple[str, float]]: Rows of search and milliseconds per search.
+    """
+    rng = random.Random(seed)
+    map_ = Map(0, 0.0)
+    for y in range(size):
+        for x in range(size):
+            icon = Icon.WALL if rng.random() < 0.2 else Icon.EMPTY
+            map_.add_tile(Tile(Coordinate(x, y), icon))
+    pathable = [coord for coord in map_ if map_.weight(coord) is not None]
+    pairs = [rng.sample(pathable, 2) for _ in range(queries)]
+
+    def timed(search: Callable[[Coordinate, Coordinate], object]) -> float:
+        seconds = min(
+            timeit.repeat(
+                lambda: [search(start, end) for start, end in pairs],
+                number=1,
+                repeat=3,
+            )
+        )
+        return seconds / queries * 1000
+
+    return [
+        ("coordinates", timed(lambda s, e: astar(s, e, map_.weight))),
+        ("packed", timed(map_.astar)),
+    ]
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and print tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    parser.add_argument("--size", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(f"{'operation':<12}{'implementation':<16}{'per call':>12}")
+    for operation, implementation, nanoseconds in operations(args.number):
+        print(f"{operation:<12}{implementation:<16}{nanoseconds:>9,.0f} ns")
+    print(f"\nA* on a {args.size}x{args.size} map, {args.queries} searches")
+    print(f"{'weights on':<16}{'per search':>12}")
+    for name, milliseconds in searches(args.size, args.queries, args.seed):
+        print(f"{name:<16}{milliseconds:>9,.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Record a simulated game to a log, or time replaying one.
+
+Replaying runs only the Overlord and its drones, so the time reported is
+the time spent deciding, without the engine. Record with ``python -m
+mining.benchmarks.replay game.log --record --size 100`` and replay with
+``python -m mining.benchmarks.replay game.log``.
+"""
+import argparse
+import os
+import time
+
+from mining.simulation import Simulation, generate_world, replay
+from mining.simulation.dashboard import HeadlessDashboard
+from mining.zerg_units import Overlord
+
+
+def record(
+    path: str, size: int, map_seed: int, ticks: int, minerals: int, seed: int
+) -> int:
+    """Play a game on a generated map and record it to a log.
+
+    Args:
+        path (str): The log file to write.
+        size (int): The width and height of the map.
+        map_seed (int): The random seed of the map.
+        ticks (int): The ticks to play.
+        minerals (int): The refined minerals given to the Overlord.
+        seed (int): The random seed of the Overlord.
+
+    Returns:
+        int: The ticks played.
+    """
+    overlord = Overlord(ticks, minerals, HeadlessDashboard(), seed=seed)
+    world = generate_world(0, size, size, map_seed)
+    with open(path, "wb") as log:
+        return Simulation([world], ticks, minerals, overlord, log).run().ticks
+
+
+def main() -> None:
+    """Parse arguments, then record a game or time its replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log")
+    parser.add_argument(
+        "--record", action="store_true", help="play a game to the log"
+    )
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--map-seed", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--minerals", type=int, default=60)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.record:
+        ticks = record(
+            args.log,
+            args.size,
+            args.map_seed,
+            args.ticks,
+            args.minerals,
+            args.seed,
+        )
+        verb = "recorded"
+    else:
+        with open(args.log, "rb") as log:
+            ticks = replay(log)
+        verb = "replayed"
+    seconds = time.perf_counter() - start
+    print(
+        f"{ticks} ticks {verb} in {seconds:,.2f}s, "
+        f"{os.path.getsize(args.log):,} byte log"
+    )
+
+
+if __name__ == "__main__":
+    main()
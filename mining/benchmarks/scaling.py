@@ -0,0 +1,176 @@
+"""Scaling benchmarks for whole simulated games.
+
+The Overlord and its drones play generated maps of growing size with
+growing fleets, and the time spent in the hot paths is recorded. Run with
+``python -m mining.benchmarks.scaling --sizes 20 200 2000 --fleets 2 50 500``.
+"""
+import argparse
+import time
+import tracemalloc
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Tuple
+from unittest import mock
+
+from mining.simulation import Simulation, generate_world
+from mining.simulation.dashboard import HeadlessDashboard
+from mining.utils import Map
+from mining.zerg_units import Overlord, Strategy
+from mining.zerg_units.drones import Drone, MinerDrone, ScoutDrone
+
+# the functions timed, by the column they are reported in
+TIMED: List[Tuple[str, type, str]] = [
+    ("dijkstra", Map, "dijkstra"),
+    ("nearest", Map, "nearest_paths"),
+    ("reserve", Map, "reserve_path"),
+    ("context", Map, "apply_contexts"),
+    ("updates", Overlord, "_process_updates"),
+    ("action", Drone, "action"),
+    ("action", ScoutDrone, "action"),
+    ("action", MinerDrone, "action"),
+]
+COLUMNS = list(dict.fromkeys(column for column, _, _ in TIMED))
+
+
+class Profile:
+    """Total wall clock time spent in each timed function.
+
+    Times are inclusive of the calls a function makes, but a function that
+    is re-entered, such as an action calling the action it overrides, is
+    only counted once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profile."""
+        self.seconds: Dict[str, float] = dict.fromkeys(COLUMNS, 0.0)
+        self._depth: Dict[str, int] = dict.fromkeys(COLUMNS, 0)
+
+    def timed(self, column: str, function: Callable) -> Callable:
+        """Wrap a function so its time is added to a column."""
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if self._depth[column]:
+                return function(*args, **kwargs)
+            self._depth[column] += 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds[column] += time.perf_counter() - start
+                self._depth[column] -= 1
+
+        return wrapper
+
+    def patches(self) -> Iterator[mock._patch]:
+        """Yield a patch for every timed function."""
+        for column, owner, name in TIMED:
+            yield mock.patch.object(
+                owner, name, self.timed(column, vars(owner)[name])
+            )
+
+
+def build_overlord(fleet: int, ticks: int) -> Overlord:
+    """Build an Overlord that buys a fleet of drones with base stats.
+
+    Args:
+        fleet (int): The number of drones, at least 2.
+        ticks (int): The ticks the Overlord will play.
+
+    Returns:
+        Overlord: The Overlord.
+    """
+    strategy = Strategy(max_drones=fleet)
+    return Overlord(
+        ticks,
+        fleet * strategy.drone_cost,
+        HeadlessDashboard(),
+        strategy,
+    )
+
+
+def run_game(
+    size: int,
+    fleet: int,
+    ticks: int,
+    seed: int,
+    memory: bool,
+    **options,
+) -> Tuple[str, ...]:
+    """Play one game and return a row of formatted results.
+
+    Args:
+        size (int): The width and height of the map.
+        fleet (int): The number of drones.
+        ticks (int): The ticks to play.
+        seed (int): The random seed of the map.
+        memory (bool): Whether to trace peak memory, which slows the game.
+        **options: The densities passed on to the map generator.
+
+    Returns:
+        Tuple[str, ...]: Size, fleet, ticks per second, seconds in every
+            timed column, peak memory and minerals mined.
+    """
+    world = generate_world(0, size, size, seed, **options)
+    simulation = Simulation(
+        [world], ticks, 0, build_overlord(fleet, ticks)
+    )
+    profile = Profile()
+    patches = list(profile.patches())
+    for patch in patches:
+        patch.start()
+    if memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = simulation.run()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else 0
+    finally:
+        if memory:
+            tracemalloc.stop()
+        for patch in patches:
+            patch.stop()
+    return (
+        f"{size}x{size}",
+        f"{fleet}",
+        f"{ticks / seconds:,.1f}",
+        *(f"{profile.seconds[column]:.2f}" for column in COLUMNS),
+        f"{peak / 2**20:,.1f}" if memory else "-",
+        f"{result.minerals_mined}",
+    )
+
+
+def main() -> None:
+    """Parse arguments, play every game and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--fleets", type=int, nargs="+", default=[2, 12])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walls", type=float, default=0.15)
+    parser.add_argument("--acid", type=float, default=0.05)
+    parser.add_argument("--minerals", type=float, default=0.03)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip tracing peak memory"
+    )
+    args = parser.parse_args()
+    header = ("map", "drones", "ticks/s", *COLUMNS, "peak MiB", "mined")
+    print(f"{args.ticks} ticks per game, seconds spent in each column")
+    print("".join(f"{name:>11}" for name in header))
+    for size in args.sizes:
+        for fleet in args.fleets:
+            row = run_game(
+                size,
+                fleet,
+                args.ticks,
+                args.seed,
+                not args.no_memory,
+                wall_density=args.walls,
+                acid_fraction=args.acid,
+                mineral_density=args.minerals,
+            )
+            print("".join(f"{cell:>11}" for cell in row), flush=True)
+
+
+if __name__ == "__main__":
+    main()
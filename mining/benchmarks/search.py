@@ -0,0 +1,187 @@
+"""Node expansion and timing benchmarks for A* and Jump Point Search.
+
+Both searches run on the same random start and end points of an open map
+and of a cave-like map. Run with ``python -m mining.benchmarks.search``.
+"""
+import argparse
+import heapq
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils import search
+
+Searcher = Callable[[Coordinate, Coordinate], List[Coordinate]]
+
+
+def open_icons(size: int, rng: random.Random) -> Dict[Coordinate, Icon]:
+    """Return a mostly empty map with scattered walls and acid pools."""
+    icons = {}
+    for y in range(size):
+        for x in range(size):
+            roll = rng.random()
+            if roll < 0.03:
+                icons[Coordinate(x, y)] = Icon.WALL
+            elif roll < 0.04:
+                icons[Coordinate(x, y)] = Icon.ACID
+            else:
+                icons[Coordinate(x, y)] = Icon.EMPTY
+    return icons
+
+
+def cave_icons(size: int, rng: random.Random) -> Dict[Coordinate, Icon]:
+    """Return a cave-like map grown with a cellular automaton.
+
+    Random walls are smoothed over a few generations, leaving winding
+    passages with dead ends, and some of the floor is turned to acid.
+    """
+    walls = {
+        Coordinate(x, y): rng.random() < 0.45
+        for y in range(size)
+        for x in range(size)
+    }
+    for _ in range(4):
+        walls = {
+            coord: sum(
+                walls.get(Coordinate(coord.x + dx, coord.y + dy), True)
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+            )
+            >= 5
+            for coord in walls
+        }
+    return {
+        coord: Icon.WALL
+        if wall
+        else Icon.ACID
+        if rng.random() < 0.03
+        else Icon.EMPTY
+        for coord, wall in walls.items()
+    }
+
+
+def build_map(icons: Dict[Coordinate, Icon]) -> Map:
+    """Build a Map from icons."""
+    map_ = Map(0, 0.0)
+    for coord, icon in icons.items():
+        map_.add_tile(Tile(coord, icon))
+    return map_
+
+
+def random_pairs(
+    map_: Map, count: int, rng: random.Random
+) -> List[Tuple[Coordinate, Coordinate]]:
+    """Return start and end points on connected, pathable tiles."""
+    pathable = [coord for coord in map_ if map_.weight(coord) is not None]
+    pairs: List[Tuple[Coordinate, Coordinate]] = []
+    while len(pairs) < count:
+        start, end = rng.sample(pathable, 2)
+        if map_.astar(start, end):
+            pairs.append((start, end))
+    return pairs
+
+
+def measure(
+    searcher: Searcher, pairs: List[Tuple[Coordinate, Coordinate]]
+) -> Tuple[float, int, int]:
+    """Run a search over every pair.
+
+    Args:
+        searcher (Searcher): The search to run.
+        pairs (List[Tuple[Coordinate, Coordinate]]): Start and end points.
+
+    Returns:
+        Tuple[float, int, int]: The wall clock time in seconds, and the
+            average number of nodes queued and tiles looked up per search.
+    """
+    pushes = 0
+
+    def counting_push(heap, item):
+        nonlocal pushes
+        pushes += 1
+        heapq.heappush(heap, item)
+
+    with mock.patch.object(search, "heappush", counting_push):
+        for start, end in pairs:
+            searcher(start, end)
+    weight, packed_weight = Map.weight, Map.packed_weight
+    lookups = 0
+
+    def counting_weight(self, coordinate):
+        nonlocal lookups
+        lookups += 1
+        return weight(self, coordinate)
+
+    def counting_packed_weight(self, key):
+        nonlocal lookups
+        lookups += 1
+        return packed_weight(self, key)
+
+    with mock.patch.object(
+        Map, "weight", counting_weight
+    ), mock.patch.object(Map, "packed_weight", counting_packed_weight):
+        for start, end in pairs:
+            searcher(start, end)
+    begin = time.perf_counter()
+    for start, end in pairs:
+        searcher(start, end)
+    seconds = time.perf_counter() - begin
+    return seconds, pushes // len(pairs), lookups // len(pairs)
+
+
+def run(size: int, queries: int, seed: int) -> List[Tuple[str, ...]]:
+    """Run every benchmark, returning rows of formatted results.
+
+    Args:
+        size (int): The width and height of the maps.
+        queries (int): The number of searches per map.
+        seed (int): The random seed.
+
+    Returns:
+        List[Tuple[str, ...]]: Rows of map, search, time, nodes queued and
+            tiles looked up.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for name, generate in (("open", open_icons), ("cave", cave_icons)):
+        map_ = build_map(generate(size, rng))
+        pairs = random_pairs(map_, queries, rng)
+        for search_name, jump_points in (("A*", False), ("JPS", True)):
+            seconds, queued, looked_up = measure(
+                lambda start, end: map_.astar(start, end, jump_points),
+                pairs,
+            )
+            rows.append(
+                (
+                    name,
+                    search_name,
+                    f"{seconds / queries * 1000:,.2f} ms",
+                    f"{queued:,}",
+                    f"{looked_up:,}",
+                )
+            )
+    return rows
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rows = run(args.size, args.queries, args.seed)
+    print(f"{args.size}x{args.size} maps, {args.queries} searches each")
+    print(f"{'map':<6}{'search':<8}{'per search':>14}{'queued':>10}"
+          f"{'looked up':>12}")
+    for name, search_name, per_search, queued, looked_up in rows:
+        print(
+            f"{name:<6}{search_name:<8}{per_search:>14}{queued:>10}"
+            f"{looked_up:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
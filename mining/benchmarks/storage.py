@@ -0,0 +1,170 @@
+"""Memory and look up benchmarks for map tile storage.
+
+Compares the grid backed Map against the dict of Tile objects it replaced.
+Run with ``python -m mining.benchmarks.storage --size 200``.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from mining.utils import Coordinate, Icon, Map, Tile
+
+T = TypeVar("T")
+
+# mostly open ground, with some undiscovered placeholder tiles
+ICON_CHOICES: List[Optional[Icon]] = [Icon.EMPTY] * 12 + [Icon.WALL] * 4
+ICON_CHOICES += [Icon.ACID, Icon.MINERAL, None, None]
+
+
+def random_icons(size: int, seed: int) -> Dict[Coordinate, Optional[Icon]]:
+    """Return random icons for a square map centered on the origin.
+
+    Args:
+        size (int): The width and height of the map.
+        seed (int): The random seed.
+
+    Returns:
+        Dict[Coordinate, Optional[Icon]]: Every coordinate mapped to its
+            icon, None if undiscovered.
+    """
+    rng = random.Random(seed)
+    half = size // 2
+    return {
+        Coordinate(x, y): rng.choice(ICON_CHOICES)
+        for y in range(-half, size - half)
+        for x in range(-half, size - half)
+    }
+
+
+def build_dict(
+    icons: Dict[Coordinate, Optional[Icon]]
+) -> Dict[Coordinate, Tile]:
+    """Build the dict of Tile objects that Map used to store."""
+    return {coord: Tile(coord, icon) for coord, icon in icons.items()}
+
+
+def build_map(icons: Dict[Coordinate, Optional[Icon]]) -> Map:
+    """Build a grid backed Map."""
+    map_ = Map(0, 0.0)
+    for coord, icon in icons.items():
+        map_.add_tile(Tile(coord, icon))
+    return map_
+
+
+def measure_memory(build: Callable[[], T]) -> Tuple[T, int]:
+    """Build a structure and measure the memory it holds on to.
+
+    Args:
+        build (Callable[[], T]): Creates the structure.
+
+    Returns:
+        Tuple[T, int]: The structure and its size in bytes.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def measure_time(run: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall clock time of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int, lookups: int, seed: int) -> List[Tuple[str, str, str]]:
+    """Run every benchmark, returning rows of (name, dict, grid) results.
+
+    Args:
+        size (int): The width and height of the map.
+        lookups (int): The number of random look ups to time.
+        seed (int): The random seed.
+
+    Returns:
+        List[Tuple[str, str, str]]: The formatted results.
+    """
+    icons = random_icons(size, seed)
+    tiles, dict_bytes = measure_memory(lambda: build_dict(icons))
+    map_, grid_bytes = measure_memory(lambda: build_map(icons))
+    rng = random.Random(seed)
+    coords = rng.choices(list(icons), k=lookups)
+    weights = Map.NODE_WEIGHTS
+
+    def dict_get():
+        for coord in coords:
+            tiles.get(coord, None)
+
+    def grid_get():
+        for coord in coords:
+            map_.get(coord, None)
+
+    def dict_weight():
+        for coord in coords:
+            weights.get(tiles[coord].icon)
+
+    def grid_weight():
+        for coord in coords:
+            map_.weight(coord)
+
+    def dict_scan():
+        return [tile for tile in tiles.values() if not tile.discovered]
+
+    def grid_scan():
+        return map_.get_unexplored_tiles()
+
+    def per_second(seconds: float) -> str:
+        return f"{lookups / seconds:,.0f}/s"
+
+    return [
+        (
+            "memory",
+            f"{dict_bytes / 1024:,.0f} KiB",
+            f"{grid_bytes / 1024:,.0f} KiB",
+        ),
+        (
+            "bytes per tile",
+            f"{dict_bytes / len(icons):,.1f}",
+            f"{grid_bytes / len(icons):,.1f}",
+        ),
+        (
+            "get",
+            per_second(measure_time(dict_get)),
+            per_second(measure_time(grid_get)),
+        ),
+        (
+            "weight",
+            per_second(measure_time(dict_weight)),
+            per_second(measure_time(grid_weight)),
+        ),
+        (
+            "unexplored scan",
+            f"{measure_time(dict_scan) * 1000:,.2f} ms",
+            f"{measure_time(grid_scan) * 1000:,.2f} ms",
+        ),
+    ]
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rows = run(args.size, args.lookups, args.seed)
+    print(f"{args.size}x{args.size} map")
+    print(f"{'benchmark':<16}{'dict':>18}{'grid':>18}")
+    for name, dict_result, grid_result in rows:
+        print(f"{name:<16}{dict_result:>18}{grid_result:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""A headless simulation of mining expeditions, for running without Tk."""
+from .dashboard import HeadlessDashboard
+from .engine import Simulation, SimulationResult
+from .generator import generate_lines, generate_world
+from .recording import Recorder, ReplayMismatch, read_log, replay
+from .world import World
@@ -0,0 +1,32 @@
+"""A dashboard that displays nothing, for running without a display."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Mapping
+
+    from mining.utils import Map
+    from mining.zerg_units.drones import Drone
+
+
+class HeadlessDashboard:
+    """A dashboard that displays nothing, for running without a display.
+
+    It has the methods of the GUI Dashboard that the Overlord calls.
+    """
+
+    def create_map_gui(self, physical_map: Map) -> None:
+        """Ignore a new map."""
+
+    def update_maps(
+        self, drone_positions: Iterable[Mapping[str, Any]]
+    ) -> None:
+        """Ignore drone positions."""
+
+    def update_drone_table(self, drone_dict: Iterable[Drone]) -> None:
+        """Ignore drone statistics."""
+
+    def insert_action(self, action: str, tick: str) -> None:
+        """Ignore an action."""
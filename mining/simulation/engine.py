@@ -0,0 +1,191 @@
+"""A headless, tick driven engine that plays the Overlord against maps."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from mining.utils import Directions, Icon
+from mining.zerg_units import Overlord
+
+from .dashboard import HeadlessDashboard
+from .recording import Recorder
+from .world import World
+
+if TYPE_CHECKING:
+    from typing import BinaryIO, Dict, List, Optional, Sequence
+
+    from mining.zerg_units.drones import Drone
+
+
+class SimulationResult(NamedTuple):
+    """The outcome of a simulation.
+
+    Attributes:
+        ticks (int): The ticks that were played.
+        minerals_mined (int): Minerals returned to the Overlord.
+        minerals_by_map (Dict[int, int]): Minerals returned, by map id.
+        drones_lost (int): Drones that died on a map.
+        actions (List[str]): The Overlord's action at every tick.
+    """
+
+    ticks: int
+    minerals_mined: int
+    minerals_by_map: Dict[int, int]
+    drones_lost: int
+    actions: List[str]
+
+
+class Simulation:
+    """A headless, tick driven engine that plays the Overlord against maps.
+
+    Every tick, the Overlord acts first, and its DEPLOY or RETURN action is
+    applied. Then every deployed drone acts once per move it has, and its
+    direction is applied: drones walk onto free traversable tiles, mine a
+    mineral they walk into, and take acid damage when they walk onto acid.
+    Acid damage is dealt to the fleet in one batch at the end of the tick.
+    Minerals count once their drone is returned from the deployment zone.
+    A game can be recorded to a log, and replayed without the engine.
+    """
+
+    def __init__(
+        self,
+        worlds: Sequence[World],
+        total_ticks: int,
+        refined_minerals: int,
+        overlord: Optional[Overlord] = None,
+        log: Optional[BinaryIO] = None,
+    ) -> None:
+        """Initialize the simulation and register every map.
+
+        Args:
+            worlds (Sequence[World]): The maps to play on.
+            total_ticks (int): Ticks to play.
+            refined_minerals (int): Minerals given to the Overlord.
+            overlord (Optional[Overlord], optional): The Overlord to play.
+                Defaults to a new Overlord with a headless dashboard.
+            log (Optional[BinaryIO], optional): Where to record the game,
+                so it can be replayed. Defaults to not recording it.
+        """
+        self.worlds = {world.map_id: world for world in worlds}
+        self.total_ticks = total_ticks
+        if overlord is None:
+            overlord = Overlord(
+                total_ticks, refined_minerals, HeadlessDashboard()
+            )
+        # acid damage is dealt when a move is applied, not by the drones
+        overlord.game_deals_damage = True
+        self.overlord = overlord
+        self.tick = 0
+        self._deployed: Dict[Drone, World] = {}
+        self._carried: Dict[Drone, int] = {}
+        self._mined: Dict[int, int] = dict.fromkeys(self.worlds, 0)
+        self._drones_lost = 0
+        self._acid_hits: Dict[Drone, int] = {}
+        # acid tiles each drone walked onto this tick
+        self._actions: List[str] = []
+        self.recorder: Optional[Recorder] = None
+        if log is not None:
+            self.recorder = Recorder(
+                log, overlord, total_ticks, refined_minerals
+            )
+        for world in worlds:
+            overlord.add_map(world.map_id, world.density)
+
+    def run(self) -> SimulationResult:
+        """Play every remaining tick.
+
+        Returns:
+            SimulationResult: The outcome.
+        """
+        while self.tick < self.total_ticks:
+            self.step()
+        return self.result()
+
+    def result(self) -> SimulationResult:
+        """Return the outcome of the ticks played so far.
+
+        Returns:
+            SimulationResult: The outcome.
+        """
+        return SimulationResult(
+            self.tick,
+            sum(self._mined.values()),
+            dict(self._mined),
+            self._drones_lost,
+            list(self._actions),
+        )
+
+    def step(self) -> None:
+        """Play a single tick."""
+        action = self.overlord.action()
+        self._actions.append(action)
+        self._apply_overlord_action(action)
+        for drone, world in list(self._deployed.items()):
+            for _ in range(drone.moves):
+                if self._deployed.get(drone) is not world:
+                    break
+                context = world.context(drone)
+                direction = drone.action(context)
+                self._apply_direction(drone, world, direction)
+        self._deal_acid_damage()
+        self.tick += 1
+
+    def _apply_overlord_action(self, action: str) -> None:
+        """Deploy or return a drone, if the action allows it."""
+        command, _, arguments = action.partition(" ")
+        if command == Overlord.DEPLOY:
+            drone_id, map_id = map(int, arguments.split())
+            drone = self.overlord.drones.get(drone_id)
+            world = self.worlds.get(map_id)
+            if drone and world and drone not in self._deployed:
+                if world.place(drone):
+                    self._deployed[drone] = world
+                    self._carried[drone] = 0
+        elif command == Overlord.RETURN:
+            drone = self.overlord.drones.get(int(arguments))
+            world = self._deployed.get(drone) if drone else None
+            if world and world.positions[drone] == world.deploy_zone:
+                world.remove(drone)
+                del self._deployed[drone]
+                self._mined[world.map_id] += self._carried.pop(drone)
+
+    def _apply_direction(
+        self, drone: Drone, world: World, direction: str
+    ) -> None:
+        """Move a drone, or have it mine, in the direction it chose."""
+        try:
+            heading = Directions[direction.upper()]
+        except KeyError:
+            return
+        if heading == Directions.CENTER:
+            return
+        target = world.positions[drone].translate_one(heading)
+        if world.icon(target) == Icon.MINERAL:
+            if self._carried[drone] < drone.capacity and world.mine(target):
+                self._carried[drone] += 1
+        elif world.move(drone, target) and world.tile(target) == Icon.ACID:
+            self._acid_hits[drone] = self._acid_hits.get(drone, 0) + 1
+
+    def _deal_acid_damage(self) -> None:
+        """Damage every drone that walked onto acid this tick, at once.
+
+        Drones that walked onto the same number of acid tiles take the same
+        damage, so each such group is damaged through the fleet in one call.
+        """
+        hits, self._acid_hits = self._acid_hits, {}
+        groups: Dict[int, Dict[int, Drone]] = {}
+        for drone, count in hits.items():
+            groups.setdefault(count, {})[drone.slot] = drone
+        fleet = self.overlord.fleet
+        for count, drones in groups.items():
+            damage = count * Icon.ACID.health_cost()
+            # the fleet is damaged directly, so the drones cannot record it
+            if self.recorder:
+                for drone in drones.values():
+                    self.recorder.damage(drone, damage)
+            for slot in fleet.damage(list(drones), damage):
+                drone = drones[slot]
+                self.overlord.mark_drone_dead(drone)
+                self._deployed.pop(drone).remove(drone)
+                del self._carried[drone]
+                self._drones_lost += 1
@@ -0,0 +1,98 @@
+"""Seeded, procedurally generated maps for simulations and benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from mining.utils import Icon
+
+from .world import World
+
+if TYPE_CHECKING:
+    from typing import List
+
+
+def generate_lines(
+    width: int,
+    height: int,
+    seed: int = 0,
+    wall_density: float = 0.15,
+    acid_fraction: float = 0.05,
+    mineral_density: float = 0.03,
+    max_minerals: int = 9,
+) -> List[str]:
+    """Generate the rows of a random map, as a map file would hold them.
+
+    The map is walled in, with the deployment zone in the middle and its
+    neighbours left empty. Every other tile is a wall, acid, a mineral
+    holding 1 to max_minerals minerals, or empty ground. The same arguments
+    always generate the same map.
+
+    Args:
+        width (int): The width of the map, walls included.
+        height (int): The height of the map, walls included.
+        seed (int, optional): The random seed. Defaults to 0.
+        wall_density (float, optional): The share of walls. Defaults to
+            0.15.
+        acid_fraction (float, optional): The share of acid. Defaults to
+            0.05.
+        mineral_density (float, optional): The share of minerals. Defaults
+            to 0.03.
+        max_minerals (int, optional): The most minerals in one tile, at
+            most 9. Defaults to 9.
+
+    Returns:
+        List[str]: The rows of the map, top to bottom.
+    """
+    rng = random.Random(seed)
+    wall, acid = Icon.WALL.value, Icon.ACID.value
+    acid_below = wall_density + acid_fraction
+    mineral_below = acid_below + mineral_density
+    amounts = "123456789"[:max_minerals]
+    lines = [wall * width]
+    for _ in range(height - 2):
+        row = [wall]
+        for roll in (rng.random() for _ in range(width - 2)):
+            if roll < wall_density:
+                row.append(wall)
+            elif roll < acid_below:
+                row.append(acid)
+            elif roll < mineral_below:
+                row.append(rng.choice(amounts))
+            else:
+                row.append(Icon.EMPTY.value)
+        row.append(wall)
+        lines.append("".join(row))
+    lines.append(wall * width)
+    x, y = width // 2, height // 2
+    for dx, dy, icon in (
+        (0, 0, Icon.DEPLOY_ZONE),
+        (0, -1, Icon.EMPTY),
+        (0, 1, Icon.EMPTY),
+        (1, 0, Icon.EMPTY),
+        (-1, 0, Icon.EMPTY),
+    ):
+        line = lines[y + dy]
+        lines[y + dy] = line[: x + dx] + icon.value + line[x + dx + 1 :]
+    return lines
+
+
+def generate_world(
+    map_id: int, width: int, height: int, seed: int = 0, **options
+) -> World:
+    """Generate a random world.
+
+    Args:
+        map_id (int): The id of the map.
+        width (int): The width of the map, walls included.
+        height (int): The height of the map, walls included.
+        seed (int, optional): The random seed. Defaults to 0.
+        **options: The densities passed on to generate_lines.
+
+    Returns:
+        World: The world.
+    """
+    return World.from_lines(
+        map_id, generate_lines(width, height, seed, **options)
+    )
@@ -0,0 +1,286 @@
+"""Compact binary logs of games, and replaying them without an engine.
+
+A log holds everything the Overlord and its drones were given during a
+game, and everything they answered: the maps registered with add_map, the
+Overlord's action every tick, the context given to each drone's action with
+the direction it chose, and the acid damage drones took. As the Overlord's
+random choices come from its seed, replaying the inputs against a new
+Overlord plays the same game again, with no world or engine needed, and
+any answer that differs from the log is reported.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+from mining.utils import Context, Directions
+from mining.zerg_units import Overlord, Strategy
+
+from .dashboard import HeadlessDashboard
+
+if TYPE_CHECKING:
+    from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+    from mining.zerg_units.drones import Drone
+
+MAGIC = b"ZLOG"
+VERSION = 1
+# magic, version, total ticks, refined minerals, seed, strategy length
+HEADER = struct.Struct("<4sBIIQH")
+# every record starts with its kind
+KIND = struct.Struct("<c")
+MAP, TICK, MOVE, DAMAGE = b"M", b"T", b"A", b"D"
+RECORDS = {
+    # map id, mineral density
+    MAP: struct.Struct("<id"),
+    # command, drone index, map id
+    TICK: struct.Struct("<BHi"),
+    # drone index, x, y, north, south, east, west, direction
+    MOVE: struct.Struct("<Hiiccccb"),
+    # drone index, damage
+    DAMAGE: struct.Struct("<Hh"),
+}
+# commands by the byte that stands for them, no action being 0
+COMMANDS = (None, Overlord.DEPLOY, Overlord.RETURN)
+
+
+class LogHeader(NamedTuple):
+    """How the Overlord of a recorded game was built."""
+
+    total_ticks: int
+    refined_minerals: int
+    seed: int
+    strategy: Strategy
+
+
+class MapRecord(NamedTuple):
+    """A map registered with the Overlord."""
+
+    map_id: int
+    summary: float
+
+
+class TickRecord(NamedTuple):
+    """The Overlord's action for a tick.
+
+    Attributes:
+        command (Optional[str]): DEPLOY, RETURN or None for no action.
+        drone (int): The index of the drone acted on.
+        map_id (int): The map a drone is deployed to.
+    """
+
+    command: Optional[str]
+    drone: int
+    map_id: int
+
+
+class MoveRecord(NamedTuple):
+    """A drone's action: the context it was given and its direction."""
+
+    drone: int
+    context: Context
+    direction: str
+
+
+class DamageRecord(NamedTuple):
+    """Damage a drone took from the map."""
+
+    drone: int
+    damage: int
+
+
+Record = Union[MapRecord, TickRecord, MoveRecord, DamageRecord]
+
+
+class ReplayMismatch(ValueError):
+    """The replayed game gave an answer that differs from its log."""
+
+
+def drone_indices(overlord: Overlord) -> Dict[int, int]:
+    """Number the Overlord's drones in the order they were created.
+
+    Drone ids differ from one game to the next, so logs name drones by
+    these numbers instead.
+
+    Args:
+        overlord (Overlord): The Overlord, before any drone has died.
+
+    Returns:
+        Dict[int, int]: The number of every drone, by drone id.
+    """
+    return {drone_id: index for index, drone_id in enumerate(overlord.drones)}
+
+
+def tick_record(action: str, indices: Dict[int, int]) -> TickRecord:
+    """Turn an Overlord action into a tick record.
+
+    Args:
+        action (str): The action.
+        indices (Dict[int, int]): The number of every drone, by drone id.
+
+    Returns:
+        TickRecord: The record.
+    """
+    command, *arguments = action.split() or [None]
+    drone = indices[int(arguments[0])] if arguments else 0
+    map_id = int(arguments[1]) if len(arguments) > 1 else 0
+    return TickRecord(command, drone, map_id)
+
+
+class Recorder:
+    """Writes the inputs and answers of a game to a binary log.
+
+    A recorder records through its Overlord, which hands it every map,
+    action and damage of the game as they happen, so any engine that plays
+    the game can be recorded.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        overlord: Overlord,
+        total_ticks: int,
+        refined_minerals: int,
+    ) -> None:
+        """Initialize a recorder, write the header of the log and start
+        recording the Overlord's game.
+
+        Args:
+            stream (BinaryIO): Where the log is written.
+            overlord (Overlord): The Overlord, before any map is added.
+            total_ticks (int): The ticks the Overlord was given.
+            refined_minerals (int): The minerals the Overlord was given.
+        """
+        overlord.recorder = self
+        self._stream = stream
+        self._indices = drone_indices(overlord)
+        strategy = overlord.strategy.encode()
+        stream.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                total_ticks,
+                refined_minerals,
+                overlord.seed,
+                len(strategy),
+            )
+        )
+        stream.write(strategy)
+
+    def _write(self, kind: bytes, *fields) -> None:
+        self._stream.write(kind + RECORDS[kind].pack(*fields))
+
+    def add_map(self, map_id: int, summary: float) -> None:
+        """Record a map registered with the Overlord."""
+        self._write(MAP, map_id, summary)
+
+    def tick(self, action: str) -> None:
+        """Record the Overlord's action for a tick."""
+        command, drone, map_id = tick_record(action, self._indices)
+        self._write(TICK, COMMANDS.index(command), drone, map_id)
+
+    def move(self, drone: Drone, context: Context, direction: str) -> None:
+        """Record a drone's context and the direction it chose."""
+        self._write(
+            MOVE,
+            self._indices[id(drone)],
+            context.x,
+            context.y,
+            *(icon.encode("ascii") for icon in context[2:6]),
+            Directions[direction.upper()].value,
+        )
+
+    def damage(self, drone: Drone, damage: int) -> None:
+        """Record damage a drone took from the map."""
+        self._write(DAMAGE, self._indices[id(drone)], damage)
+
+
+def read_log(stream: BinaryIO) -> Tuple[LogHeader, Iterator[Record]]:
+    """Read the header of a log, and the records that follow it.
+
+    Args:
+        stream (BinaryIO): The log.
+
+    Raises:
+        ValueError: If the stream is not a log this version can read.
+
+    Returns:
+        Tuple[LogHeader, Iterator[Record]]: The header, and the records
+            read lazily from the rest of the stream.
+    """
+    fields = HEADER.unpack(stream.read(HEADER.size))
+    magic, version, total_ticks, refined_minerals, seed, length = fields
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} game log")
+    strategy = Strategy.decode(stream.read(length))
+    header = LogHeader(total_ticks, refined_minerals, seed, strategy)
+    return header, _read_records(stream)
+
+
+def _read_records(stream: BinaryIO) -> Iterator[Record]:
+    while kind := stream.read(KIND.size):
+        record = RECORDS[kind]
+        fields = record.unpack(stream.read(record.size))
+        if kind == MAP:
+            yield MapRecord(*fields)
+        elif kind == TICK:
+            command, drone, map_id = fields
+            yield TickRecord(COMMANDS[command], drone, map_id)
+        elif kind == MOVE:
+            drone, x, y, *icons, direction = fields
+            context = Context(x, y, *(icon.decode() for icon in icons))
+            yield MoveRecord(drone, context, Directions(direction).name)
+        else:
+            yield DamageRecord(*fields)
+
+
+def replay(stream: BinaryIO, dashboard=None) -> int:
+    """Play a recorded game again against a new Overlord.
+
+    Args:
+        stream (BinaryIO): The log of the game.
+        dashboard (optional): The dashboard of the new Overlord. Defaults
+            to a headless dashboard.
+
+    Raises:
+        ReplayMismatch: If the Overlord or a drone answers differently
+            than it did in the recorded game.
+
+    Returns:
+        int: The ticks replayed.
+    """
+    header, records = read_log(stream)
+    overlord = Overlord(
+        header.total_ticks,
+        header.refined_minerals,
+        dashboard or HeadlessDashboard(),
+        header.strategy,
+        header.seed,
+    )
+    # the recorded damage records stand in for the game's acid damage
+    overlord.game_deals_damage = True
+    indices = drone_indices(overlord)
+    drones: List[Drone] = list(overlord.drones.values())
+    ticks = 0
+    for number, record in enumerate(records):
+        if isinstance(record, MapRecord):
+            overlord.add_map(*record)
+            continue
+        if isinstance(record, DamageRecord):
+            drones[record.drone].take_damage(record.damage)
+            continue
+        if isinstance(record, TickRecord):
+            answer = tick_record(overlord.action(), indices)
+            ticks += 1
+        else:
+            drone = drones[record.drone]
+            answer = record._replace(
+                direction=drone.action(record.context).upper()
+            )
+        if answer != record:
+            raise ReplayMismatch(
+                f"Record {number} on tick {ticks}: "
+                f"expected {record}, got {answer}"
+            )
+    return ticks
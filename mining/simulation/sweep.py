@@ -0,0 +1,369 @@
+"""Parameter sweeps over many simulated games, run across every core.
+
+Every combination of map, mineral budget, strategy and Overlord seed is
+played in its own worker process, and one row per game is written to a
+CSV file. Run with ``python -m mining.simulation.sweep --generate 30 60
+--minerals 60 120 --max-drones 8 12 --scout-share 0.3 0.5 --out
+sweep.csv``. Drone costs, base stats and upgrade orders are swept with
+``--drone-cost``, ``--base-stats 10,5,1`` and ``--upgrades orders.json``,
+a JSON list of upgrade orders, each a list of ``[role, stat, step, cost,
+limit]``, and Overlord seeds with ``--overlord-seeds``. Rows name their
+upgrade order by a short id, and the orders are written by id to a JSON
+file beside the results, such as ``sweep.upgrades.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import TYPE_CHECKING, NamedTuple
+
+from mining.zerg_units import Overlord, Strategy, Upgrade
+
+from .dashboard import HeadlessDashboard
+from .engine import Simulation
+from .generator import generate_world
+from .world import World
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class MapSpec(NamedTuple):
+    """Where a worker gets a map from: a map file, or the generator.
+
+    Attributes:
+        path (Optional[str]): The map file, or None to generate the map.
+        size (int): The width and height of a generated map.
+        seed (int): The seed of a generated map.
+    """
+
+    path: Optional[str] = None
+    size: int = 0
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        """A short name for the map, for the results file."""
+        if self.path:
+            return os.path.basename(self.path)
+        return f"gen{self.size}s{self.seed}"
+
+    def build(self) -> World:
+        """Load or generate the map.
+
+        Returns:
+            World: The map.
+        """
+        if self.path:
+            return World.load(0, self.path)
+        return generate_world(0, self.size, self.size, self.seed)
+
+
+class SweepCase(NamedTuple):
+    """A single game of a sweep.
+
+    Attributes:
+        map_spec (MapSpec): The map to play on.
+        minerals (int): The refined minerals given to the Overlord.
+        strategy (Strategy): How the Overlord spends them.
+        ticks (int): The ticks to play.
+        seed (int): The seed of the Overlord's random choices.
+    """
+
+    map_spec: MapSpec
+    minerals: int
+    strategy: Strategy
+    ticks: int
+    seed: int = 0
+
+
+class SweepResult(NamedTuple):
+    """The outcome of a single game of a sweep, as written to the file.
+
+    The strategy is written a parameter per column, with health, capacity
+    and moves for its base stats and the id of its upgrade order.
+    """
+
+    map: str
+    seed: int
+    minerals: int
+    max_drones: int
+    scout_share: float
+    drone_cost: int
+    health: int
+    capacity: int
+    moves: int
+    upgrades: str
+    ticks: int
+    minerals_mined: int
+    drones_lost: int
+    seconds: float
+
+
+def run_case(case: SweepCase) -> SweepResult:
+    """Play a single game of a sweep.
+
+    Everything the game needs is built inside the call, so workers share
+    no state.
+
+    Args:
+        case (SweepCase): The game to play.
+
+    Returns:
+        SweepResult: Its outcome.
+    """
+    start = time.perf_counter()
+    strategy = case.strategy
+    overlord = Overlord(
+        case.ticks,
+        case.minerals,
+        HeadlessDashboard(),
+        strategy,
+        case.seed,
+    )
+    simulation = Simulation(
+        [case.map_spec.build()], case.ticks, case.minerals, overlord
+    )
+    result = simulation.run()
+    return SweepResult(
+        case.map_spec.name,
+        case.seed,
+        case.minerals,
+        strategy.max_drones,
+        strategy.scout_share,
+        strategy.drone_cost,
+        *strategy.base_stats,
+        upgrades_id(strategy.upgrades),
+        result.ticks,
+        result.minerals_mined,
+        result.drones_lost,
+        round(time.perf_counter() - start, 3),
+    )
+
+
+def sweep_cases(
+    maps: Iterable[MapSpec],
+    budgets: Iterable[int],
+    strategies: Iterable[Strategy],
+    ticks: int,
+    seeds: Iterable[int] = (0,),
+) -> List[SweepCase]:
+    """Return every combination of map, mineral budget, strategy and seed.
+
+    Args:
+        maps (Iterable[MapSpec]): The maps.
+        budgets (Iterable[int]): The refined minerals given.
+        strategies (Iterable[Strategy]): The strategies.
+        ticks (int): The ticks of every game.
+        seeds (Iterable[int], optional): The seeds of the Overlord.
+            Defaults to 0 alone.
+
+    Returns:
+        List[SweepCase]: The games to play.
+    """
+    return [
+        SweepCase(map_spec, minerals, strategy, ticks, seed)
+        for map_spec, minerals, strategy, seed in product(
+            maps, budgets, strategies, seeds
+        )
+    ]
+
+
+def sweep_strategies(
+    max_drones: Iterable[int],
+    scout_shares: Iterable[float],
+    drone_costs: Iterable[int] = (Strategy().drone_cost,),
+    base_stats: Iterable[Tuple[int, int, int]] = (Strategy().base_stats,),
+    upgrade_orders: Iterable[Tuple[Upgrade, ...]] = (Strategy().upgrades,),
+) -> List[Strategy]:
+    """Return every combination of the strategy parameters.
+
+    Args:
+        max_drones (Iterable[int]): The most drones to buy.
+        scout_shares (Iterable[float]): The shares of scouts.
+        drone_costs (Iterable[int], optional): Minerals per drone. Defaults
+            to that of the default strategy.
+        base_stats (Iterable[Tuple[int, int, int]], optional): Health,
+            capacity and moves before upgrades. Defaults to those of the
+            default strategy.
+        upgrade_orders (Iterable[Tuple[Upgrade, ...]], optional): The
+            upgrade orders. Defaults to that of the default strategy.
+
+    Returns:
+        List[Strategy]: The strategies.
+    """
+    return [
+        Strategy(*fields)
+        for fields in product(
+            max_drones, scout_shares, drone_costs, base_stats, upgrade_orders
+        )
+    ]
+
+
+def load_upgrade_orders(path: str) -> List[Tuple[Upgrade, ...]]:
+    """Read upgrade orders from a JSON file.
+
+    The file holds a list of upgrade orders, each a list of upgrades given
+    as ``[role, stat, step, cost, limit]``, where limit may be left out.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        List[Tuple[Upgrade, ...]]: The upgrade orders.
+    """
+    with open(path, encoding="utf-8") as orders_file:
+        orders = json.load(orders_file)
+    return [tuple(Upgrade(*upgrade) for upgrade in order) for order in orders]
+
+
+def upgrades_id(upgrades: Tuple[Upgrade, ...]) -> str:
+    """Return a short id for an upgrade order, for the results file.
+
+    Args:
+        upgrades (Tuple[Upgrade, ...]): The upgrade order.
+
+    Returns:
+        str: The first 8 hex digits of a hash of the order.
+    """
+    order = json.dumps(upgrades, separators=(",", ":")).encode("ascii")
+    return hashlib.sha1(order).hexdigest()[:8]
+
+
+def write_upgrades(path: str, strategies: Iterable[Strategy]) -> int:
+    """Write the upgrade orders of strategies to a JSON file, by id.
+
+    Each order is written on a line of its own.
+
+    Args:
+        path (str): The file to write.
+        strategies (Iterable[Strategy]): The strategies.
+
+    Returns:
+        int: The number of upgrade orders written.
+    """
+    orders = {
+        upgrades_id(strategy.upgrades): strategy.upgrades
+        for strategy in strategies
+    }
+    lines = ",\n".join(
+        f"  {json.dumps(order_id)}: {json.dumps(order)}"
+        for order_id, order in orders.items()
+    )
+    with open(path, "w", encoding="utf-8") as orders_file:
+        orders_file.write(f"{{\n{lines}\n}}\n")
+    return len(orders)
+
+
+def _stats(text: str) -> Tuple[int, int, int]:
+    """Parse base stats given as health,capacity,moves."""
+    health, capacity, moves = map(int, text.split(","))
+    return health, capacity, moves
+
+
+def run_sweep(
+    cases: Sequence[SweepCase], workers: Optional[int] = None
+) -> Iterator[SweepResult]:
+    """Play every game of a sweep across a pool of worker processes.
+
+    Args:
+        cases (Sequence[SweepCase]): The games to play.
+        workers (Optional[int], optional): The number of processes.
+            Defaults to one per core.
+
+    Yields:
+        SweepResult: The outcome of every game, in the order given.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(len(cases) // (workers * 4), 1)
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(run_case, cases, chunksize=chunksize)
+
+
+def write_results(path: str, results: Iterable[SweepResult]) -> int:
+    """Write results to a CSV file, one row per game.
+
+    Args:
+        path (str): The file to write.
+        results (Iterable[SweepResult]): The results.
+
+    Returns:
+        int: The number of rows written.
+    """
+    rows = 0
+    with open(path, "w", newline="", encoding="ascii") as results_file:
+        writer = csv.writer(results_file)
+        writer.writerow(SweepResult._fields)
+        for result in results:
+            writer.writerow(result)
+            rows += 1
+    return rows
+
+
+def main() -> None:
+    """Parse arguments, run the sweep and write the results file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--maps", nargs="*", default=[])
+    parser.add_argument("--generate", type=int, nargs="*", default=[])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--minerals", type=int, nargs="+", default=[60])
+    parser.add_argument(
+        "--max-drones", type=int, nargs="+", default=[Strategy().max_drones]
+    )
+    parser.add_argument(
+        "--scout-share",
+        type=float,
+        nargs="+",
+        default=[Strategy().scout_share],
+    )
+    parser.add_argument(
+        "--drone-cost", type=int, nargs="+", default=[Strategy().drone_cost]
+    )
+    parser.add_argument(
+        "--base-stats", type=_stats, nargs="+", default=[Strategy().base_stats]
+    )
+    parser.add_argument("--upgrades")
+    parser.add_argument("--overlord-seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+    maps = [MapSpec(path) for path in args.maps] + [
+        MapSpec(None, size, seed)
+        for size in args.generate
+        for seed in args.seeds
+    ]
+    if not maps:
+        parser.error("give at least one of --maps and --generate")
+    upgrade_orders = [Strategy().upgrades]
+    if args.upgrades:
+        upgrade_orders = load_upgrade_orders(args.upgrades)
+    strategies = sweep_strategies(
+        args.max_drones,
+        args.scout_share,
+        args.drone_cost,
+        args.base_stats,
+        upgrade_orders,
+    )
+    cases = sweep_cases(
+        maps, args.minerals, strategies, args.ticks, args.overlord_seeds
+    )
+    upgrades_path = f"{os.path.splitext(args.out)[0]}.upgrades.json"
+    write_upgrades(upgrades_path, strategies)
+    start = time.perf_counter()
+    rows = write_results(args.out, run_sweep(cases, args.workers))
+    print(
+        f"{rows} games in {time.perf_counter() - start:,.1f}s "
+        f"written to {args.out}, upgrade orders to {upgrades_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
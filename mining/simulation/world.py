@@ -0,0 +1,213 @@
+"""The true state of a map, as seen by the simulation engine."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from mining.utils import Context, Coordinate, Icon
+from mining.utils.loader import decode_row, read_rows
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional
+
+    from mining.zerg_units.drones import Drone
+
+# icons by the byte that stands for them in a row
+ICON_BYTES = {ord(icon.value): icon for icon in Icon}
+
+
+class World:
+    """The true state of a map, as seen by the simulation engine.
+
+    Unlike the Overlord's Map, which only holds what drones have reported,
+    a world holds every tile, how many minerals are left in each mineral
+    and where every deployed drone is. Tiles are kept as one bytearray of
+    icon characters per row, so even the largest maps stay small.
+    """
+
+    def __init__(
+        self,
+        map_id: int,
+        rows: List[bytearray],
+        minerals: Dict[Coordinate, int],
+    ) -> None:
+        """Initialize a world.
+
+        Args:
+            map_id (int): The id of the map.
+            rows (List[bytearray]): The icon characters of every row, top
+                to bottom.
+            minerals (Dict[Coordinate, int]): The amount left in each
+                mineral tile.
+
+        Raises:
+            ValueError: If the map has no deployment zone.
+        """
+        self.map_id = map_id
+        self.rows = rows
+        self.minerals = minerals
+        self.occupants: Dict[Coordinate, Drone] = {}
+        self.positions: Dict[Drone, Coordinate] = {}
+        deploy_zone = ord(Icon.DEPLOY_ZONE.value)
+        for y, row in enumerate(rows):
+            if (x := row.find(deploy_zone)) != -1:
+                self.deploy_zone = Coordinate(x, y)
+                break
+        else:
+            raise ValueError(f"Map {map_id} has no deployment zone")
+
+    @classmethod
+    def from_lines(cls, map_id: int, lines: Iterable[str]) -> World:
+        """Build a world from the rows of a map file.
+
+        Each character is the icon of one tile. A digit is a mineral holding
+        that many minerals, and the end of a line is an empty tile.
+
+        Args:
+            map_id (int): The id of the map.
+            lines (Iterable[str]): The rows of the map, top to bottom.
+
+        Returns:
+            World: The world.
+        """
+        return cls._decode(
+            map_id, (line.rstrip("\n").encode("ascii") for line in lines)
+        )
+
+    @classmethod
+    def load(cls, map_id: int, path: str) -> World:
+        """Build a world from a map file, streamed a row at a time.
+
+        Args:
+            map_id (int): The id of the map.
+            path (str): The map file.
+
+        Returns:
+            World: The world.
+        """
+        return cls._decode(map_id, read_rows(path))
+
+    @classmethod
+    def _decode(cls, map_id: int, lines: Iterable[bytes]) -> World:
+        rows: List[bytearray] = []
+        minerals: Dict[Coordinate, int] = {}
+        for y, line in enumerate(lines):
+            row, amounts = decode_row(line)
+            rows.append(bytearray(row))
+            for x, amount in amounts:
+                minerals[Coordinate(x, y)] = amount
+        return cls(map_id, rows, minerals)
+
+    @property
+    def density(self) -> float:
+        """The share of tiles that are minerals."""
+        size = sum(map(len, self.rows))
+        return len(self.minerals) / size if size else 0.0
+
+    def tile(self, coordinate: Coordinate) -> Icon:
+        """Return the icon of the tile at a coordinate, ignoring drones.
+
+        Tiles off the map are walls.
+
+        Args:
+            coordinate (Coordinate): The coordinate.
+
+        Returns:
+            Icon: The icon.
+        """
+        x, y = coordinate
+        if 0 <= y < len(self.rows) and 0 <= x < len(row := self.rows[y]):
+            return ICON_BYTES[row[x]]
+        return Icon.WALL
+
+    def icon(self, coordinate: Coordinate) -> Icon:
+        """Return the icon at a coordinate, as a drone would see it.
+
+        Tiles off the map are walls, and occupied tiles show a zerg.
+
+        Args:
+            coordinate (Coordinate): The coordinate.
+
+        Returns:
+            Icon: The icon.
+        """
+        if coordinate in self.occupants:
+            return Icon.ZERG
+        return self.tile(coordinate)
+
+    def context(self, drone: Drone) -> Context:
+        """Return the context of a deployed drone.
+
+        Args:
+            drone (Drone): The drone.
+
+        Returns:
+            Context: The drone's position and surroundings.
+        """
+        position = self.positions[drone]
+        north, south, east, west = (
+            self.icon(neighbor).value for neighbor in position.cardinals()
+        )
+        return Context(position.x, position.y, north, south, east, west)
+
+    def place(self, drone: Drone) -> bool:
+        """Place a drone on the deployment zone, if it is free.
+
+        Args:
+            drone (Drone): The drone to place.
+
+        Returns:
+            bool: Whether the drone was placed.
+        """
+        if self.deploy_zone in self.occupants:
+            return False
+        self.occupants[self.deploy_zone] = drone
+        self.positions[drone] = self.deploy_zone
+        return True
+
+    def remove(self, drone: Drone) -> Optional[Coordinate]:
+        """Take a drone off the map.
+
+        Args:
+            drone (Drone): The drone to remove.
+
+        Returns:
+            Optional[Coordinate]: Where the drone was, if it was on the map.
+        """
+        if (position := self.positions.pop(drone, None)) is not None:
+            del self.occupants[position]
+        return position
+
+    def move(self, drone: Drone, target: Coordinate) -> bool:
+        """Move a drone onto a tile, if it is traversable and free.
+
+        Args:
+            drone (Drone): The drone to move.
+            target (Coordinate): The tile to move onto.
+
+        Returns:
+            bool: Whether the drone moved.
+        """
+        if not self.icon(target).traversable():
+            return False
+        del self.occupants[self.positions[drone]]
+        self.occupants[target] = drone
+        self.positions[drone] = target
+        return True
+
+    def mine(self, coordinate: Coordinate) -> bool:
+        """Take one mineral from a tile, emptying it once it runs out.
+
+        Args:
+            coordinate (Coordinate): The mineral tile.
+
+        Returns:
+            bool: Whether there was a mineral to take.
+        """
+        if not self.minerals.get(coordinate):
+            return False
+        self.minerals[coordinate] -= 1
+        if not self.minerals[coordinate]:
+            del self.minerals[coordinate]
+            self.rows[coordinate.y][coordinate.x] = ord(Icon.EMPTY.value)
+        return True
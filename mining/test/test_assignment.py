@@ -0,0 +1,159 @@
+"""Test class for matching miners to minerals."""
+import itertools
+import random
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Coordinate
+from mining.utils.assignment import (
+    INFINITY,
+    SpatialIndex,
+    greedy_assignment,
+    optimal_assignment,
+)
+from mining.zerg_units.drones import Fleet, MinerDrone
+
+from .testing_utils import TestingUtils
+
+
+class TestAssignment(unittest.TestCase):
+    RANDOM_TEST_RUNS = 50
+
+    def _random_costs(self):
+        rows, cols = random.randint(1, 4), random.randint(1, 4)
+        return [
+            [
+                INFINITY if random.random() < 0.2 else random.randint(0, 9)
+                for _ in range(cols)
+            ]
+            for _ in range(rows)
+        ]
+
+    @staticmethod
+    def _best(costs):
+        """Return the most pairs and their least total cost, by brute force."""
+        rows, cols = len(costs), len(costs[0])
+        for size in range(min(rows, cols), 0, -1):
+            totals = [
+                sum(costs[row][col] for row, col in zip(chosen, order))
+                for chosen in itertools.combinations(range(rows), size)
+                for order in itertools.permutations(range(cols), size)
+            ]
+            if (best := min(totals)) != INFINITY:
+                return size, best
+        return 0, 0
+
+    def _assert_valid(self, costs, pairs):
+        self.assertEqual(len({row for row, _ in pairs}), len(pairs))
+        self.assertEqual(len({col for _, col in pairs}), len(pairs))
+        for row, col in pairs:
+            self.assertNotEqual(costs[row][col], INFINITY)
+
+    def test_optimal_assignment(self):
+        for _ in range(self.RANDOM_TEST_RUNS):
+            costs = self._random_costs()
+            pairs = optimal_assignment(costs)
+            self._assert_valid(costs, pairs)
+            self.assertEqual(
+                (len(pairs), sum(costs[row][col] for row, col in pairs)),
+                self._best(costs),
+            )
+
+    def test_greedy_assignment(self):
+        for _ in range(self.RANDOM_TEST_RUNS):
+            costs = self._random_costs()
+            self._assert_valid(costs, greedy_assignment(costs))
+        costs = [[1, 2], [2, 100]]
+        self.assertEqual(greedy_assignment(costs), [(0, 0), (1, 1)])
+        self.assertCountEqual(optimal_assignment(costs), [(0, 1), (1, 0)])
+
+    def test_spatial_index_nearest(self):
+        index = SpatialIndex(4)
+        coords = {
+            TestingUtils.randomize_coordinate(-20, 20) for _ in range(100)
+        }
+        for coord in coords:
+            index.add(coord)
+        origin = TestingUtils.randomize_coordinate(-25, 25)
+        distances = [distance for distance, _ in index.nearest(origin)]
+        self.assertEqual(
+            distances,
+            sorted(
+                abs(coord.x - origin.x) + abs(coord.y - origin.y)
+                for coord in coords
+            ),
+        )
+        self.assertEqual(set(index), coords)
+
+    def test_spatial_index_discard(self):
+        index = SpatialIndex()
+        coord = Coordinate(-3, 40)
+        index.add(coord)
+        index.add(coord)
+        self.assertIn(coord, index)
+        self.assertEqual(len(index), 1)
+        index.discard(coord)
+        index.discard(coord)
+        self.assertNotIn(coord, index)
+        self.assertFalse(index)
+
+
+class TestAssignMiners(unittest.TestCase):
+    def setUp(self) -> None:
+        self.map_ = TestingUtils.build_map(
+            [
+                "#########",
+                "#_   *  #",
+                "# ##~## #",
+                "#*  ~~~*#",
+                "#########",
+            ]
+        )
+        for coord in self.map_:
+            self.map_._track_mineral(self.map_[coord].icon, coord)
+
+    def _miner(self, health=30):
+        miner = MinerDrone(Mock(fleet=Fleet()))
+        miner._health = health
+        return miner
+
+    def test_closest_minerals_first(self):
+        miners = [self._miner(), self._miner()]
+        tasked = self.map_.assign_miners(miners)
+        self.assertEqual(len(tasked), 2)
+        self.assertEqual(
+            {miner._mineral_location for miner in tasked},
+            {Coordinate(5, 1), Coordinate(1, 3)},
+        )
+        self.assertEqual(
+            self.map_.tasked_minerals, {Coordinate(5, 1), Coordinate(1, 3)}
+        )
+        self.assertEqual(set(self.map_.untasked_minerals), {Coordinate(7, 3)})
+        for miner in tasked:
+            self.assertEqual(miner.path[0], self.map_.origin)
+
+    def test_miners_avoid_deadly_acid(self):
+        self.map_.untasked_minerals.discard(Coordinate(5, 1))
+        self.map_.untasked_minerals.discard(Coordinate(7, 3))
+        self.map_.untasked_minerals.add(Coordinate(4, 3))
+        weak = self._miner(health=6)
+        self.assertEqual(self.map_.assign_miners([weak]), [weak])
+        self.assertEqual(weak._mineral_location, Coordinate(1, 3))
+        self.assertEqual(self.map_.assign_miners([self._miner(6)]), [])
+
+    def test_optimal_mode(self):
+        miners = [self._miner(health=6), self._miner()]
+        tasked = self.map_.assign_miners(miners, optimal=True)
+        self.assertEqual(len(tasked), 2)
+
+    def test_task_miner(self):
+        miner = self._miner()
+        self.assertTrue(self.map_.task_miner(miner))
+        self.assertEqual(miner._mineral_location, Coordinate(1, 3))
+        self.map_.untasked_minerals.discard(Coordinate(5, 1))
+        self.map_.untasked_minerals.discard(Coordinate(7, 3))
+        self.assertFalse(self.map_.task_miner(self._miner()))
+
+
+if __name__ == "__main__":
+    unittest.main()
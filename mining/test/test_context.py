@@ -0,0 +1,41 @@
+"""Test class for contexts decoded with lookup tables."""
+import unittest
+
+from mining.utils import Context, DecodedContext, Icon
+from mining.utils.grid import Grid
+
+
+class TestDecodedContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.context_ = Context(3, 4, "#", " ", "*", "~")
+        self.decoded_ = DecodedContext.decode(self.context_)
+
+    def test_fields(self):
+        self.assertEqual(self.decoded_[:6], self.context_)
+        self.assertEqual(
+            self.decoded_.icons,
+            (Icon.WALL, Icon.EMPTY, Icon.MINERAL, Icon.ACID),
+        )
+        self.assertEqual(
+            self.decoded_.codes,
+            bytes(Grid.code(icon) for icon in self.decoded_.icons),
+        )
+        self.assertEqual(self.decoded_.traversable, (False, True, False, True))
+        self.assertEqual(self.decoded_.health_costs, (1, 0, 0, 3))
+
+    def test_icon(self):
+        self.assertIs(self.decoded_.icon("NORTH"), Icon.WALL)
+        self.assertIs(self.decoded_.icon("west"), Icon.ACID)
+
+    def test_decoded_once(self):
+        self.assertIs(DecodedContext.decode(self.decoded_), self.decoded_)
+        again = DecodedContext.decode(Context(0, 0, "#", " ", "*", "~"))
+        self.assertIs(again.icons, self.decoded_.icons)
+
+    def test_unknown_symbol(self):
+        with self.assertRaises(ValueError):
+            DecodedContext.decode(Context(0, 0, "x", " ", " ", " "))
+
+
+if __name__ == "__main__":
+    unittest.main()
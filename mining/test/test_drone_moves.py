@@ -0,0 +1,106 @@
+"""Test class for how drones move along their paths on a map."""
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Context, Coordinate
+from mining.zerg_units import Overlord, Strategy
+from mining.zerg_units.drones import MinerDrone, ScoutDrone, State
+
+from .testing_utils import TestingUtils
+
+
+class TestDroneMoves(unittest.TestCase):
+    def setUp(self) -> None:
+        self.overlord_ = Overlord(10, 60, Mock(), Strategy(max_drones=4))
+        self.map_ = TestingUtils.build_map(["######", "#_  *#", "######"])
+        self.origin_ = self.map_.origin
+
+    def _drone(self, role):
+        drone = next(
+            drone
+            for drone in self.overlord_.drones.values()
+            if isinstance(drone, role) and not getattr(drone, "map", None)
+        )
+        drone.map = self.map_
+        return drone
+
+    def test_previous_tile_kept_for_next_drone(self):
+        first, second = self._drone(ScoutDrone), self._drone(MinerDrone)
+        step, next_step = Coordinate(2, 1), Coordinate(3, 1)
+        first._handle_occupation(self.map_[step])
+        # the second drone steps onto the tile the first has left, before
+        # the first has acted again
+        second._occupy_current(Context(*step))
+        first._handle_occupation(self.map_[next_step])
+        self.assertIs(self.map_[step].occupied_drone, second)
+        self.assertIs(self.map_[next_step].occupied_drone, first)
+
+    def test_full_miner_returns_mineral(self):
+        miner = self._drone(MinerDrone)
+        mineral = Coordinate(4, 1)
+        self.assertTrue(self.map_.task_miner(miner))
+        miner.action(Context(1, 1, "#", "#", " ", "#"))
+        miner.action(Context(2, 1, "#", "#", " ", " "))
+        miner._capacity = miner.capacity
+        miner.action(Context(3, 1, "#", "#", "*", " "))
+        self.assertIn(mineral, self.map_.untasked_minerals)
+        self.assertNotIn(mineral, self.map_.tasked_minerals)
+        self.assertEqual(miner.dest, self.origin_)
+        self.assertEqual(miner.state, State.TRAVELING)
+
+    def test_miner_mines_until_mineral_is_gone(self):
+        miner = self._drone(MinerDrone)
+        mineral = Coordinate(4, 1)
+        self.assertTrue(self.map_.task_miner(miner))
+        self.assertEqual(miner._mineral_direction, "EAST")
+        miner.action(Context(1, 1, "#", "#", " ", "#"))
+        miner.action(Context(2, 1, "#", "#", " ", " "))
+        for carried in (1, 2):
+            self.assertEqual(
+                miner.action(Context(3, 1, "#", "#", "*", " ")), "EAST"
+            )
+            self.assertEqual(miner._capacity, carried)
+        # the mineral is gone, the miner heads back
+        self.assertEqual(
+            miner.action(Context(3, 1, "#", "#", " ", " ")), "WEST"
+        )
+        self.assertNotIn(mineral, self.map_.tasked_minerals)
+        self.assertEqual(miner.dest, self.origin_)
+
+    def _blocked_scout(self):
+        scout = self._drone(ScoutDrone)
+        scout.path = [self.origin_, Coordinate(2, 1), Coordinate(3, 1)]
+        scout.action(Context(1, 1, "#", "#", " ", "#"))
+        self.assertEqual(
+            scout.action(Context(2, 1, "#", "#", " ", " ")), "EAST"
+        )
+        return scout
+
+    def test_scout_waits_for_pathable_target(self):
+        scout = self._blocked_scout()
+        # the move onto the target was blocked by another drone
+        self.assertEqual(
+            scout.action(Context(2, 1, "#", "#", "Z", " ")), "EAST"
+        )
+        self.assertEqual(scout.dest, Coordinate(3, 1))
+
+    def test_scout_stops_before_blocked_target(self):
+        scout = self._blocked_scout()
+        # the target turned out to be a wall
+        self.map_.update_context(Context(2, 1, "#", "#", "#", " "))
+        self.assertEqual(
+            scout.action(Context(2, 1, "#", "#", "#", " ")), "CENTER"
+        )
+        self.assertFalse(scout.path)
+
+    def test_scout_target_dropped_on_arrival(self):
+        scout = self._blocked_scout()
+        self.assertEqual(
+            self.map_.scout_targets, {id(scout): Coordinate(3, 1)}
+        )
+        scout.action(Context(3, 1, "#", "#", "*", " "))
+        self.assertEqual(self.map_.scout_targets, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Test class for how the Overlord picks scout targets."""
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Context, Coordinate
+from mining.zerg_units import Overlord, Strategy
+from mining.zerg_units.drones import ScoutDrone
+
+
+class TestExploration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.overlord_ = Overlord(10, 10, Mock(), Strategy(max_drones=2))
+        self.overlord_.add_map(0, 0.1)
+        self.map_ = self.overlord_._maps[0]
+        self.start_ = Coordinate(0, 0)
+        self.map_.update_context(Context(0, 0, "#", " ", " ", "#"))
+        self.map_.update_context(Context(0, 1, " ", " ", "#", "#"))
+
+    def test_undiscovered_around(self):
+        self.assertEqual(
+            self.map_.undiscovered_around(Coordinate(1, 1)),
+            {Coordinate(1, 2), Coordinate(2, 1)},
+            "the wall is discovered",
+        )
+
+    def test_most_gain(self):
+        path = self.overlord_._assign_scout_target(self.map_, self.start_)
+        self.assertEqual(path[0], self.start_)
+        self.assertEqual(path[-1], Coordinate(2, 0))
+        for _ in range(5):
+            self.assertEqual(
+                self.overlord_._assign_scout_target(self.map_, self.start_),
+                path,
+            )
+
+    def test_claimed_targets_skipped(self):
+        scout = next(
+            drone
+            for drone in self.overlord_.drones.values()
+            if isinstance(drone, ScoutDrone)
+        )
+        first = self.overlord_._assign_scout_target(self.map_, self.start_)
+        scout.map = self.map_
+        scout.path = first
+        self.assertEqual(self.map_.scout_targets, {id(scout): first[-1]})
+        second = self.overlord_._assign_scout_target(self.map_, self.start_)
+        self.assertEqual(second[-1], Coordinate(0, 3))
+
+    def test_claims_dropped(self):
+        scout = next(
+            drone
+            for drone in self.overlord_.drones.values()
+            if isinstance(drone, ScoutDrone)
+        )
+        scout.map = self.map_
+        path = self.overlord_._assign_scout_target(self.map_, self.start_)
+        scout.path = path
+        scout.path = []
+        self.assertEqual(self.map_.scout_targets, {})
+        scout.path = path
+        self.map_.release_path(scout)
+        self.assertEqual(self.map_.scout_targets, {})
+
+    def test_seeded_random_exploration(self):
+        paths = []
+        for _ in range(2):
+            overlord = Overlord(10, 10, Mock(), seed=4)
+            overlord.EXPLORATION = "random"
+            overlord.add_map(0, 0.1)
+            map_ = overlord._maps[0]
+            map_.update_context(Context(0, 0, " ", " ", " ", " "))
+            paths.append(
+                [
+                    overlord._assign_scout_target(map_, self.start_)
+                    for _ in range(10)
+                ]
+            )
+        self.assertEqual(paths[0], paths[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
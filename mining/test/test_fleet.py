@@ -0,0 +1,91 @@
+"""Test class for the arrays that keep a fleet's drone stats."""
+import unittest
+from unittest import mock
+from unittest.mock import Mock
+
+from mining.utils import Context
+from mining.zerg_units import Overlord, Strategy
+from mining.zerg_units.drones import Fleet, MinerDrone, ScoutDrone, State
+from mining.zerg_units.drones import fleet as fleet_module
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fleet_ = Fleet()
+        self.overlord_ = Mock()
+        self.scout_ = ScoutDrone(self.overlord_, self.fleet_)
+        self.miner_ = MinerDrone(self.overlord_, self.fleet_)
+
+    def test_views(self):
+        self.assertEqual((self.scout_.slot, self.miner_.slot), (0, 1))
+        self.assertEqual(list(self.fleet_.health), [40, 30])
+        self.assertEqual(list(self.fleet_.moves), [1, 2])
+        self.miner_._capacity += 3
+        self.miner_.state = State.WORKING
+        self.assertEqual(self.fleet_.carried[1], 3)
+        self.assertEqual(self.miner_.state, State.WORKING)
+        self.assertEqual(self.scout_.state, State.WAITING)
+        self.assertFalse(hasattr(self.scout_, "__dict__"))
+
+    def test_position(self):
+        self.scout_.map = Mock()
+        self.scout_.action(Context(4, 7, " ", " ", " ", " "))
+        self.assertEqual(self.scout_.position, (4, 7))
+        self.assertEqual(self.fleet_.x[0], 4)
+
+    def test_take_damage(self):
+        self.assertTrue(self.miner_.take_damage(20))
+        self.assertFalse(self.miner_.take_damage(20))
+        self.overlord_.mark_drone_dead.assert_called_once_with(self.miner_)
+        self.assertEqual(self.fleet_.rows([1])[0][0], "DEAD")
+
+    def test_damage(self):
+        drones = [MinerDrone(self.overlord_, self.fleet_) for _ in range(98)]
+        slots = [drone.slot for drone in drones] + [self.miner_.slot]
+        for vectorized in (False, True):
+            with self.subTest(vectorized=vectorized):
+                fleet = Fleet()
+                for _ in range(len(self.fleet_)):
+                    fleet.add(30, 2)
+                fleet.health[5] = 10
+                with mock.patch.object(
+                    fleet_module, "np", fleet_module.np if vectorized else None
+                ):
+                    self.assertEqual(fleet.damage(slots, 10), [5])
+                    self.assertEqual(fleet.damage(slots, 10), [])
+                    self.assertEqual(fleet.health[5], 0)
+                    self.assertEqual(fleet.health[2], 10)
+                    self.assertEqual(fleet.health[0], 30)
+                    self.assertEqual(fleet.alive(), 99)
+
+    def test_in_state(self):
+        self.scout_.state = State.TRAVELING
+        self.assertEqual(self.fleet_.in_state(State.TRAVELING), [0])
+        self.assertEqual(self.fleet_.in_state(State.WAITING), [1])
+        self.miner_._health = 0
+        self.assertEqual(self.fleet_.in_state(State.WAITING), [])
+
+    def test_rows(self):
+        self.assertEqual(
+            self.fleet_.rows([self.miner_.slot, self.scout_.slot]),
+            [("WAITING", 30, 0, 2), ("WAITING", 40, 0, 1)],
+        )
+
+    def test_overlord_fleet(self):
+        overlord = Overlord(10, 30, Mock(), Strategy(max_drones=3))
+        self.assertEqual(len(overlord.fleet), 3)
+        for drone in overlord.drones.values():
+            self.assertIs(drone.fleet, overlord.fleet)
+        self.assertEqual(overlord.fleet.nbytes(), 3 * 25)
+
+    def test_default_fleet_is_the_overlords(self):
+        first, second = Mock(fleet=Fleet()), Mock(fleet=Fleet())
+        for overlord in (first, second):
+            scout = ScoutDrone(overlord)
+            self.assertIs(scout.fleet, overlord.fleet)
+            self.assertEqual(scout.slot, 0)
+        self.assertEqual(len(first.fleet), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
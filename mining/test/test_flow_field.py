@@ -0,0 +1,112 @@
+"""Test class for flow fields."""
+import random
+import unittest
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils.flow_field import FlowField, np
+from mining.utils.path_tree import ShortestPathTree
+
+from .testing_utils import TestingUtils
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFlowField(unittest.TestCase):
+    SIZE = 15
+    ICONS = [Icon.EMPTY] * 6 + [Icon.ACID, Icon.WALL, Icon.WALL, None]
+
+    def setUp(self) -> None:
+        self.map_ = Map(0, 0.0)
+        for x in range(-self.SIZE, self.SIZE):
+            for y in range(-self.SIZE, self.SIZE):
+                self.map_.add_tile(
+                    Tile(Coordinate(x, y), random.choice(self.ICONS))
+                )
+        self.target_ = Coordinate(0, 0)
+        self.field_ = self.map_.flow_field(self.target_)
+
+    def test_field_distances(self):
+        # paths are symmetric apart from the weight of the first and last tile
+        tree = ShortestPathTree(self.map_.terrain_weight, self.target_)
+        target_weight = self.map_.terrain_weight(self.target_) or 1
+        for coord in self.map_:
+            if (weight := self.map_.terrain_weight(coord)) is None:
+                continue
+            expected = tree.distance(coord)
+            if coord != self.target_:
+                expected += target_weight - weight
+            self.assertEqual(self.field_.distance(coord), expected)
+
+    def test_field_paths(self):
+        for coord in self.map_:
+            path = self.field_.path_from(coord)
+            if not path or self.map_.terrain_weight(coord) is None:
+                continue
+            self.assertEqual(path[0], coord)
+            self.assertEqual(path[-1], self.target_)
+            for prev, curr in zip(path, path[1:]):
+                self.assertIn(curr, prev.cardinals())
+            self.assertEqual(
+                TestingUtils.path_cost(self.map_, path),
+                self.field_.distance(coord),
+            )
+
+    def _assert_same_distances(self, map_, field):
+        fresh = FlowField(map_._grid, Map.CODE_WEIGHTS, field.target)
+        for coord in map_:
+            self.assertEqual(field.distance(coord), fresh.distance(coord))
+
+    def test_field_cached(self):
+        self.assertIs(self.map_.flow_field(self.target_), self.field_)
+        map_ = TestingUtils.build_map(["########", "#_ ~ # #", "########"])
+        field = map_.flow_field(map_.origin)
+        # a cheaper tile is applied to the cached field
+        map_.add_tile(Tile(Coordinate(3, 1), Icon.EMPTY))
+        self.assertIs(map_.flow_field(map_.origin), field)
+        self._assert_same_distances(map_, field)
+        # so is a dearer tile that no path steps onto
+        map_.add_tile(Tile(Coordinate(6, 1), Icon.ACID))
+        self.assertIs(map_.flow_field(map_.origin), field)
+        self._assert_same_distances(map_, field)
+        # a dearer tile on a path builds it again
+        map_.add_tile(Tile(Coordinate(2, 1), Icon.ACID))
+        self.assertIsNot(map_.flow_field(map_.origin), field)
+
+    def test_field_update_matches_build(self):
+        field = self.field_
+        for _ in range(20):
+            coord = TestingUtils.randomize_coordinate(
+                -self.SIZE, self.SIZE - 1, self.target_
+            )
+            self.map_.add_tile(Tile(coord, Icon.EMPTY))
+        self.assertIs(self.map_.flow_field(self.target_), field)
+        self._assert_same_distances(self.map_, field)
+
+    def test_field_outside_rebuilds(self):
+        self.map_.add_tile(Tile(Coordinate(self.SIZE * 3, 0), Icon.EMPTY))
+        self.assertIsNot(self.map_.flow_field(self.target_), self.field_)
+
+    def test_origin_paths_once_explored(self):
+        map_ = TestingUtils.build_map(
+            ["#######", "#_ ~ *#", "# ### #", "#     #", "#######"]
+        )
+        self.assertFalse(map_.frontier())
+        mineral = Coordinate(5, 1)
+        path = map_.path_to_origin(mineral)
+        self.assertIn(map_.origin, map_._flow_fields)
+        self.assertEqual(path, map_.flow_field(map_.origin).path_from(mineral))
+        self.assertEqual(
+            TestingUtils.path_cost(map_, path),
+            TestingUtils.path_cost(map_, map_.astar(mineral, map_.origin)),
+        )
+        # while the map is explored, the origin tree is used
+        map_.add_tile(Tile(Coordinate(0, 3), Icon.EMPTY))
+        self.assertTrue(map_.frontier())
+        map_._flow_fields.clear()
+        map_.path_to_origin(mineral)
+        self.assertNotIn(map_.origin, map_._flow_fields)
+
+    def test_field_unreachable(self):
+        self.assertEqual(
+            self.field_.path_from(Coordinate(self.SIZE * 3, 0)), []
+        )
+        self.assertIsNone(self.field_.next_step(self.target_))
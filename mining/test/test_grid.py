@@ -0,0 +1,125 @@
+"""Test class for the grid tile storage."""
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils.grid import Grid, GridTile
+
+from .testing_utils import TestingUtils
+
+
+class TestGrid(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid_ = Grid()
+
+    def test_grid_empty(self):
+        self.assertEqual(len(self.grid_), 0)
+        self.assertNotIn(Coordinate(0, 0), self.grid_)
+        self.assertIsNone(self.grid_.icon(Coordinate(3, -3)))
+
+    def test_grid_grows(self):
+        stored = {}
+        for _ in range(200):
+            coord = TestingUtils.randomize_coordinate(-100, 100)
+            icon = list(Icon)[sum(coord) % len(Icon)]
+            self.grid_.set_icon(coord, icon)
+            stored[coord] = icon
+        self.assertEqual(len(self.grid_), len(stored))
+        for coord, icon in stored.items():
+            self.assertIn(coord, self.grid_)
+            self.assertEqual(self.grid_.icon(coord), icon)
+        self.assertEqual(set(self.grid_.coordinates()), set(stored))
+        table = range(256)
+        for coord in stored:
+            self.assertEqual(
+                self.grid_.lookup(coord, table), self.grid_.get_code(*coord)
+            )
+        self.assertEqual(self.grid_.lookup(Coordinate(999, 999), table), 0)
+
+    def test_grid_chunks(self):
+        self.grid_.set_icon(Coordinate(-1, 0), Icon.WALL)
+        self.grid_.set_row(30, 33, bytes([2, 3, 4]))
+        self.assertEqual(
+            [key for key, _ in self.grid_.chunks()], [(-1, 0), (0, 1), (1, 1)]
+        )
+        self.assertEqual(self.grid_.nbytes(), 3 * Grid.CHUNK_SIZE**2)
+        self.assertEqual(
+            list(self.grid_.coordinates()),
+            [
+                Coordinate(-1, 0),
+                Coordinate(30, 33),
+                Coordinate(31, 33),
+                Coordinate(32, 33),
+            ],
+        )
+        copy = Grid.from_chunks(self.grid_.chunks())
+        self.assertEqual(len(copy), 4)
+        self.assertEqual(list(copy.chunks()), list(self.grid_.chunks()))
+        left, top, width, height, cells = self.grid_.copy_cells()
+        size = Grid.CHUNK_SIZE
+        self.assertEqual(
+            (left, top, width, height), (-size, 0, 3 * size, 2 * size)
+        )
+        self.assertEqual(cells[size - 1], Grid.code(Icon.WALL))
+        start = 33 * width + size + 30
+        self.assertEqual(cells[start : start + 3], bytes([2, 3, 4]))
+        with self.assertRaises(ValueError):
+            Grid.from_chunks([((0, 0), b"\x02")])
+
+    def test_connected_chunks(self):
+        self.grid_.set_icon(Coordinate(-1, 0), Icon.WALL)
+        self.grid_.set_row(30, 33, bytes([2, 3, 4]))
+        # the first chunk only touches the others at a corner
+        self.assertEqual(self.grid_.connected_chunks(-1, 0), {(-1, 0)})
+        connected = self.grid_.connected_chunks(30, 33)
+        self.assertEqual(connected, {(0, 1), (1, 1)})
+        self.assertEqual(self.grid_.connected_chunks(0, 0), set())
+        left, top, width, height, cells = self.grid_.copy_cells(connected)
+        size = Grid.CHUNK_SIZE
+        self.assertEqual((left, top, width, height), (0, size, 2 * size, size))
+        self.assertEqual(cells[width + 30 : width + 33], bytes([2, 3, 4]))
+        self.assertEqual(cells.count(Grid.UNSTORED), len(cells) - 3)
+
+    def test_grid_undiscovered(self):
+        coord = Coordinate(-5, 7)
+        self.grid_.set_icon(coord, None)
+        self.assertIn(coord, self.grid_)
+        self.assertIsNone(self.grid_.icon(coord))
+        self.assertEqual(
+            list(self.grid_.coordinates(Grid.UNDISCOVERED)), [coord]
+        )
+
+    def test_grid_tile_view(self):
+        coord = Coordinate(2, 2)
+        self.grid_.set_icon(coord, Icon.ACID)
+        view = GridTile(self.grid_, coord)
+        self.assertEqual(view, Tile(coord))
+        self.assertEqual(view.icon, Icon.ACID)
+        view.icon = Icon.EMPTY
+        self.assertEqual(self.grid_.icon(coord), Icon.EMPTY)
+        self.assertTrue(view._occupy(Mock(icon=Icon.MINER)))
+        self.assertIn(coord, self.grid_.occupancy)
+        self.assertEqual(view.icon, Icon.MINER)
+        self.assertTrue(GridTile(self.grid_, coord)._unoccupy())
+        self.assertNotIn(coord, self.grid_.occupancy)
+
+    def test_map_views(self):
+        map_ = Map(0, 0.0)
+        coord = Coordinate(-1, -1)
+        map_.add_tile(Tile(coord, Icon.MINERAL))
+        self.assertEqual(map_[coord].icon, Icon.MINERAL)
+        self.assertEqual(list(map_), [coord])
+        self.assertIsNone(map_.get(Coordinate(0, 0), None))
+        with self.assertRaises(KeyError):
+            map_[Coordinate(0, 0)]
+
+    def test_map_view_writes_through_map(self):
+        map_ = Map(0, 0.0)
+        coord = Coordinate(1, 1)
+        map_.add_tile(Tile(coord, Icon.WALL))
+        version = map_.version
+        map_[coord].icon = Icon.MINERAL
+        self.assertEqual(map_[coord].icon, Icon.MINERAL)
+        self.assertEqual(map_.changes_since(version)[0], coord)
+        self.assertIn(coord, map_.untasked_minerals)
+        self.assertEqual(set(map_.frontier()), set(coord.cardinals()))
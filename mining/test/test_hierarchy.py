@@ -0,0 +1,140 @@
+"""Test class for hierarchical path finding."""
+import random
+import unittest
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils.hierarchy import ClusterGraph
+
+from .testing_utils import TestingUtils
+
+
+class TestClusterGraph(unittest.TestCase):
+    RANDOM_TEST_RUNS = 30
+    SIZE = 24
+    CLUSTER_SIZE = 6
+    ICONS = [Icon.EMPTY] * 7 + [Icon.ACID, Icon.WALL, Icon.WALL]
+
+    def setUp(self) -> None:
+        self.map_ = Map(0, 0.0)
+        for x in range(self.SIZE):
+            for y in range(self.SIZE):
+                self.map_.add_tile(
+                    Tile(Coordinate(x, y), random.choice(self.ICONS))
+                )
+        self.graph_ = ClusterGraph(
+            self.map_.terrain_weight, self.CLUSTER_SIZE
+        )
+        for coord in self.map_:
+            self.graph_.notify(coord)
+
+    def _random_open_coordinate(self) -> Coordinate:
+        while True:
+            coord = TestingUtils.randomize_coordinate(0, self.SIZE - 1)
+            if self.map_.terrain_weight(coord) is not None:
+                return coord
+
+    def _assert_matches_astar(self, start, end):
+        path = self.graph_.find_path(start, end)
+        expected = self.map_.astar(start, end)
+        if not expected:
+            self.assertEqual(path, [])
+            return
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        for coord, next_coord in zip(path, path[1:]):
+            self.assertIn(next_coord, coord.cardinals())
+        for coord in path[1:-1]:
+            self.assertIsNotNone(self.map_.terrain_weight(coord))
+        self.assertGreaterEqual(
+            TestingUtils.path_cost(self.map_, path),
+            TestingUtils.path_cost(self.map_, expected),
+        )
+
+    def test_paths_are_valid(self):
+        for _ in range(self.RANDOM_TEST_RUNS):
+            self._assert_matches_astar(
+                self._random_open_coordinate(), self._random_open_coordinate()
+            )
+
+    def test_open_map_is_optimal(self):
+        map_ = TestingUtils.build_map(["_" * self.SIZE] * self.SIZE)
+        graph = ClusterGraph(map_.terrain_weight, self.CLUSTER_SIZE)
+        for coord in map_:
+            graph.notify(coord)
+        start = Coordinate(0, 0)
+        end = Coordinate(self.SIZE - 1, self.SIZE - 1)
+        path = graph.find_path(start, end)
+        self.assertEqual(len(path), 2 * (self.SIZE - 1) + 1)
+
+    def test_unreachable(self):
+        start = Coordinate(0, 0)
+        self.map_.add_tile(Tile(start, Icon.EMPTY))
+        for coord in start.cardinals():
+            self.map_.add_tile(Tile(coord, Icon.WALL))
+            self.graph_.notify(coord)
+        self.assertEqual(
+            self.graph_.find_path(start, Coordinate(self.SIZE - 1, 0)), []
+        )
+
+    def test_unpathable_end_on_border(self):
+        # the mineral is only reachable from the cluster to its right
+        map_ = TestingUtils.build_map(
+            [
+                "#####_#######",
+                "#####*      #",
+                "#############",
+            ]
+        )
+        graph = ClusterGraph(map_.terrain_weight, 6)
+        for coord in map_:
+            graph.notify(coord)
+        start, end = Coordinate(11, 1), Coordinate(5, 1)
+        path = graph.find_path(start, end)
+        self.assertEqual(path, map_.astar(start, end))
+        self.assertEqual(
+            graph.find_path(Coordinate(6, 1), end), [Coordinate(6, 1), end]
+        )
+
+    def test_start_is_end(self):
+        start = self._random_open_coordinate()
+        self.assertEqual(self.graph_.find_path(start, start), [start])
+
+    def test_updates(self):
+        for _ in range(self.RANDOM_TEST_RUNS):
+            for _ in range(random.randint(1, 5)):
+                coord = TestingUtils.randomize_coordinate(0, self.SIZE - 1)
+                self.map_.add_tile(Tile(coord, random.choice(self.ICONS)))
+                self.graph_.notify(coord)
+            self._assert_matches_astar(
+                self._random_open_coordinate(), self._random_open_coordinate()
+            )
+
+    def test_map_switches_above_threshold(self):
+        self.map_.HIERARCHY_THRESHOLD = 0
+        start = self._random_open_coordinate()
+        end = self._random_open_coordinate()
+        path = self.map_.dijkstra(start, end)
+        self.assertEqual(path, self.map_.hierarchical_path(start, end))
+        self.assertEqual(bool(path), bool(self.map_.astar(start, end)))
+
+    def test_origin_paths_switch_above_threshold(self):
+        map_ = TestingUtils.build_map(
+            ["#######", "#_ ~ *#", "# ### #", "#     #", "#######"]
+        )
+        map_.HIERARCHY_THRESHOLD = 0
+        mineral = Coordinate(5, 1)
+        path = map_.path_to_origin(mineral)
+        self.assertEqual(path, map_.hierarchical_path(mineral, map_.origin))
+        self.assertEqual(
+            map_.path_from_origin(mineral),
+            map_.hierarchical_path(map_.origin, mineral),
+        )
+        self.assertIsNone(map_._origin_tree)
+        self.assertEqual(
+            TestingUtils.path_cost(map_, path),
+            TestingUtils.path_cost(map_, map_.astar(mineral, map_.origin)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Test class for loading map files."""
+import os
+import tempfile
+import unittest
+
+from mining.simulation import World
+from mining.utils import Coordinate, Icon, Map, load_map
+from mining.utils.loader import decode_row, read_rows
+
+from .testing_utils import TestingUtils
+
+
+class TestLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory_ = tempfile.TemporaryDirectory()
+        self.path_ = os.path.join(self.directory_.name, "map.txt")
+        self.rows_ = [
+            "#######",
+            "#_ 3~ #",
+            "# #* 9#",
+            "#######",
+        ]
+        with open(self.path_, "w", encoding="ascii", newline="\r\n") as file:
+            file.write("\n".join(self.rows_) + "\n")
+
+    def tearDown(self) -> None:
+        self.directory_.cleanup()
+
+    def test_read_rows(self):
+        rows = list(read_rows(self.path_))
+        self.assertEqual(rows, [row.encode("ascii") for row in self.rows_])
+
+    def test_decode_row(self):
+        row, amounts = decode_row(b"# #* 9#")
+        self.assertEqual(row, b"# #* *#")
+        self.assertEqual(amounts, [(3, 1), (5, 9)])
+
+    def test_zero_digit(self):
+        # 0 is a mineral tile with nothing left in it, as it always was
+        row, amounts = decode_row(b"#0_")
+        self.assertEqual(row, b"#*_")
+        self.assertEqual(amounts, [(1, 0)])
+        path = os.path.join(self.directory_.name, "zero.txt")
+        with open(path, "w") as map_file:
+            map_file.write("#0_#\n")
+        map_ = load_map(path)
+        self.assertEqual(map_[Coordinate(1, 0)].icon, Icon.MINERAL)
+        world = World.from_lines(0, ["#0_#\n"])
+        self.assertEqual(world.tile(Coordinate(1, 0)), Icon.MINERAL)
+        self.assertEqual(world.minerals[Coordinate(1, 0)], 0)
+        self.assertFalse(world.mine(Coordinate(1, 0)))
+
+    def test_load_map(self):
+        map_ = load_map(self.path_, 4)
+        self.assertEqual(map_.map_id, 4)
+        self.assertEqual(map_.origin, Coordinate(1, 1))
+        self.assertEqual(map_[Coordinate(3, 1)].icon, Icon.MINERAL)
+        self.assertEqual(map_[Coordinate(4, 1)].icon, Icon.ACID)
+        self.assertEqual(len(map_.untasked_minerals), 3)
+        self.assertAlmostEqual(map_.density, 3 / 28)
+        self.assertEqual(set(map_.frontier()), set(), "walled in")
+        path = map_.dijkstra(Coordinate(1, 1), Coordinate(3, 1))
+        self.assertEqual(len(path), 3)
+
+    def test_load_matches_tiles(self):
+        rows = ["  #", "_ ~*", "# "]
+        map_ = TestingUtils.build_map(rows)
+        tiles = {tile.coordinate: tile.icon for tile in map_.tiles()}
+        self.assertEqual(len(tiles), 9)
+        self.assertEqual(tiles[Coordinate(3, 1)], Icon.MINERAL)
+        self.assertIn(Coordinate(0, -1), map_.frontier())
+        self.assertIn(Coordinate(1, 3), map_.frontier())
+        self.assertIn(Coordinate(2, 2), map_.frontier(), "past a short row")
+        self.assertNotIn(Coordinate(2, 1), map_.frontier())
+
+    def test_load_errors(self):
+        map_ = Map(0, 0.0)
+        with self.assertRaises(ValueError):
+            map_.load_rows([b"#_#", b"#x#"])
+        with self.assertRaises(ValueError):
+            map_.load_rows([b"#"])
+
+    def test_load_world(self):
+        world = World.load(2, self.path_)
+        self.assertEqual(world.deploy_zone, Coordinate(1, 1))
+        self.assertEqual(world.minerals[Coordinate(5, 2)], 9)
+        self.assertEqual(world.minerals[Coordinate(3, 2)], 1)
+        self.assertEqual(bytes(world.rows[1]), b"#_ *~ #")
+
+
+if __name__ == "__main__":
+    unittest.main()
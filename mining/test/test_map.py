@@ -0,0 +1,318 @@
+"""Test class for maps."""
+import random
+import unittest
+
+from mining.utils import Context, Coordinate, Icon, Map, Tile
+
+from .testing_utils import TestingUtils
+
+
+class TestMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.map_ = TestingUtils.build_map(
+            [
+                "#########",
+                "#_  ~   #",
+                "# ##~## #",
+                "#   ~  *#",
+                "#########",
+            ]
+        )
+
+    def test_path_avoids_acid(self):
+        path = self.map_.dijkstra(Coordinate(1, 1), Coordinate(7, 1))
+        self.assertEqual(path[0], Coordinate(1, 1))
+        self.assertEqual(path[-1], Coordinate(7, 1))
+        self.assertEqual(TestingUtils.path_cost(self.map_, path), 15)
+
+    def test_path_is_connected(self):
+        path = self.map_.dijkstra(Coordinate(1, 3), Coordinate(7, 1))
+        for prev, curr in zip(path, path[1:]):
+            self.assertIn(curr, prev.cardinals())
+
+    def test_path_to_mineral(self):
+        mineral = Coordinate(7, 3)
+        path = self.map_.dijkstra(Coordinate(7, 1), mineral)
+        self.assertEqual(path, [Coordinate(7, 1), Coordinate(7, 2), mineral])
+
+    def test_path_blocked(self):
+        self.map_.add_tile(Tile(Coordinate(4, 1), Icon.WALL))
+        self.map_.add_tile(Tile(Coordinate(4, 2), Icon.WALL))
+        self.map_.add_tile(Tile(Coordinate(4, 3), Icon.WALL))
+        self.assertEqual(
+            self.map_.dijkstra(Coordinate(1, 1), Coordinate(7, 1)), []
+        )
+
+    def test_path_start_is_end(self):
+        start = Coordinate(1, 1)
+        self.assertEqual(self.map_.dijkstra(start, start), [start])
+
+    def test_jump_point_path_avoids_acid(self):
+        path = self.map_.dijkstra(
+            Coordinate(1, 1), Coordinate(7, 1), jump_points=True
+        )
+        self.assertEqual(path[0], Coordinate(1, 1))
+        self.assertEqual(path[-1], Coordinate(7, 1))
+        for prev, curr in zip(path, path[1:]):
+            self.assertIn(curr, prev.cardinals())
+        self.assertEqual(TestingUtils.path_cost(self.map_, path), 15)
+
+    def test_jump_point_path_to_mineral(self):
+        mineral = Coordinate(7, 3)
+        path = self.map_.astar(Coordinate(1, 3), mineral, jump_points=True)
+        self.assertEqual(path, self.map_.astar(Coordinate(1, 3), mineral))
+
+    def test_jump_point_path_blocked(self):
+        self.map_.add_tile(Tile(Coordinate(4, 2), Icon.WALL))
+        self.map_.add_tile(Tile(Coordinate(4, 3), Icon.WALL))
+        self.map_.add_tile(Tile(Coordinate(4, 1), Icon.WALL))
+        self.assertEqual(
+            self.map_.astar(Coordinate(1, 1), Coordinate(7, 1), True), []
+        )
+
+    def test_jump_point_cost_matches_astar(self):
+        icons = [Icon.EMPTY] * 6 + [Icon.ACID, Icon.WALL, Icon.WALL]
+        map_ = Map(0, 0.0)
+        for x in range(12):
+            for y in range(12):
+                map_.add_tile(Tile(Coordinate(x, y), random.choice(icons)))
+        for _ in range(50):
+            start = TestingUtils.randomize_coordinate(0, 11)
+            end = TestingUtils.randomize_coordinate(0, 11)
+            if map_.weight(start) is None:
+                continue
+            expected = map_.astar(start, end)
+            path = map_.astar(start, end, jump_points=True)
+            self.assertEqual(
+                TestingUtils.path_cost(map_, path),
+                TestingUtils.path_cost(map_, expected),
+            )
+            self.assertEqual(path[:1], expected[:1])
+            self.assertEqual(path[-1:], expected[-1:])
+
+    def test_update_context(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(0, 0, "#", " ", "~", "*"))
+        self.assertEqual(map_.origin, Coordinate(0, 0))
+        self.assertEqual(map_[Coordinate(0, -1)].icon, Icon.WALL)
+        self.assertEqual(map_[Coordinate(1, 0)].icon, Icon.ACID)
+        self.assertIn(Coordinate(-1, 0), map_.untasked_minerals)
+        self.assertFalse(map_[Coordinate(0, 2)].discovered)
+
+    def test_apply_contexts(self):
+        map_ = Map(1, 0.5)
+        map_.apply_contexts(
+            [
+                Context(0, 0, "#", " ", " ", "*"),
+                Context(1, 0, "#", "~", " ", "Z"),
+            ]
+        )
+        self.assertEqual(map_.origin, Coordinate(0, 0))
+        changes = map_.changes_since(0)
+        self.assertEqual(
+            [coord for coord in changes if map_[coord].discovered],
+            [
+                Coordinate(0, 0),
+                Coordinate(0, -1),
+                Coordinate(0, 1),
+                Coordinate(1, 0),
+                Coordinate(-1, 0),
+                Coordinate(1, -1),
+                Coordinate(1, 1),
+                Coordinate(2, 0),
+            ],
+        )
+        self.assertEqual(set(map_.untasked_minerals), {Coordinate(-1, 0)})
+
+    def test_drones_not_stored_over_terrain(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(0, 0, "#", " ", "~", "*"))
+        version = map_.version
+        map_.apply_contexts(
+            [
+                Context(0, 0, "#", "Z", "Z", "Z"),
+                Context(1, 1, "~", " ", " ", "Z"),
+                Context(0, 2, "Z", " ", " ", " "),
+            ]
+        )
+        self.assertEqual(map_[Coordinate(0, 1)].icon, Icon.EMPTY)
+        self.assertEqual(map_[Coordinate(1, 0)].icon, Icon.ACID)
+        self.assertEqual(map_[Coordinate(-1, 0)].icon, Icon.MINERAL)
+        known = {Coordinate(0, 1), Coordinate(1, 0), Coordinate(-1, 0)}
+        self.assertFalse(known & set(map_.changes_since(version)))
+        # a drone on a tile nothing else has reported is all that is known
+        map_.update_context(Context(5, 5, "Z", " ", " ", " "))
+        self.assertEqual(map_[Coordinate(5, 4)].icon, Icon.ZERG)
+        # the drone reported over the deploy zone does not replace it
+        self.assertEqual(map_[Coordinate(0, 0)].icon, Icon.DEPLOY_ZONE)
+        self.assertIn(Coordinate(-1, 0), map_.untasked_minerals)
+
+    def test_apply_contexts_skips_unchanged(self):
+        map_ = Map(1, 0.5)
+        context = Context(0, 0, "#", " ", "~", "*")
+        map_.apply_contexts([context])
+        version = map_.version
+        map_.apply_contexts([context])
+        self.assertEqual(map_.version, version)
+        map_.apply_contexts(
+            [
+                Context(0, 0, " ", " ", "~", " "),
+                Context(0, 0, "*", " ", "~", " "),
+            ]
+        )
+        self.assertEqual(
+            map_.changes_since(version), [Coordinate(0, -1), Coordinate(-1, 0)]
+        )
+        self.assertIn(Coordinate(0, -1), map_.untasked_minerals)
+        self.assertEqual(map_[Coordinate(0, -1)].icon, Icon.MINERAL)
+
+    def test_apply_contexts_returns_version(self):
+        map_ = Map(1, 0.5)
+        self.assertEqual(
+            map_.apply_contexts([Context(0, 0, "#", " ", "~", " ")]), 0
+        )
+        version = map_.version
+        self.assertEqual(
+            map_.apply_contexts([Context(0, 1, "_", "*", " ", "#")]),
+            version,
+        )
+        changes = map_.changes_since(version)
+        self.assertEqual(
+            [coord for coord in changes if map_[coord].discovered],
+            [Coordinate(0, 2), Coordinate(1, 1), Coordinate(-1, 1)],
+        )
+        self.assertEqual(
+            [coord for coord in changes if map_[coord].icon == Icon.MINERAL],
+            [Coordinate(0, 2)],
+        )
+        self.assertEqual(map_.apply_contexts([]), map_.version)
+
+    def test_apply_contexts_matches_update_context(self):
+        rng = random.Random(0)
+        contexts = [
+            Context(
+                rng.randrange(6),
+                rng.randrange(6),
+                *rng.choices(" #~*Z", k=4),
+            )
+            for _ in range(60)
+        ]
+        one_at_a_time, batched = Map(1, 0.5), Map(1, 0.5)
+        for context in contexts:
+            one_at_a_time.update_context(context)
+        batched.apply_contexts(contexts)
+        self.assertEqual(
+            [tile.icon for tile in one_at_a_time.tiles()],
+            [batched[tile].icon for tile in one_at_a_time.tiles()],
+        )
+        self.assertEqual(set(one_at_a_time), set(batched))
+        self.assertEqual(
+            set(one_at_a_time.frontier()), set(batched.frontier())
+        )
+
+    def test_changes_since(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(0, 0, "#", " ", " ", " "))
+        version = map_.version
+        self.assertEqual(map_.changes_since(version), [])
+        map_.update_context(Context(0, 1, " ", "#", "#", " "))
+        self.assertGreater(map_.version, version)
+        changes = map_.changes_since(version)
+        self.assertEqual(len(changes), len(set(changes)))
+        self.assertEqual(
+            changes[:3], [Coordinate(0, 0), Coordinate(0, 2), Coordinate(0, 3)]
+        )
+        self.assertNotIn(Coordinate(0, -1), changes)
+        self.assertEqual(map_.changes_since(map_.version), [])
+
+    def test_changes_since_forgets_old_changes(self):
+        map_ = Map(1, 0.5)
+        map_.CHANGE_LOG_LIMIT = 4
+        map_.update_context(Context(0, 0, "#", " ", " ", " "))
+        self.assertIsNone(map_.changes_since(0))
+        self.assertEqual(len(map_.changes_since(map_.version - 4)), 4)
+        self.assertLessEqual(len(map_._change_log), 2 * 4)
+        loaded = TestingUtils.build_map(["_ "])
+        self.assertIsNone(loaded.changes_since(loaded.version - 1))
+        self.assertEqual(loaded.changes_since(loaded.version), [])
+
+    def test_dirty_chunks(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(0, 0, "#", " ", " ", " "))
+        self.assertEqual(
+            map_.dirty_chunks(0), {(0, 0), (0, -1), (-1, 0), (-1, -1)}
+        )
+        version = map_.version
+        map_.update_context(Context(40, 3, "#", " ", " ", " "))
+        self.assertEqual(map_.dirty_chunks(version), {(1, 0)})
+        self.assertEqual(map_.dirty_chunks(map_.version), set())
+
+    def test_chunk_stats(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(31, 0, "#", " ", "*", " "))
+        self.assertEqual(
+            map_.chunk_stats(),
+            [
+                ((0, -1), 3, 1, 0),
+                ((0, 0), 6, 3, 0),
+                ((1, -1), 1, 0, 0),
+                ((1, 0), 3, 1, 1),
+            ],
+        )
+
+    def test_frontier_updates(self):
+        map_ = Map(1, 0.5)
+        map_.update_context(Context(0, 0, "#", " ", "~", "*"))
+        # tiles next to the mineral are explored past too
+        mineral_neighbors = {Coordinate(-2, 0), Coordinate(-1, -1)}
+        self.assertEqual(
+            set(map_.frontier()),
+            {
+                Coordinate(0, 2),
+                Coordinate(-1, 1),
+                Coordinate(1, 1),
+                Coordinate(2, 0),
+                Coordinate(1, -1),
+                *mineral_neighbors,
+            },
+        )
+        map_.update_context(Context(0, 1, " ", "#", "#", "#"))
+        self.assertEqual(
+            set(map_.frontier()),
+            {Coordinate(2, 0), Coordinate(1, -1), *mineral_neighbors},
+        )
+
+    def test_frontier_matches_scan(self):
+        map_ = Map(1, 0.5)
+        for x in range(5):
+            map_.update_context(Context(x, 0, " ", "#*"[x % 2]))
+        # the neighbour rule scouts used before the frontier was kept
+        explored_past = {Icon.MINERAL, Icon.EMPTY, Icon.DEPLOY_ZONE, Icon.ACID}
+        expected = {
+            tile.coordinate
+            for tile in map_.get_unexplored_tiles()
+            if any(
+                map_.get(coord, Tile(coord)).icon in explored_past
+                for coord in tile.coordinate.cardinals()
+            )
+        }
+        self.assertEqual(set(map_.frontier()), expected)
+
+    def test_nearest_paths(self):
+        start = Coordinate(1, 1)
+        goals = {Coordinate(7, 3), Coordinate(3, 3), Coordinate(0, 0)}
+        paths = self.map_.nearest_paths(start, goals, limit=3)
+        self.assertEqual(
+            [path[-1] for path in paths], [Coordinate(3, 3), Coordinate(7, 3)]
+        )
+        self.assertEqual(TestingUtils.path_cost(self.map_, paths[0]), 4)
+
+    def test_nearest_paths_order(self):
+        start = Coordinate(1, 1)
+        goals = {Coordinate(7, 3), Coordinate(3, 3), Coordinate(2, 1)}
+        paths = self.map_.nearest_paths(start, goals, limit=2)
+        self.assertEqual(
+            [path[-1] for path in paths], [Coordinate(2, 1), Coordinate(3, 3)]
+        )
+        for path in paths:
+            self.assertEqual(path, self.map_.dijkstra(start, path[-1]))
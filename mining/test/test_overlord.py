@@ -0,0 +1,139 @@
+"""Test class for how the Overlord deploys and recalls drones."""
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Context, Coordinate
+from mining.zerg_units import Overlord, Strategy
+from mining.zerg_units.drones import ScoutDrone
+
+
+class TestOverlord(unittest.TestCase):
+    def setUp(self) -> None:
+        self.overlord_ = Overlord(10, 60, Mock(), Strategy(max_drones=3))
+        self.overlord_.add_map(0, 0.1)
+        self.map_ = self.overlord_._maps[0]
+        self.origin_ = Coordinate(0, 0)
+        self.map_.update_context(Context(0, 0, "#", " ", " ", "#"))
+        self.scouts_ = [
+            drone
+            for drone in self.overlord_.drones.values()
+            if isinstance(drone, ScoutDrone)
+        ]
+
+    def _deploy(self, drone, coordinate=None):
+        self.overlord_._idle_drones[ScoutDrone].pop(drone, None)
+        self.overlord_._deploy_drone(self.map_, drone)
+        self.map_.scout_count += 1
+        self.map_[coordinate or self.origin_].occupied_drone = drone
+
+    def _explore_map(self):
+        # wall in the two tiles next to the deploy zone
+        self.map_.update_context(Context(1, 0, "#", "#", "#", " "))
+        self.map_.update_context(Context(0, 1, " ", "#", "#", "#"))
+
+    def test_recall_waiting_drone_on_deploy_zone(self):
+        scout = self.scouts_[0]
+        self._deploy(scout)
+        self.overlord_.request_pickup(scout)
+        self.overlord_.request_pickup(scout)
+        self.assertEqual(
+            self.overlord_._recall_drones(), f"RETURN {id(scout)}"
+        )
+        self.assertEqual(self.overlord_._recall_drones(), "")
+        self.assertIsNone(self.map_[self.origin_].occupied_drone)
+        self.assertEqual(self.map_.scout_count, 0)
+        self.assertIn(scout, self.overlord_._idle_drones[ScoutDrone])
+
+    def test_recall_skips_drones_off_deploy_zone(self):
+        scout = self.scouts_[0]
+        self._deploy(scout, Coordinate(1, 0))
+        self.overlord_.request_pickup(scout)
+        self.assertEqual(self.overlord_._recall_drones(), "")
+        self.assertIs(self.overlord_._deployed[id(scout)], self.map_)
+
+    def test_recall_skips_traveling_drones(self):
+        scout = self.scouts_[0]
+        self._deploy(scout)
+        scout.path = [self.origin_, Coordinate(1, 0), Coordinate(2, 0)]
+        self.overlord_.request_pickup(scout)
+        self.assertEqual(self.overlord_._recall_drones(), "")
+        self.assertIs(self.overlord_._deployed[id(scout)], self.map_)
+
+    def test_select_map_skips_explored_maps(self):
+        self.overlord_.add_map(1, 0.0)
+        explored = self.overlord_._maps[1]
+        explored.update_context(Context(0, 0, "#", "#", "#", "#"))
+        self.assertFalse(explored.frontier())
+        self.assertIs(self.overlord_._select_map(), self.map_)
+        self._explore_map()
+        self.assertIsNone(self.overlord_._select_map())
+        self.assertEqual(self.overlord_._deploy_scouts(), "")
+
+    def test_scouts_counted_at_deploy(self):
+        self.overlord_.add_map(1, 0.5)
+        action = self.overlord_._deploy_scouts()
+        self.assertTrue(action.endswith(" 0"))
+        self.assertEqual(self.map_.scout_count, 1)
+        self.assertIs(self.overlord_._select_map(), self.overlord_._maps[1])
+
+    def test_deploys_wait_for_a_free_deploy_zone(self):
+        reservations = self.map_.reservations
+        self.assertFalse(self.overlord_._origin_blocked(self.map_))
+        # a drone passing over the deploy zone next tick
+        step = Coordinate(1, 0)
+        reservations.reserve(1, [step, self.origin_, step])
+        self.assertTrue(self.overlord_._origin_blocked(self.map_))
+        self.assertEqual(self.overlord_._deploy_scouts(), "")
+        reservations.advance()
+        self.assertTrue(self.overlord_._origin_blocked(self.map_))
+        reservations.advance()
+        self.assertFalse(self.overlord_._origin_blocked(self.map_))
+        self.map_[self.origin_].occupied_drone = self.scouts_[0]
+        self.assertTrue(self.overlord_._origin_blocked(self.map_))
+
+    def test_scouts_head_home_when_explored(self):
+        self._explore_map()
+        scout = self.scouts_[0]
+        step = Coordinate(1, 0)
+        self._deploy(scout, step)
+        self.overlord_._set_drone_path(scout, Context(*step))
+        self.assertEqual(list(scout.path), [step, self.origin_])
+        self.assertEqual(self.overlord_._recall_drones(), "")
+
+    def test_scouts_picked_up_when_explored(self):
+        self._explore_map()
+        scout = self.scouts_[0]
+        self._deploy(scout)
+        self.overlord_._set_drone_path(scout, Context(*self.origin_))
+        self.assertFalse(scout.path)
+        self.assertEqual(
+            self.overlord_._recall_drones(), f"RETURN {id(scout)}"
+        )
+
+    def test_first_context_occupies_deploy_zone(self):
+        self.overlord_.add_map(1, 0.1)
+        map_ = self.overlord_._maps[1]
+        scout = self.scouts_[0]
+        self.overlord_._deploy_drone(map_, scout)
+        self.overlord_.enqueue_map_update(scout, Context(4, 2))
+        self.overlord_._process_updates()
+        self.assertEqual(map_.origin, Coordinate(4, 2))
+        self.assertIs(map_[map_.origin].occupied_drone, scout)
+        self.assertTrue(self.overlord_._origin_blocked(map_))
+
+    def test_only_waiting_scouts_given_paths(self):
+        waiting = self.scouts_[0]
+        self.overlord_._create_drone(type(waiting))
+        traveling = [*self.overlord_.drones.values()][-1]
+        self._deploy(waiting)
+        self._deploy(traveling, Coordinate(0, 1))
+        traveling.path = [Coordinate(0, y) for y in range(1, 4)]
+        self.overlord_.enqueue_map_update(waiting, Context(0, 0, "#", " "))
+        self.overlord_.enqueue_map_update(traveling, Context(0, 1))
+        self.overlord_._process_updates()
+        self.assertTrue(waiting.path)
+        self.assertEqual(traveling.dest, Coordinate(0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
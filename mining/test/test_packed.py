@@ -0,0 +1,60 @@
+"""Test class for coordinates packed into integer keys."""
+import unittest
+
+from mining.utils import Coordinate, packed
+from mining.utils.search import astar, packed_astar
+from mining.test.testing_utils import TestingUtils
+
+
+class TestPacked(unittest.TestCase):
+    def test_round_trip(self):
+        for x, y in ((0, 0), (5, -3), (-7, 12), (-1, -1), (2**30, -(2**30))):
+            key = packed.pack(x, y)
+            self.assertEqual(packed.unpack(key), (x, y))
+            self.assertEqual(packed.coordinate(key), Coordinate(x, y))
+
+    def test_neighbors(self):
+        coord = Coordinate(-2, 4)
+        self.assertEqual(
+            packed.coordinates(packed.neighbors(packed.pack(*coord))),
+            list(coord.cardinals()),
+        )
+
+    def test_direction(self):
+        key = packed.pack(3, 3)
+        for neighbor, name in zip(
+            packed.neighbors(key), ("north", "south", "east", "west")
+        ):
+            self.assertEqual(packed.direction(key, neighbor), name)
+        self.assertEqual(packed.direction(key, key), "center")
+        self.assertEqual(packed.direction(key, packed.pack(4, 4)), "")
+
+    def test_distance(self):
+        self.assertEqual(
+            packed.distance(packed.pack(-3, 2), packed.pack(4, -1)), 10
+        )
+
+    def test_same_path_as_coordinates(self):
+        map_ = TestingUtils.build_map(
+            [
+                "#########",
+                "#_  ~  *#",
+                "# ## ## #",
+                "#   ~   #",
+                "#########",
+            ]
+        )
+        start, end = Coordinate(1, 1), Coordinate(7, 1)
+        path = packed_astar(
+            packed.pack(*start), packed.pack(*end), map_.packed_weight
+        )
+        self.assertEqual(
+            packed.coordinates(path), astar(start, end, map_.weight)
+        )
+        self.assertEqual(
+            map_.astar(start, end), astar(start, end, map_.weight)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
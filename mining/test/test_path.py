@@ -0,0 +1,79 @@
+"""Test class for paths walked with a cursor."""
+import unittest
+
+from mining.utils import Coordinate, Path
+
+
+class TestPath(unittest.TestCase):
+    def setUp(self) -> None:
+        self.steps_ = [Coordinate(x, 0) for x in range(5)]
+        self.path_ = Path(self.steps_)
+
+    def test_sequence(self):
+        self.assertEqual(len(self.path_), 5)
+        self.assertEqual(self.path_[0], Coordinate(0, 0))
+        self.assertEqual(self.path_[-1], Coordinate(4, 0))
+        self.assertEqual(list(self.path_), self.steps_)
+        self.assertEqual(self.path_, self.steps_)
+        self.assertEqual(self.path_.destination, Coordinate(4, 0))
+        self.assertFalse(Path())
+        self.assertIsNone(Path().destination)
+        with self.assertRaises(IndexError):
+            self.path_[5]
+
+    def test_advance(self):
+        self.assertIsNone(self.path_.previous)
+        self.assertEqual(self.path_.advance(), Coordinate(0, 0))
+        self.assertEqual(self.path_.advance(), Coordinate(1, 0))
+        self.assertEqual(self.path_, self.steps_[2:])
+        self.assertEqual(self.path_.previous, Coordinate(1, 0))
+        self.assertEqual(self.path_.traveled(), self.steps_[1::-1])
+        self.assertEqual(self.path_.rewind(), Coordinate(1, 0))
+        self.assertEqual(self.path_, self.steps_[1:])
+        for _ in range(4):
+            self.path_.advance()
+        with self.assertRaises(IndexError):
+            self.path_.advance()
+
+    def test_reverse(self):
+        self.path_.advance()
+        self.path_.advance()
+        self.path_.reverse()
+        self.assertEqual(self.path_, self.steps_[1::-1])
+        self.assertEqual(self.path_.traveled(), self.steps_[2:])
+        self.assertEqual(self.path_.previous, Coordinate(2, 0))
+        self.assertEqual(self.path_.advance(), Coordinate(1, 0))
+        self.assertEqual(self.path_.previous, Coordinate(1, 0))
+        self.path_.reverse()
+        self.assertEqual(self.path_, self.steps_[1:])
+
+    def test_skip(self):
+        self.path_.advance()
+        self.assertEqual(self.path_.skip(), Coordinate(1, 0))
+        self.assertEqual(self.path_, self.steps_[2:])
+        self.assertEqual(self.path_.traveled(), self.steps_[:1])
+        self.path_.reverse()
+        self.assertEqual(self.path_.skip(), Coordinate(0, 0))
+        self.assertFalse(self.path_)
+        self.assertEqual(self.path_.traveled(), self.steps_[2:])
+
+    def test_replace_ahead(self):
+        detour = [Coordinate(2, 0), Coordinate(2, 1), Coordinate(3, 1)]
+        self.path_.advance()
+        self.path_.advance()
+        self.path_.replace_ahead(detour)
+        self.assertEqual(self.path_, detour)
+        self.assertEqual(self.path_.traveled(), self.steps_[1::-1])
+        self.path_.reverse()
+        self.path_.replace_ahead(self.steps_[:1])
+        self.assertEqual(self.path_, self.steps_[:1])
+        self.assertEqual(self.path_.traveled(), detour)
+
+    def test_resume(self):
+        path = Path.resume(self.steps_[2:], self.steps_[1::-1])
+        self.assertEqual(path, self.steps_[2:])
+        self.assertEqual(path.traveled(), self.steps_[1::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
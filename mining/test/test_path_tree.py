@@ -0,0 +1,89 @@
+"""Test class for shortest path trees."""
+import random
+import unittest
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils.path_tree import ShortestPathTree
+
+from .testing_utils import TestingUtils
+
+
+class TestShortestPathTree(unittest.TestCase):
+    RANDOM_TEST_RUNS = 30
+    SIZE = 10
+    ICONS = [Icon.EMPTY] * 6 + [Icon.ACID, Icon.WALL, Icon.WALL, None]
+
+    def setUp(self) -> None:
+        self.map_ = Map(0, 0.0)
+        self.root_ = Coordinate(0, 0)
+        for x in range(self.SIZE):
+            for y in range(self.SIZE):
+                self.map_.add_tile(
+                    Tile(Coordinate(x, y), random.choice(self.ICONS))
+                )
+        self.map_.origin = self.root_
+        self.tree_ = ShortestPathTree(self.map_.terrain_weight, self.root_)
+
+    def _assert_matches_fresh_tree(self):
+        fresh = ShortestPathTree(self.map_.terrain_weight, self.root_)
+        for coord in self.map_:
+            self.assertEqual(
+                self.tree_.distance(coord), fresh.distance(coord), coord
+            )
+            path = self.tree_.path_to(coord)
+            if path and self.map_.terrain_weight(coord) is not None:
+                self.assertEqual(path[0], self.root_)
+                self.assertEqual(path[-1], coord)
+                self.assertEqual(
+                    TestingUtils.path_cost(self.map_, path),
+                    self.tree_.distance(coord),
+                )
+
+    def test_tree_matches_search(self):
+        for coord in self.map_:
+            if self.map_.terrain_weight(coord) is None:
+                continue
+            path = self.map_.dijkstra(self.root_, coord)
+            if path:
+                self.assertEqual(
+                    self.tree_.distance(coord),
+                    TestingUtils.path_cost(self.map_, path),
+                )
+            else:
+                self.assertEqual(self.tree_.distance(coord), float("inf"))
+
+    def test_tree_updates(self):
+        for _ in range(self.RANDOM_TEST_RUNS):
+            for _ in range(random.randint(1, 5)):
+                coord = TestingUtils.randomize_coordinate(
+                    0, self.SIZE, avoid=self.root_
+                )
+                icon = random.choice([Icon.EMPTY, Icon.ACID, Icon.WALL])
+                self.map_.add_tile(Tile(coord, icon))
+                self.tree_.notify(coord)
+            self._assert_matches_fresh_tree()
+
+    def test_path_to_unenterable(self):
+        self.map_.add_tile(Tile(Coordinate(1, 0), Icon.EMPTY))
+        self.map_.add_tile(Tile(Coordinate(2, 0), Icon.MINERAL))
+        self.tree_.notify(Coordinate(1, 0))
+        self.tree_.notify(Coordinate(2, 0))
+        self.assertEqual(
+            self.tree_.path_to(Coordinate(2, 0)),
+            [self.root_, Coordinate(1, 0), Coordinate(2, 0)],
+        )
+        self.assertEqual(
+            self.tree_.path_from(Coordinate(2, 0)),
+            [Coordinate(2, 0), Coordinate(1, 0), self.root_],
+        )
+
+    def test_map_paths(self):
+        self.map_.add_tile(Tile(Coordinate(1, 0), Icon.EMPTY))
+        self.assertEqual(
+            self.map_.path_from_origin(Coordinate(1, 0)),
+            [self.root_, Coordinate(1, 0)],
+        )
+        self.map_.add_tile(Tile(Coordinate(1, 0), Icon.WALL))
+        self.assertNotIn(
+            Coordinate(1, 0), self.map_.path_to_origin(Coordinate(1, 0))[1:]
+        )
@@ -0,0 +1,70 @@
+"""Test class for incremental path repair."""
+import random
+import unittest
+
+from mining.utils import Coordinate, Icon, Map, Tile
+from mining.utils.replan import PathRepairer
+
+from .testing_utils import TestingUtils
+
+
+class TestPathRepairer(unittest.TestCase):
+    RANDOM_TEST_RUNS = 20
+    SIZE = 12
+
+    def setUp(self) -> None:
+        self.map_ = Map(0, 0.0)
+        for x in range(self.SIZE):
+            for y in range(self.SIZE):
+                self.map_.add_tile(Tile(Coordinate(x, y), Icon.EMPTY))
+        self.start_ = Coordinate(0, 0)
+        self.goal_ = Coordinate(self.SIZE - 1, self.SIZE - 1)
+
+    def _reveal(self, repairer: PathRepairer, coord: Coordinate, icon: Icon):
+        self.map_.add_tile(Tile(coord, icon))
+        repairer.notify(coord)
+
+    def test_repair_matches_search(self):
+        repairer = PathRepairer(self.map_.weight, self.start_, self.goal_)
+        path = repairer.repair(self.start_)
+        self.assertEqual(
+            TestingUtils.path_cost(self.map_, path),
+            TestingUtils.path_cost(
+                self.map_, self.map_.dijkstra(self.start_, self.goal_)
+            ),
+        )
+        for _ in range(self.RANDOM_TEST_RUNS):
+            coord = TestingUtils.randomize_coordinate(
+                1, self.SIZE - 2, avoid=self.goal_
+            )
+            icon = random.choice([Icon.WALL, Icon.ACID])
+            self._reveal(repairer, coord, icon)
+            start = path[1] if coord != path[1] else path[0]
+            path = repairer.repair(start)
+            expected = self.map_.dijkstra(start, self.goal_)
+            self.assertEqual(bool(path), bool(expected))
+            if not path:
+                break
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], self.goal_)
+            self.assertEqual(
+                TestingUtils.path_cost(self.map_, path),
+                TestingUtils.path_cost(self.map_, expected),
+            )
+
+    def test_repair_unreachable(self):
+        repairer = PathRepairer(self.map_.weight, self.start_, self.goal_)
+        self.assertTrue(repairer.repair(self.start_))
+        self._reveal(repairer, Coordinate(1, 0), Icon.WALL)
+        self._reveal(repairer, Coordinate(0, 1), Icon.WALL)
+        self.assertEqual(repairer.repair(self.start_), [])
+
+    def test_map_repair_path(self):
+        drone = object()
+        path = self.map_.repair_path(drone, self.start_, self.goal_)
+        self.assertEqual(len(path), 2 * (self.SIZE - 1) + 1)
+        self.map_.add_tile(Tile(path[1], Icon.WALL))
+        repaired = self.map_.repair_path(drone, self.start_, self.goal_)
+        self.assertNotIn(path[1], repaired)
+        self.assertEqual(len(repaired), len(path))
+        self.map_.release_path(drone)
@@ -0,0 +1,119 @@
+"""Test class for space-time reservations."""
+import unittest
+from unittest.mock import Mock
+
+from mining.utils import Coordinate
+
+from .testing_utils import TestingUtils
+
+
+class TestReservationTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.map_ = TestingUtils.build_map(
+            [
+                "#######",
+                "#_    #",
+                "### ###",
+                "#     #",
+                "#######",
+            ]
+        )
+        self.table_ = self.map_.reservations
+
+    def _plan(self, drone_id, start, goal, horizon=12):
+        return self.table_.plan(
+            drone_id, start, goal, self.map_.terrain_weight, horizon
+        )
+
+    @staticmethod
+    def _timed(path):
+        return {(coord, tick) for tick, coord in enumerate(path)}
+
+    def test_reserve_and_release(self):
+        path = [Coordinate(1, 1), Coordinate(2, 1), Coordinate(3, 1)]
+        self.table_.reserve(1, path)
+        self.assertEqual(self.table_.owner(Coordinate(2, 1), 1), 1)
+        self.assertIsNone(self.table_.owner(Coordinate(2, 1), 0))
+        self.assertFalse(self.table_.is_free(Coordinate(3, 1), 2, 2))
+        self.assertTrue(self.table_.is_free(Coordinate(3, 1), 2, 1))
+        self.table_.release(1)
+        self.assertIsNone(self.table_.owner(Coordinate(2, 1), 1))
+
+    def test_reserve_with_moves(self):
+        path = [Coordinate(1, 1), Coordinate(2, 1), Coordinate(3, 1)]
+        self.table_.reserve(1, path, moves=2)
+        self.assertEqual(self.table_.owner(Coordinate(2, 1), 0), 1)
+        self.assertEqual(self.table_.owner(Coordinate(3, 1), 1), 1)
+
+    def test_advance_drops_past(self):
+        self.table_.reserve(1, [Coordinate(1, 1), Coordinate(2, 1)])
+        self.table_.advance()
+        self.assertEqual(self.table_.tick, 1)
+        self.assertIsNone(self.table_.owner(Coordinate(1, 1), 0))
+        self.assertEqual(self.table_.owner(Coordinate(2, 1), 1), 1)
+
+    def test_plan_waits_for_corridor(self):
+        # the first drone passes through the corridor going down
+        first = self._plan(1, Coordinate(3, 1), Coordinate(3, 3))
+        self.table_.reserve(1, first)
+        second = self._plan(2, Coordinate(1, 1), Coordinate(5, 3))
+        self.assertEqual(second[0], Coordinate(1, 1))
+        self.assertEqual(second[-1], Coordinate(5, 3))
+        self.assertFalse(self._timed(first) & self._timed(second))
+
+    def test_plan_avoids_swaps(self):
+        first = [Coordinate(2, 1), Coordinate(3, 1)]
+        self.table_.reserve(1, first)
+        second = self._plan(2, Coordinate(3, 1), Coordinate(1, 1))
+        self.assertNotEqual(second[1], Coordinate(2, 1))
+        self.assertFalse(self._timed(first) & self._timed(second))
+
+    def test_plan_fails_when_blocked(self):
+        corridor = Coordinate(3, 2)
+        self.table_.reserve(1, [corridor] * 20)
+        self.assertEqual(
+            self._plan(2, Coordinate(1, 1), Coordinate(1, 3), horizon=10), []
+        )
+
+    def test_map_reserve_path(self):
+        first, second = Mock(moves=1), Mock(moves=1)
+        start, goal = Coordinate(1, 3), Coordinate(1, 1)
+        first_path = self.map_.reserve_path(
+            first, self.map_.astar(Coordinate(1, 1), Coordinate(5, 3))
+        )
+        second_path = self.map_.reserve_path(
+            second, self.map_.astar(start, goal)
+        )
+        self.assertEqual(second_path[0], start)
+        self.assertEqual(second_path[-1], goal)
+        self.assertFalse(self._timed(first_path) & self._timed(second_path))
+        self.map_.release_path(first)
+        self.assertIsNone(self.table_.owner(first_path[1], 1))
+
+    def test_failed_plan_holds_the_tile(self):
+        drone = Mock(moves=1)
+        corridor, start = Coordinate(3, 2), Coordinate(1, 1)
+        self.table_.reserve(1, [corridor] * 20)
+        path = self.map_.astar(start, Coordinate(1, 3))
+        self.assertEqual(self.map_.reserve_path(drone, path), path)
+        slack = self.table_.WAIT_SLACK
+        self.assertEqual(self.table_.owner(start, slack - 1), id(drone))
+        self.assertIsNone(self.table_.owner(start, slack))
+        self.assertIsNone(self.table_.owner(path[1], 1))
+
+    def test_delay_path(self):
+        drone, idle = Mock(moves=1), Mock(moves=1)
+        path = self.map_.reserve_path(
+            drone, self.map_.astar(Coordinate(1, 1), Coordinate(4, 1))
+        )
+        self.table_.advance()
+        # the first move was blocked, so the drone is still on its start
+        self.map_.delay_path(drone, path)
+        self.assertEqual(self.table_.owner(path[0], 1), id(drone))
+        self.assertEqual(self.table_.owner(path[-1], 4), id(drone))
+        self.map_.delay_path(idle, path)
+        self.assertNotIn(id(idle), self.table_)
+
+
+if __name__ == "__main__":
+    unittest.main()
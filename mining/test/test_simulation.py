@@ -0,0 +1,385 @@
+"""Test class for the headless simulation engine."""
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from mining.simulation import (
+    ReplayMismatch,
+    Simulation,
+    SimulationResult,
+    World,
+    generate_lines,
+    generate_world,
+    read_log,
+    replay,
+)
+from mining.simulation import recording
+from mining.simulation.dashboard import HeadlessDashboard
+from mining.simulation.recording import (
+    DamageRecord,
+    MapRecord,
+    MoveRecord,
+    Recorder,
+    TickRecord,
+)
+from mining.simulation.sweep import (
+    MapSpec,
+    SweepCase,
+    SweepResult,
+    load_upgrade_orders,
+    run_case,
+    run_sweep,
+    sweep_cases,
+    sweep_strategies,
+    upgrades_id,
+    write_results,
+    write_upgrades,
+)
+from mining.zerg_units import Overlord, Strategy, Upgrade
+from mining.utils import Context, Coordinate, Directions, Icon
+
+from .testing_utils import TestingUtils
+
+
+class TestWorld(unittest.TestCase):
+    def setUp(self) -> None:
+        self.world_ = World.from_lines(
+            0,
+            [
+                "######",
+                "#_ 3~#",
+                "# *  #",
+                "######",
+            ],
+        )
+
+    def test_from_lines(self):
+        self.assertEqual(self.world_.deploy_zone, Coordinate(1, 1))
+        self.assertEqual(self.world_.tile(Coordinate(3, 1)), Icon.MINERAL)
+        self.assertEqual(self.world_.minerals[Coordinate(3, 1)], 3)
+        self.assertEqual(self.world_.minerals[Coordinate(2, 2)], 1)
+        self.assertAlmostEqual(self.world_.density, 2 / 24)
+
+    def test_no_deploy_zone(self):
+        with self.assertRaises(ValueError):
+            World.from_lines(0, ["###", "# #", "###"])
+
+    def test_context(self):
+        drone = Mock()
+        self.assertTrue(self.world_.place(drone))
+        self.assertFalse(self.world_.place(Mock()))
+        context = self.world_.context(drone)
+        self.assertEqual((context.x, context.y), (1, 1))
+        self.assertEqual(context.north, Icon.WALL.value)
+        self.assertEqual(context.east, Icon.EMPTY.value)
+        self.assertEqual(
+            self.world_.icon(Coordinate(-1, 0)), Icon.WALL, "off the map"
+        )
+
+    def test_move(self):
+        first, second = Mock(), Mock()
+        self.world_.place(first)
+        self.assertTrue(self.world_.move(first, Coordinate(2, 1)))
+        self.world_.place(second)
+        self.assertEqual(self.world_.icon(Coordinate(2, 1)), Icon.ZERG)
+        self.assertFalse(self.world_.move(second, Coordinate(2, 1)))
+        self.assertFalse(self.world_.move(first, Coordinate(3, 1)))
+        self.assertEqual(self.world_.remove(first), Coordinate(2, 1))
+        self.assertTrue(self.world_.move(second, Coordinate(2, 1)))
+
+    def test_mine(self):
+        mineral = Coordinate(2, 2)
+        self.assertTrue(self.world_.mine(mineral))
+        self.assertFalse(self.world_.mine(mineral))
+        self.assertEqual(self.world_.tile(mineral), Icon.EMPTY)
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.world_ = World.from_lines(
+            0,
+            [
+                "######",
+                "#_  3#",
+                "#    #",
+                "#3   #",
+                "######",
+            ],
+        )
+
+    def test_run(self):
+        simulation = Simulation([self.world_], 100, 60)
+        result = simulation.run()
+        self.assertIsInstance(result, SimulationResult)
+        self.assertEqual(result.ticks, 100)
+        self.assertEqual(len(result.actions), 100)
+        self.assertTrue(result.actions[0].startswith("DEPLOY"))
+        self.assertGreater(result.minerals_mined, 0)
+        self.assertEqual(result.minerals_by_map, {0: result.minerals_mined})
+        self.assertLessEqual(
+            result.minerals_mined + sum(self.world_.minerals.values()), 6
+        )
+
+    def _deploy(self, simulation, world, drone):
+        map_ = simulation.overlord._maps[world.map_id]
+        simulation.overlord._deployed[id(drone)] = map_
+        drone.map = map_
+        world.place(drone)
+        simulation._deployed[drone] = world
+        simulation._carried[drone] = 0
+
+    def test_acid_damage(self):
+        world = World.from_lines(0, ["#####", "#_~ #", "#####"])
+        simulation = Simulation([world], 1, 60)
+        drone = next(iter(simulation.overlord.drones.values()))
+        drone._health = 3
+        self._deploy(simulation, world, drone)
+        simulation._apply_direction(drone, world, "EAST")
+        # damage is dealt at the end of the tick
+        self.assertEqual(drone.health, 3)
+        simulation._deal_acid_damage()
+        self.assertEqual(drone.health, 0)
+        self.assertNotIn(drone, world.positions)
+        self.assertNotIn(id(drone), simulation.overlord.drones)
+        self.assertEqual(simulation.result().drones_lost, 1)
+
+    def test_acid_damage_per_hit(self):
+        world = World.from_lines(0, ["######", "#_~~~#", "######"])
+        simulation = Simulation([world], 1, 60)
+        first, second = list(simulation.overlord.drones.values())[:2]
+        health = first.health, second.health
+        simulation._acid_hits = {first: 2, second: 1}
+        simulation._deal_acid_damage()
+        self.assertEqual(first.health, health[0] - 6)
+        self.assertEqual(second.health, health[1] - 3)
+        self.assertEqual(simulation._acid_hits, {})
+        self.assertEqual(simulation.result().drones_lost, 0)
+
+    def test_drones_only_take_acid_damage_once(self):
+        overlord = Overlord(1, 60, HeadlessDashboard())
+        drone = next(iter(overlord.drones.values()))
+        drone.map = TestingUtils.build_map(["#####", "#_~ #", "#####"])
+        on_acid = Context(2, 1, "#", "#", " ", "_")
+        drone.action(on_acid)
+        self.assertEqual(drone.health, drone.max_health - 3)
+        world = World.from_lines(0, ["###", "#_#", "###"])
+        Simulation([world], 1, 60, overlord)
+        self.assertTrue(overlord.game_deals_damage)
+        drone.action(on_acid)
+        self.assertEqual(drone.health, drone.max_health - 3)
+
+
+class TestGenerator(unittest.TestCase):
+    def test_seeded(self):
+        lines = generate_lines(30, 20, seed=3)
+        self.assertEqual(lines, generate_lines(30, 20, seed=3))
+        self.assertNotEqual(lines, generate_lines(30, 20, seed=4))
+        self.assertEqual(len(lines), 20)
+        self.assertTrue(all(len(line) == 30 for line in lines))
+
+    def test_walled_in_around_the_deploy_zone(self):
+        world = generate_world(1, 31, 21, wall_density=1.0)
+        self.assertEqual(world.deploy_zone, Coordinate(15, 10))
+        for neighbor in world.deploy_zone.cardinals():
+            self.assertEqual(world.tile(neighbor), Icon.EMPTY)
+        self.assertEqual(world.tile(Coordinate(0, 5)), Icon.WALL)
+        self.assertEqual(world.tile(Coordinate(1, 1)), Icon.WALL)
+
+    def test_densities(self):
+        world = generate_world(
+            0, 102, 102, wall_density=0.2, mineral_density=0.1
+        )
+        walls = sum(row.count(ord(Icon.WALL.value)) for row in world.rows)
+        self.assertAlmostEqual(walls / 100**2, 0.2 + 0.04, delta=0.02)
+        self.assertAlmostEqual(world.density, 0.1, delta=0.02)
+        self.assertTrue(1 <= min(world.minerals.values()))
+        self.assertTrue(max(world.minerals.values()) <= 9)
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cases_ = sweep_cases(
+            [MapSpec(None, 12, 0), MapSpec(None, 12, 1)],
+            [20, 40],
+            [Strategy(max_drones=2), Strategy(max_drones=4)],
+            30,
+        )
+
+    def test_cases(self):
+        self.assertEqual(len(self.cases_), 8)
+        self.assertEqual(self.cases_[0].map_spec.name, "gen12s0")
+        self.assertEqual(MapSpec("maps/cave.txt").name, "cave.txt")
+        cases = sweep_cases(
+            [MapSpec(None, 12, 0)], [20], [Strategy()], 30, [1, 2]
+        )
+        self.assertEqual([case.seed for case in cases], [1, 2])
+
+    def test_run_case(self):
+        result = run_case(self.cases_[-1])
+        self.assertIsInstance(result, SweepResult)
+        self.assertEqual(result.map, "gen12s1")
+        self.assertEqual((result.minerals, result.max_drones), (40, 4))
+        self.assertEqual(
+            (result.drone_cost, result.health, result.capacity, result.moves),
+            (5, 10, 5, 1),
+        )
+        self.assertEqual(result.ticks, 30)
+
+    def test_run_case_seed(self):
+        case = self.cases_[-1]._replace(ticks=60, seed=3)
+        overlord = Overlord(60, 40, HeadlessDashboard(), case.strategy, 3)
+        played = Simulation([case.map_spec.build()], 60, 40, overlord).run()
+        result = run_case(case)
+        self.assertEqual(result.seed, 3)
+        self.assertEqual(
+            (result.minerals_mined, result.drones_lost),
+            (played.minerals_mined, played.drones_lost),
+        )
+
+    def test_run_sweep(self):
+        results = list(run_sweep(self.cases_[:3], workers=2))
+        self.assertEqual(
+            [result.max_drones for result in results], [2, 4, 2]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.csv")
+            self.assertEqual(write_results(path, results), 3)
+            with open(path, encoding="ascii") as results_file:
+                lines = results_file.read().splitlines()
+        self.assertEqual(lines[0], ",".join(SweepResult._fields))
+        self.assertEqual(len(lines), 4)
+
+    def test_strategies(self):
+        orders = [(), (Upgrade("Miner", "capacity", 5, 1),)]
+        strategies = sweep_strategies(
+            [4], [0.5], [5, 10], [(10, 5, 1)], orders
+        )
+        self.assertEqual(
+            [(strat.drone_cost, strat.upgrades) for strat in strategies],
+            [(cost, order) for cost in (5, 10) for order in orders],
+        )
+        # strategies that differ only in their upgrades are told apart
+        map_spec = MapSpec(None, 12, 0)
+        results = [
+            run_case(SweepCase(map_spec, 20, strategy, 10))
+            for strategy in strategies[:2]
+        ]
+        self.assertNotEqual(results[0].upgrades, results[1].upgrades)
+        self.assertEqual(len(results[1].upgrades), 8)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.upgrades.json")
+            self.assertEqual(write_upgrades(path, strategies), 2)
+            with open(path, encoding="utf-8") as orders_file:
+                orders_by_id = json.load(orders_file)
+        self.assertEqual(
+            orders_by_id[results[1].upgrades],
+            [["Miner", "capacity", 5, 1, None]],
+        )
+        self.assertEqual(upgrades_id(()), results[0].upgrades)
+
+    def test_load_upgrade_orders(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "orders.json")
+            with open(path, "w", encoding="utf-8") as orders_file:
+                orders_file.write(
+                    '[[["Miner", "moves", 1, 3, 2]],'
+                    ' [["Scout", "health", 10, 1]]]'
+                )
+            orders = load_upgrade_orders(path)
+        self.assertEqual(
+            orders,
+            [
+                (Upgrade("Miner", "moves", 1, 3, 2),),
+                (Upgrade("Scout", "health", 10, 1),),
+            ],
+        )
+
+
+class TestRecording(unittest.TestCase):
+    def setUp(self) -> None:
+        self.log_ = io.BytesIO()
+        strategy = Strategy(max_drones=4)
+        overlord = Overlord(80, 40, HeadlessDashboard(), strategy, seed=7)
+        world = generate_world(3, 24, 24, seed=2)
+        self.result_ = Simulation(
+            [world], 80, 40, overlord, self.log_
+        ).run()
+        self.log_.seek(0)
+
+    def test_read_log(self):
+        header, records = read_log(self.log_)
+        self.assertEqual(header.seed, 7)
+        self.assertEqual(header.strategy, Strategy(max_drones=4))
+        self.assertEqual(header.total_ticks, 80)
+        self.assertEqual(header.refined_minerals, 40)
+        records = list(records)
+        self.assertIsInstance(records[0], MapRecord)
+        self.assertEqual(records[0].map_id, 3)
+        ticks = [
+            record for record in records if isinstance(record, TickRecord)
+        ]
+        self.assertEqual(len(ticks), 80)
+        self.assertEqual((ticks[0].command, ticks[0].map_id), ("DEPLOY", 3))
+        self.assertTrue(
+            any(isinstance(record, MoveRecord) for record in records)
+        )
+
+    def test_replay(self):
+        self.assertEqual(replay(self.log_), 80)
+
+    def test_replay_mismatch(self):
+        data = bytearray(self.log_.getvalue())
+        # the first tick follows the header, the strategy and the map
+        strategy_size = recording.HEADER.unpack_from(data)[-1]
+        tick = (
+            recording.HEADER.size
+            + strategy_size
+            + recording.KIND.size
+            + recording.RECORDS[recording.MAP].size
+        )
+        self.assertEqual(data[tick : tick + 2], b"T\x01", "a deploy")
+        data[tick + 1] = 0
+        with self.assertRaises(ReplayMismatch):
+            replay(io.BytesIO(bytes(data)))
+
+    def test_record_without_simulation(self):
+        log = io.BytesIO()
+        strategy = Strategy(max_drones=4)
+        overlord = Overlord(60, 40, HeadlessDashboard(), strategy, seed=7)
+        Recorder(log, overlord, 60, 40)
+        # a bare game loop, where the drones take acid damage themselves
+        world = generate_world(3, 24, 24, seed=2)
+        overlord.add_map(world.map_id, world.density)
+        for _ in range(60):
+            command, *arguments = overlord.action().split() or [None]
+            if command == Overlord.DEPLOY:
+                world.place(overlord.drones[int(arguments[0])])
+            elif command == Overlord.RETURN:
+                world.remove(overlord.drones[int(arguments[0])])
+            for drone in list(world.positions):
+                if id(drone) not in overlord.drones:
+                    world.remove(drone)
+                    continue
+                heading = Directions[drone.action(world.context(drone))]
+                if heading != Directions.CENTER:
+                    target = world.positions[drone].translate_one(heading)
+                    world.move(drone, target)
+        log.seek(0)
+        _, records = read_log(log)
+        kinds = {type(record) for record in records}
+        self.assertEqual(
+            kinds, {MapRecord, TickRecord, MoveRecord, DamageRecord}
+        )
+        log.seek(0)
+        self.assertEqual(replay(log), 60)
+
+    def test_not_a_log(self):
+        with self.assertRaises(ValueError):
+            read_log(io.BytesIO(bytes(64)))
+
+
+if __name__ == "__main__":
+    unittest.main()
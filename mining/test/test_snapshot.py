@@ -0,0 +1,145 @@
+"""Test class for Overlord snapshots."""
+import io
+import unittest
+
+from mining.simulation import Simulation, generate_world, read_log
+from mining.simulation.dashboard import HeadlessDashboard
+from mining.simulation.recording import (
+    DamageRecord,
+    MapRecord,
+    TickRecord,
+    tick_record,
+)
+from mining.zerg_units import (
+    Overlord,
+    Strategy,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.overlord_ = Overlord(
+            120, 60, HeadlessDashboard(), Strategy(max_drones=6), seed=3
+        )
+        self.created_ = list(self.overlord_.drones.values())
+        self.log_ = io.BytesIO()
+        self.simulation_ = Simulation(
+            [generate_world(5, 30, 30, seed=1)],
+            120,
+            60,
+            self.overlord_,
+            self.log_,
+        )
+        for _ in range(60):
+            self.simulation_.step()
+        self.snapshot_ = io.BytesIO()
+        save_snapshot(self.overlord_, self.snapshot_)
+        self.snapshot_.seek(0)
+
+    def test_round_trip(self):
+        loaded = load_snapshot(self.snapshot_, HeadlessDashboard())
+        saved_map, loaded_map = self.overlord_._maps[5], loaded._maps[5]
+        self.assertEqual(loaded_map.origin, saved_map.origin)
+        self.assertEqual(loaded_map.density, saved_map.density)
+        self.assertEqual(loaded_map.scout_count, saved_map.scout_count)
+        self.assertEqual(
+            {(tile.coordinate, tile.icon) for tile in loaded_map.tiles()},
+            {(tile.coordinate, tile.icon) for tile in saved_map.tiles()},
+        )
+        self.assertEqual(loaded_map.frontier(), saved_map.frontier())
+        self.assertEqual(
+            set(loaded_map.untasked_minerals),
+            set(saved_map.untasked_minerals),
+        )
+        self.assertEqual(
+            loaded_map.tasked_minerals, saved_map.tasked_minerals
+        )
+        self.assertEqual(len(loaded.drones), len(self.overlord_.drones))
+        for saved, drone in zip(
+            self.overlord_.drones.values(), loaded.drones.values()
+        ):
+            self.assertIs(type(drone).__bases__[0], type(saved).__bases__[0])
+            self.assertEqual(drone.health, saved.health)
+            self.assertEqual(drone.moves, saved.moves)
+            self.assertEqual(drone.state, saved.state)
+            self.assertEqual(drone.path, saved.path)
+            self.assertEqual(drone.map is not None, saved.map is not None)
+
+    def test_resume(self):
+        """The loaded Overlord plays the rest of the game as the saved one."""
+        living = [id(drone) for drone in self.overlord_.drones.values()]
+        self.simulation_.run()
+        loaded = load_snapshot(self.snapshot_, HeadlessDashboard())
+        # the log holds the acid damage the game dealt
+        loaded.game_deals_damage = True
+        drones = list(loaded.drones.values())
+        by_index = {
+            index: drones[living.index(id(drone))]
+            for index, drone in enumerate(self.created_)
+            if id(drone) in living
+        }
+        indices = {id(drone): index for index, drone in by_index.items()}
+        self.log_.seek(0)
+        _, records = read_log(self.log_)
+        ticks = 0
+        for record in records:
+            if isinstance(record, TickRecord):
+                ticks += 1
+            if ticks <= 60 or isinstance(record, MapRecord):
+                continue
+            if isinstance(record, TickRecord):
+                self.assertEqual(
+                    tick_record(loaded.action(), indices), record
+                )
+            elif isinstance(record, DamageRecord):
+                by_index[record.drone].take_damage(record.damage)
+            else:
+                drone = by_index[record.drone]
+                self.assertEqual(
+                    drone.action(record.context).upper(), record.direction
+                )
+        self.assertEqual(ticks, 120)
+
+    def test_resume_scout_targets(self):
+        overlord = Overlord(
+            120, 60, HeadlessDashboard(), Strategy(max_drones=6), seed=3
+        )
+        simulation = Simulation(
+            [generate_world(5, 30, 30, seed=1)], 120, 60, overlord
+        )
+        for _ in range(5):
+            simulation.step()
+        map_ = overlord._maps[5]
+        self.assertGreaterEqual(len(map_.scout_targets), 2)
+        snapshot = io.BytesIO()
+        save_snapshot(overlord, snapshot)
+        snapshot.seek(0)
+        loaded = load_snapshot(snapshot, HeadlessDashboard())
+        loaded_map = loaded._maps[5]
+        saved_ids = [id(drone) for drone in overlord.drones.values()]
+        loaded_ids = [id(drone) for drone in loaded.drones.values()]
+        self.assertEqual(
+            {
+                saved_ids.index(drone_id): target
+                for drone_id, target in map_.scout_targets.items()
+            },
+            {
+                loaded_ids.index(drone_id): target
+                for drone_id, target in loaded_map.scout_targets.items()
+            },
+        )
+        # the next scout avoids the tiles the others are heading for
+        self.assertEqual(
+            loaded._assign_scout_target(loaded_map, loaded_map.origin),
+            overlord._assign_scout_target(map_, map_.origin),
+        )
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            load_snapshot(io.BytesIO(bytes(64)), HeadlessDashboard())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Test class for how the Overlord spends refined minerals."""
+import unittest
+from unittest.mock import Mock
+
+from mining.zerg_units import Overlord, Strategy, Upgrade
+from mining.zerg_units.drones import MinerDrone, ScoutDrone
+
+
+class TestStrategy(unittest.TestCase):
+    def _fleet(self, minerals, strategy=None):
+        overlord = Overlord(10, minerals, Mock(), strategy)
+        scouts = [
+            drone
+            for drone in overlord.drones.values()
+            if isinstance(drone, ScoutDrone)
+        ]
+        miners = [
+            drone
+            for drone in overlord.drones.values()
+            if isinstance(drone, MinerDrone)
+        ]
+        return scouts, miners
+
+    def test_default(self):
+        scouts, miners = self._fleet(150)
+        self.assertEqual((len(scouts), len(miners)), (6, 6))
+        self.assertEqual(scouts[0].max_health, 90)
+        self.assertEqual(miners[0].max_health, 40)
+        self.assertEqual(miners[0].capacity, 10)
+        self.assertEqual(miners[0].moves, 2)
+
+    def test_drone_count(self):
+        strategy = Strategy(max_drones=4, scout_share=0.25)
+        scouts, miners = self._fleet(20, strategy)
+        self.assertEqual((len(scouts), len(miners)), (1, 3))
+        scouts, miners = self._fleet(5, strategy)
+        self.assertEqual((len(scouts), len(miners)), (1, 0))
+
+    def test_upgrade_order(self):
+        strategy = Strategy(
+            max_drones=2,
+            upgrades=(
+                Upgrade("Miner", "moves", 1, 3, 3),
+                Upgrade("Miner", "capacity", 5, 1),
+            ),
+        )
+        scouts, miners = self._fleet(10 + 6 + 4, strategy)
+        self.assertEqual(scouts[0].max_health, 10)
+        self.assertEqual(miners[0].moves, 3)
+        self.assertEqual(miners[0].capacity, 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,8 @@
 """Various methods that multiple test classes may use."""
 import random
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-from mining.utils import Coordinate
+from mining.utils import Coordinate, Map
 
 
 class TestingUtils:
@@ -48,3 +48,32 @@ class TestingUtils:
         while (coord := Coordinate(x, y)) == avoid:
             x, y = TestingUtils.random_number_pair(min, max)
         return coord
+
+    @staticmethod
+    def build_map(rows: List[str]) -> Map:
+        """Build a fully discovered map from rows of icon characters.
+
+        The deployment zone, if any, is used as the origin of the map.
+
+        Args:
+            rows (List[str]): The rows of the map, top to bottom.
+
+        Returns:
+            Map: The built map.
+        """
+        map_ = Map(0, 0.0)
+        map_.load_rows(row.encode("ascii") for row in rows)
+        return map_
+
+    @staticmethod
+    def path_cost(map_: Map, path: List[Coordinate]) -> int:
+        """Return the cost of moving along a path, ignoring the start tile.
+
+        Args:
+            map_ (Map): The map the path is on.
+            path (List[Coordinate]): The path.
+
+        Returns:
+            int: The total weight of the path.
+        """
+        return sum(map_.weight(coord) or 1 for coord in path[1:])
@@ -1,8 +1,10 @@
-from .context import Context
+from .context import Context, DecodedContext
 from .coordinate import Coordinate
 from .directions import Directions
 from .icon import Icon
+from .loader import load_map
 from .map import Map
+from .path import Path
 from .tile import Tile
 
 # static constants that others may need
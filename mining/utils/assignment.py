@@ -0,0 +1,218 @@
+"""Matching drones to targets, and a spatial index to find targets."""
+
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+    Costs = Sequence[Sequence[float]]
+    Pairs = List[Tuple[int, int]]
+
+INFINITY = float("inf")
+
+
+class SpatialIndex:
+    """A set of coordinates, bucketed into square cells.
+
+    Besides the usual set operations, the index can walk its coordinates
+    from nearest to furthest from any point while only looking at the
+    cells that may hold the next one.
+    """
+
+    def __init__(self, cell_size: int = 16) -> None:
+        """Initialize an empty index.
+
+        Args:
+            cell_size (int, optional): The width and height of every cell.
+                Defaults to 16.
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Coordinate]] = {}
+        self._count = 0
+
+    def _cell(self, coordinate: Coordinate) -> Tuple[int, int]:
+        return (
+            coordinate.x // self.cell_size,
+            coordinate.y // self.cell_size,
+        )
+
+    def add(self, coordinate: Coordinate) -> None:
+        """Add a coordinate to the index.
+
+        Args:
+            coordinate (Coordinate): The coordinate to add.
+        """
+        cell = self._cells.setdefault(self._cell(coordinate), set())
+        if coordinate not in cell:
+            cell.add(coordinate)
+            self._count += 1
+
+    def discard(self, coordinate: Coordinate) -> None:
+        """Remove a coordinate from the index, if it is present.
+
+        Args:
+            coordinate (Coordinate): The coordinate to remove.
+        """
+        key = self._cell(coordinate)
+        if (cell := self._cells.get(key)) and coordinate in cell:
+            cell.remove(coordinate)
+            self._count -= 1
+            if not cell:
+                del self._cells[key]
+
+    def nearest(self, origin: Coordinate) -> Iterator[Tuple[int, Coordinate]]:
+        """Walk the coordinates from nearest to furthest from an origin.
+
+        Args:
+            origin (Coordinate): The point to measure from.
+
+        Yields:
+            Tuple[int, Coordinate]: The manhattan distance to each
+                coordinate, and the coordinate.
+        """
+        size = self.cell_size
+        # cells are queued by the distance to their closest tile, and are
+        # only opened when nothing queued can be closer
+        heap: List[Tuple[int, int, Tuple[int, int], Coordinate]] = []
+        for key in self._cells:
+            left, top = key[0] * size, key[1] * size
+            dx = max(left - origin.x, 0, origin.x - (left + size - 1))
+            dy = max(top - origin.y, 0, origin.y - (top + size - 1))
+            heap.append((dx + dy, 0, key, origin))
+        heapify(heap)
+        while heap:
+            distance, is_coordinate, key, coordinate = heappop(heap)
+            if is_coordinate:
+                yield distance, coordinate
+                continue
+            for coordinate in self._cells.get(key, ()):
+                heappush(
+                    heap,
+                    (
+                        abs(coordinate.x - origin.x)
+                        + abs(coordinate.y - origin.y),
+                        1,
+                        key,
+                        coordinate,
+                    ),
+                )
+
+    def __contains__(self, coordinate: object) -> bool:
+        if not isinstance(coordinate, Coordinate):
+            return False
+        return coordinate in self._cells.get(self._cell(coordinate), ())
+
+    def __iter__(self) -> Iterator[Coordinate]:
+        for cell in self._cells.values():
+            yield from cell
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"SpatialIndex({set(self)})"
+
+
+def greedy_assignment(costs: Costs) -> Pairs:
+    """Match rows to columns, repeatedly taking the cheapest pair left.
+
+    Args:
+        costs (Costs): The cost of each row and column pair, infinite if
+            the pair may not be matched.
+
+    Returns:
+        Pairs: The matched (row, column) pairs, cheapest first.
+    """
+    candidates = sorted(
+        (cost, row, col)
+        for row, row_costs in enumerate(costs)
+        for col, cost in enumerate(row_costs)
+        if cost != INFINITY
+    )
+    used_rows, used_cols = set(), set()
+    pairs = []
+    for _, row, col in candidates:
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        pairs.append((row, col))
+    return pairs
+
+
+def optimal_assignment(costs: Costs) -> Pairs:
+    """Match rows to columns with the least total cost.
+
+    This is the Hungarian algorithm, which runs in cubic time, so it is
+    meant for small batches. As many pairs as possible are matched; pairs
+    with infinite cost are never matched.
+
+    Args:
+        costs (Costs): The cost of each row and column pair, infinite if
+            the pair may not be matched.
+
+    Returns:
+        Pairs: The matched (row, column) pairs, cheapest first.
+    """
+    if not costs or not costs[0]:
+        return []
+    transposed = len(costs) > len(costs[0])
+    if transposed:
+        costs = list(zip(*costs))
+    finite = [cost for row in costs for cost in row if cost != INFINITY]
+    # large enough that avoiding one forbidden pair is always worth it
+    forbidden = (sum(finite) + 1) * (len(costs) + 1)
+    rows, cols = len(costs), len(costs[0])
+    # potentials and matches are 1-indexed, with 0 as a free column
+    row_potential = [0.0] * (rows + 1)
+    col_potential = [0.0] * (cols + 1)
+    match = [0] * (cols + 1)
+    for row in range(1, rows + 1):
+        match[0] = row
+        col = 0
+        slack = [INFINITY] * (cols + 1)
+        previous = [0] * (cols + 1)
+        visited = [False] * (cols + 1)
+        while match[col]:
+            visited[col] = True
+            matched_row = match[col]
+            delta, next_col = INFINITY, 0
+            for other in range(1, cols + 1):
+                if visited[other]:
+                    continue
+                cost = costs[matched_row - 1][other - 1]
+                if cost == INFINITY:
+                    cost = forbidden
+                reduced = (
+                    cost - row_potential[matched_row] - col_potential[other]
+                )
+                if reduced < slack[other]:
+                    slack[other] = reduced
+                    previous[other] = col
+                if slack[other] < delta:
+                    delta, next_col = slack[other], other
+            for other in range(cols + 1):
+                if visited[other]:
+                    row_potential[match[other]] += delta
+                    col_potential[other] -= delta
+                else:
+                    slack[other] -= delta
+            col = next_col
+        while col:
+            previous_col = previous[col]
+            match[col] = match[previous_col]
+            col = previous_col
+    pairs = [
+        (match[col] - 1, col - 1) for col in range(1, cols + 1) if match[col]
+    ]
+    if transposed:
+        pairs = [(col, row) for row, col in pairs]
+        costs = list(zip(*costs))
+    pairs = [pair for pair in pairs if costs[pair[0]][pair[1]] != INFINITY]
+    pairs.sort(key=lambda pair: costs[pair[0]][pair[1]])
+    return pairs
@@ -1,8 +1,21 @@
 """A context object, used to describe the surrounding's of a drone."""
-from typing import NamedTuple
+from typing import Dict, NamedTuple, Tuple, Union
 
+from .grid import Grid
 from .icon import Icon
 
+# lookup tables, by the character of an icon
+ICONS: Dict[str, Icon] = {icon.value: icon for icon in Icon}
+CODES: Dict[str, int] = {icon.value: Grid.code(icon) for icon in Icon}
+TRAVERSABLE: Dict[str, bool] = {
+    icon.value: icon.traversable() for icon in Icon
+}
+HEALTH_COSTS: Dict[str, int] = {
+    icon.value: icon.health_cost() for icon in Icon
+}
+# the index of each cardinal direction in a context's tiles
+CARDINALS: Dict[str, int] = {"NORTH": 0, "SOUTH": 1, "EAST": 2, "WEST": 3}
+
 
 class Context(NamedTuple):
     """A context object, used to describe the surrounding's of a drone.
@@ -26,3 +39,76 @@ class Context(NamedTuple):
     south: str = Icon.EMPTY.value
     east: str = Icon.EMPTY.value
     west: str = Icon.EMPTY.value
+
+
+class DecodedContext(NamedTuple):
+    """A context with its tiles decoded, once, for every reader of it.
+
+    It has the fields of a Context, so it can be read as one, followed by
+    the icon, icon code, traversability and health cost of the tiles to the
+    north, south, east and west, in that order.
+    """
+
+    x: int
+    y: int
+    north: str
+    south: str
+    east: str
+    west: str
+    icons: Tuple[Icon, Icon, Icon, Icon]
+    codes: bytes
+    traversable: Tuple[bool, bool, bool, bool]
+    health_costs: Tuple[int, int, int, int]
+
+    @classmethod
+    def decode(
+        cls, context: Union[Context, "DecodedContext"]
+    ) -> "DecodedContext":
+        """Decode the tiles of a context.
+
+        Every combination of tiles is only decoded the first time it is
+        seen, and a context that is already decoded is returned as is.
+
+        Args:
+            context (Union[Context, DecodedContext]): The context.
+
+        Raises:
+            ValueError: If a tile is not the character of an icon.
+
+        Returns:
+            DecodedContext: The decoded context.
+        """
+        if isinstance(context, DecodedContext):
+            return context
+        symbols = (context.north, context.south, context.east, context.west)
+        if (decoded := _DECODED.get(symbols)) is None:
+            decoded = _DECODED[symbols] = _decode_symbols(symbols)
+        return cls(context.x, context.y, *symbols, *decoded)
+
+    def icon(self, direction: str) -> Icon:
+        """Return the icon of the tile in a cardinal direction.
+
+        Args:
+            direction (str): The name of the direction, such as "NORTH".
+
+        Returns:
+            Icon: The icon.
+        """
+        return self.icons[CARDINALS[direction.upper()]]
+
+
+# the decoded fields of every combination of tiles seen so far
+_DECODED: Dict[Tuple[str, ...], tuple] = {}
+
+
+def _decode_symbols(symbols: Tuple[str, ...]) -> tuple:
+    try:
+        icons = tuple(ICONS[symbol] for symbol in symbols)
+    except KeyError as error:
+        raise ValueError(f"{error.args[0]!r} is not a valid Icon") from None
+    return (
+        icons,
+        bytes(CODES[symbol] for symbol in symbols),
+        tuple(TRAVERSABLE[symbol] for symbol in symbols),
+        tuple(HEALTH_COSTS[symbol] for symbol in symbols),
+    )
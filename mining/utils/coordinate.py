@@ -1,13 +1,15 @@
 """(X, Y) coordinates for a grid system."""
 from __future__ import annotations
 
-from functools import singledispatchmethod
 from typing import TYPE_CHECKING, NamedTuple, Tuple
 
 from .directions import Directions
 
 if TYPE_CHECKING:
-    from typing import Union
+    from typing import Dict, Optional, Union
+
+# builds a coordinate from a tuple without the checks of its constructor
+_new = tuple.__new__
 
 
 class Coordinate(NamedTuple):
@@ -16,87 +18,56 @@ class Coordinate(NamedTuple):
     x: int
     y: int
 
-    @singledispatchmethod
-    def difference(self, other_coord: "Coordinate") -> Tuple[int, int]:
-        """Get the difference in distance between 2 coordinates.
-
-        In relation to this coordinate, a positive/negative return value will
-        indicate direction; a positive  x means the other coordinate is to the
-        right of this one, while a positive y means the other coordinate is
-        below this one, and reversed for negative values.
-
-        Args:
-            other_coord (Coordinate): The other coordinate.
-
-        Returns:
-            Tuple[int, int]: The distance difference, as (x, y) tuple.
-        """
-        return (other_coord.x - self.x, other_coord.y - self.y)
-
-    @difference.register
-    def _(self, x: int, y: int) -> Tuple[int, int]:
+    def difference(
+        self, other: Union[Coordinate, int], y: Optional[int] = None
+    ) -> Tuple[int, int]:
         """Get the difference in distance between 2 coordinates.
 
-        This method allows for the other point to be given as 2 ints for x, y.
         In relation to this coordinate, a positive/negative return value will
         indicate direction; a positive  x means the other coordinate is to the
         right of this one, while a positive y means the other coordinate is
-        below this one, and reversed for negative values.
+        below this one, and reversed for negative values. The other point may
+        be given as a coordinate, or as 2 ints for x, y.
 
         Args:
-            x (int): The x value of the other coordinate.
-            y (int): The y value of the other coordinate.
+            other (Union[Coordinate, int]): The other coordinate, or its x
+                value.
+            y (Optional[int], optional): The y value of the other
+                coordinate, if its x value was given. Defaults to None.
 
         Returns:
             Tuple[int, int]: The distance difference, as (x, y) tuple.
         """
-        return (x - self.x, y - self.y)
+        if y is None:
+            other, y = other
+        return (other - self[0], y - self[1])
 
-    @singledispatchmethod
-    def direction(self, other_coord: "Coordinate") -> str:
+    def direction(
+        self, other: Union[Coordinate, int], y: Optional[int] = None
+    ) -> str:
         """Get the direction of the other coordinate in relation to this one.
 
         Note that this only works if this coordinate and the other are on the
         same axis as each other. Otherwise an empty string will be returned.
-        If the 2 coordinates are the same, 'center' will be returned.
+        If the 2 coordinates are the same, 'center' will be returned. The
+        other point may be given as a coordinate, or as 2 ints for x, y.
 
         Args:
-            other_coord (Coordinate): The other coordinate.
+            other (Union[Coordinate, int]): The other coordinate, or its x
+                value.
+            y (Optional[int], optional): The y value of the other
+                coordinate, if its x value was given. Defaults to None.
 
         Returns:
             str: The direction of the other coordinate.
         """
-        return self.direction(*other_coord)
-
-    @direction.register
-    def _(self, x: int, y: int) -> str:
-        """Get the direction of the other coordinate in relation to this one.
-
-        This method allows for the other point to be given as 2 ints for x, y.
-        Note that this only works if this coordinate and the other are on the
-        same axis as each other. Otherwise an empty string will be returned.
-        If the 2 coordinates are the same, 'center' will be returned.
-
-        Args:
-            x (int): The x value of the other coordinate.
-            y (int): The y value of the other coordinate.
-
-        Returns:
-            str: The direction of the other coordinate.
-        """
-        x_offset, y_offset = self.difference(x, y)
-        if x_offset and y_offset:
-            return ""  # can't determine direction
-        if x_offset > 0:
-            return "east"
-        elif x_offset < 0:
-            return "west"
-        elif y_offset < 0:
-            return "north"
-        elif y_offset > 0:
-            return "south"
-        else:  # x_offset == 0 and y_offset == 0
-            return "center"
+        if y is None:
+            other, y = other
+        x_offset = other - self[0]
+        y_offset = y - self[1]
+        return _DIRECTION_NAMES[
+            (x_offset > 0) - (x_offset < 0), (y_offset > 0) - (y_offset < 0)
+        ]
 
     def cardinals(
         self,
@@ -109,11 +80,12 @@ class Coordinate(NamedTuple):
             Tuple[Coordinate, Coordinate, Coordinate, Coordinate]:
                 The translated coordinates.
         """
+        x, y = self
         return (
-            self.translate_one(Directions.NORTH),
-            self.translate_one(Directions.SOUTH),
-            self.translate_one(Directions.EAST),
-            self.translate_one(Directions.WEST),
+            _new(Coordinate, (x, y - 1)),
+            _new(Coordinate, (x, y + 1)),
+            _new(Coordinate, (x + 1, y)),
+            _new(Coordinate, (x - 1, y)),
         )
 
     def translate_one(
@@ -136,16 +108,8 @@ class Coordinate(NamedTuple):
                 direction = Directions[direction.upper()]
             except KeyError:
                 raise ValueError(f"Unknown  direction: {direction}") from None
-        if direction == Directions.NORTH:
-            return self._replace(y=self.y - 1)
-        elif direction == Directions.SOUTH:
-            return self._replace(y=self.y + 1)
-        elif direction == Directions.EAST:
-            return self._replace(x=self.x + 1)
-        elif direction == Directions.WEST:
-            return self._replace(x=self.x - 1)
-        else:
-            return Coordinate(*self)
+        x_offset, y_offset = _OFFSETS[direction]
+        return _new(Coordinate, (self[0] + x_offset, self[1] + y_offset))
 
     def translate(self, x_offset: int, y_offset: int) -> "Coordinate":
         """Translate this coordinate in the given direction.
@@ -162,3 +126,28 @@ class Coordinate(NamedTuple):
             Coordinate: The translated coordinate object
         """
         return self._replace(x=self.x + x_offset, y=self.y + y_offset)
+
+
+# the offset of a step in each direction
+_OFFSETS: Dict[Directions, Tuple[int, int]] = {
+    Directions.NORTH: (0, -1),
+    Directions.SOUTH: (0, 1),
+    Directions.EAST: (1, 0),
+    Directions.WEST: (-1, 0),
+    Directions.CENTER: (0, 0),
+}
+# direction names by the sign of the x and y offsets to another coordinate
+_DIRECTION_NAMES: Dict[Tuple[int, int], str] = {
+    (x_sign, y_sign): ""
+    for x_sign in (-1, 0, 1)
+    for y_sign in (-1, 0, 1)
+}
+_DIRECTION_NAMES.update(
+    {
+        (1, 0): "east",
+        (-1, 0): "west",
+        (0, -1): "north",
+        (0, 1): "south",
+        (0, 0): "center",
+    }
+)
@@ -0,0 +1,295 @@
+"""Distance to a target for every tile of a map, computed with NumPy."""
+
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional, Sequence, Tuple
+
+    from .grid import Grid
+
+
+class FlowField:
+    """Distance to a target for every tile of a map, computed with NumPy.
+
+    The field is built by a wavefront that relaxes every cell of the grid
+    at once until no distance improves, so there is no per tile Python work.
+    Afterwards, the next step towards the target from any tile is a single
+    array look up, which lets any number of drones share one field. Only
+    the stored cells of the chunks connected to the target's chunk are
+    copied.
+    """
+
+    # row and column offsets, in the same order as Coordinate.cardinals
+    OFFSETS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+    NO_STEP = len(OFFSETS)
+
+    def __init__(
+        self,
+        grid: Grid,
+        code_weights: Sequence[Optional[int]],
+        target: Coordinate,
+        goal_weight: int = 1,
+    ) -> None:
+        """Build the field.
+
+        Args:
+            grid (Grid): The tiles of the map.
+            code_weights (Sequence[Optional[int]]): The cost of entering a
+                tile, indexed by its icon code; None if it is not pathable.
+            target (Coordinate): Where every path leads.
+            goal_weight (int, optional): Cost of entering the target if it
+                is otherwise not enterable. Defaults to 1.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("FlowField requires NumPy")
+        self.target = target
+        left, top, width, height, cells = grid.copy_cells(
+            grid.connected_chunks(*target)
+        )
+        codes = np.frombuffer(cells, dtype=np.uint8).reshape(height, width)
+        # cells that were never stored hold 0 and can not be entered, so
+        # only the bounds of the stored cells are kept
+        rows = np.flatnonzero(codes.any(axis=1))
+        cols = np.flatnonzero(codes.any(axis=0))
+        if rows.size:
+            codes = codes[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+            left += int(cols[0])
+            top += int(rows[0])
+        # a border of unpathable cells keeps every shift in bounds
+        self._left = left - 1
+        self._top = top - 1
+        table = np.array(
+            [np.inf if weight is None else weight for weight in code_weights]
+        )
+        weights = np.pad(table[codes], 1, constant_values=np.inf)
+        self._weights = weights
+        self._distance = np.full(weights.shape, np.inf)
+        self._steps = np.full(weights.shape, self.NO_STEP, dtype=np.uint8)
+        # walking a path reads plain ints much faster than array scalars,
+        # and reuses the coordinates of cells walked before
+        self._flat_steps = self._steps.ravel().tolist()
+        self._offsets = [
+            row * weights.shape[1] + col for row, col in self.OFFSETS
+        ]
+        self._coordinates: List[Optional[Coordinate]] = [None] * weights.size
+        self._target_cell = self._cell(target)
+        if self._target_cell is not None:
+            if np.isinf(weights[self._target_cell]):
+                weights[self._target_cell] = goal_weight
+            self._build(weights, self._target_cell)
+
+    def update(
+        self, changes: Iterable[Tuple[Coordinate, Optional[int]]]
+    ) -> bool:
+        """Apply changed tiles to the field, without building it again.
+
+        Cheaper tiles only shorten paths, so only the tiles whose distance
+        improves are relaxed, outwards from the changed tiles. A dearer tile
+        that no path steps onto changes no distance. Any other change, a
+        new tile outside the field or a change to the target cannot be
+        applied this way.
+
+        Args:
+            changes (Iterable[Tuple[Coordinate, Optional[int]]]): Changed
+                tiles and their new cost of entering; None if not pathable.
+
+        Returns:
+            bool: Whether the field was updated; if not, it must be built
+                again.
+        """
+        if self._target_cell is None:
+            return False
+        weights = self._weights
+        rows, cols = weights.shape
+        changed = []
+        cheaper = []
+        for coordinate, weight in changes:
+            weight = np.inf if weight is None else weight
+            if (cell := self._cell(coordinate)) is None:
+                if weight == np.inf:
+                    continue
+                return False
+            if coordinate == self.target:
+                return False
+            index = cell[0] * cols + cell[1]
+            if weight < weights[cell]:
+                if not (0 < cell[0] < rows - 1 and 0 < cell[1] < cols - 1):
+                    return False
+                cheaper.append(index)
+            elif weight > weights[cell] and self._stepped_onto(index):
+                return False
+            changed.append((cell, weight))
+        for cell, weight in changed:
+            weights[cell] = weight
+        if cheaper:
+            self._relax(cheaper)
+        return True
+
+    def _stepped_onto(self, index: int) -> bool:
+        """Return whether a neighbour's next step is onto a tile.
+
+        Args:
+            index (int): Flat index of the tile, which is not on the border.
+        """
+        steps = self._flat_steps
+        return any(
+            steps[index - offset] == step
+            for step, offset in enumerate(self._offsets)
+        )
+
+    def _relax(self, changed: List[int]) -> None:
+        """Lower the distances that run through tiles that got cheaper.
+
+        Args:
+            changed (List[int]): Flat indices of the cheaper tiles.
+        """
+        weights = self._weights.ravel().tolist()
+        distance = self._distance.ravel()
+        steps = self._steps.ravel()
+        flat_distance = distance.tolist()
+        flat_steps = self._flat_steps
+        frontier = [(flat_distance[index], index) for index in changed]
+        heapify(frontier)
+        while frontier:
+            cost, index = heappop(frontier)
+            if cost > flat_distance[index]:
+                continue
+            # cost of a path that starts by entering this tile; no path
+            # enters a tile that is not pathable, such as the border
+            cost += weights[index]
+            if cost == float("inf"):
+                continue
+            for step, offset in enumerate(self._offsets):
+                neighbor = index - offset
+                if cost < flat_distance[neighbor]:
+                    flat_distance[neighbor] = distance[neighbor] = cost
+                    flat_steps[neighbor] = steps[neighbor] = step
+                    heappush(frontier, (cost, neighbor))
+
+    def _build(self, weights, target_cell) -> None:
+        distance = self._distance
+        distance[target_cell] = 0
+        # each cell and its neighbour at every offset
+        shifts = [
+            (self._slices(row, col), self._slices(-row, -col))
+            for row, col in self.OFFSETS
+        ]
+        while True:
+            # cost of a path that starts by entering each cell
+            entering = distance + weights
+            best = distance.copy()
+            for cells, neighbors in shifts:
+                np.minimum(
+                    best[cells], entering[neighbors], out=best[cells]
+                )
+            if np.array_equal(best, distance):
+                break
+            distance = best
+        self._distance = distance
+        entering = distance + weights
+        candidates = np.full((self.NO_STEP,) + distance.shape, np.inf)
+        for step, (cells, neighbors) in enumerate(shifts):
+            candidates[step][cells] = entering[neighbors]
+        steps = candidates.argmin(axis=0).astype(np.uint8)
+        steps[np.isinf(candidates.min(axis=0))] = self.NO_STEP
+        steps[target_cell] = self.NO_STEP
+        self._steps = steps
+        self._flat_steps = steps.ravel().tolist()
+
+    @staticmethod
+    def _slices(row: int, col: int):
+        """Return slices selecting cells whose neighbour at an offset exists.
+
+        Args:
+            row (int): The row offset of the neighbour.
+            col (int): The column offset of the neighbour.
+        """
+
+        def axis(offset: int) -> slice:
+            if offset > 0:
+                return slice(None, -offset)
+            if offset < 0:
+                return slice(-offset, None)
+            return slice(None)
+
+        return axis(row), axis(col)
+
+    def _cell(self, coordinate: Coordinate):
+        row = coordinate.y - self._top
+        col = coordinate.x - self._left
+        rows, cols = self._distance.shape
+        return (row, col) if 0 <= row < rows and 0 <= col < cols else None
+
+    def distance(self, coordinate: Coordinate) -> float:
+        """Return the cost of the cheapest path from a tile to the target.
+
+        Args:
+            coordinate (Coordinate): The start of the path.
+
+        Returns:
+            float: The cost, or infinity if the target is unreachable.
+        """
+        if (cell := self._cell(coordinate)) is None:
+            return float("inf")
+        return float(self._distance[cell])
+
+    def next_step(self, coordinate: Coordinate) -> Optional[Coordinate]:
+        """Return the next tile on the cheapest path to the target.
+
+        Args:
+            coordinate (Coordinate): The current tile.
+
+        Returns:
+            Optional[Coordinate]: The next tile, or None at the target or if
+                the target is unreachable.
+        """
+        if (cell := self._cell(coordinate)) is None:
+            return None
+        step = self._steps[cell]
+        if step == self.NO_STEP:
+            return None
+        row, col = self.OFFSETS[step]
+        return Coordinate(coordinate.x + col, coordinate.y + row)
+
+    def path_from(self, coordinate: Coordinate) -> List[Coordinate]:
+        """Return the cheapest path from a tile to the target.
+
+        Args:
+            coordinate (Coordinate): The start of the path.
+
+        Returns:
+            List[Coordinate]: The path including start and target, or an
+                empty list if the target is unreachable.
+        """
+        if coordinate == self.target:
+            return [coordinate]
+        if (cell := self._cell(coordinate)) is None:
+            return []
+        steps, offsets, no_step = self._flat_steps, self._offsets, self.NO_STEP
+        index = cell[0] * self._steps.shape[1] + cell[1]
+        if steps[index] == no_step:
+            # only the target has no step on a path to it
+            return []
+        coordinates = self._coordinates
+        path = [coordinate]
+        while (step := steps[index]) != no_step:
+            index += offsets[step]
+            if (coordinate := coordinates[index]) is None:
+                row, col = divmod(index, self._steps.shape[1])
+                coordinate = Coordinate(self._left + col, self._top + row)
+                coordinates[index] = coordinate
+            path.append(coordinate)
+        return path
@@ -0,0 +1,430 @@
+"""Compact, chunked storage for the tiles of a map."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+from .coordinate import Coordinate
+from .icon import Icon
+from .tile import Tile
+
+if TYPE_CHECKING:
+    from typing import (
+        Callable,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        Set,
+        Tuple,
+    )
+
+    from mining.zerg_units.drones import Drone
+
+T = TypeVar("T")
+
+# the x and y values of a chunk key are those of its cells, shifted by
+SHIFT = 5
+# the width and height of a chunk, in cells
+SIZE = 1 << SHIFT
+# masks the x or y value of a cell to its column or row in its chunk
+MASK = SIZE - 1
+
+
+class ChunkStats(NamedTuple):
+    """Counts of the cells of a chunk, by what they hold.
+
+    Attributes:
+        chunk (Tuple[int, int]): The key of the chunk.
+        stored (int): The cells stored.
+        discovered (int): The stored cells with a discovered icon.
+        minerals (int): The cells holding a mineral.
+    """
+
+    chunk: Tuple[int, int]
+    stored: int
+    discovered: int
+    minerals: int
+
+
+class Grid:
+    """Compact, chunked storage for the tiles of a map.
+
+    Every cell holds a single byte icon code. Cells are kept in square
+    chunks of SIZE cells a side, keyed by the x and y values of their cells
+    shifted right by SHIFT, and a chunk is only allocated when one of its
+    cells is first stored. Cells that were never stored hold UNSTORED, the
+    implicit value of unallocated chunks, and stored tiles that have not
+    been discovered yet hold UNDISCOVERED. Coordinates are unbounded in
+    every direction. Drones occupying tiles are kept in a separate, sparse
+    occupancy layer.
+    """
+
+    UNSTORED = 0
+    UNDISCOVERED = 1
+    ICONS: List[Optional[Icon]] = [None, None, *Icon]
+    CODES: Dict[Icon, int] = {icon: code for code, icon in enumerate(Icon, 2)}
+    CHUNK_SHIFT = SHIFT
+    CHUNK_SIZE = SIZE
+
+    def __init__(self) -> None:
+        """Initialize an empty grid."""
+        self._chunks: Dict[Tuple[int, int], bytearray] = {}
+        self._stored = 0
+        self.occupancy: Dict[Coordinate, Drone] = {}
+
+    @classmethod
+    def code(cls, icon: Optional[Icon]) -> int:
+        """Return the code an icon is stored as.
+
+        Args:
+            icon (Optional[Icon]): The icon, or None if undiscovered.
+
+        Returns:
+            int: The icon code.
+        """
+        return cls.CODES[icon] if icon else cls.UNDISCOVERED
+
+    @staticmethod
+    def chunk_key(x: int, y: int) -> Tuple[int, int]:
+        """Return the key of the chunk holding a cell.
+
+        Args:
+            x (int): The x value of the cell.
+            y (int): The y value of the cell.
+
+        Returns:
+            Tuple[int, int]: The key of the chunk.
+        """
+        return x >> SHIFT, y >> SHIFT
+
+    def get_code(self, x: int, y: int) -> int:
+        """Return the icon code stored at a cell.
+
+        Args:
+            x (int): The x value of the cell.
+            y (int): The y value of the cell.
+
+        Returns:
+            int: The icon code, UNSTORED if nothing is stored.
+        """
+        chunk = self._chunks.get((x >> SHIFT, y >> SHIFT))
+        if chunk is None:
+            return 0
+        return chunk[(y & MASK) << SHIFT | x & MASK]
+
+    def lookup(self, coordinate: Coordinate, table: Sequence[T]) -> T:
+        """Return the entry of a table for the icon code at a coordinate.
+
+        This is get_code in a single call, for look ups that run in the
+        inner loop of a search, such as tile weights.
+
+        Args:
+            coordinate (Coordinate): The coordinate to look up.
+            table (Sequence[T]): An entry for every icon code.
+
+        Returns:
+            T: The entry for the code stored at the coordinate.
+        """
+        x, y = coordinate
+        chunk = self._chunks.get((x >> SHIFT, y >> SHIFT))
+        if chunk is None:
+            return table[0]
+        return table[chunk[(y & MASK) << SHIFT | x & MASK]]
+
+    def set_code(self, x: int, y: int, code: int) -> None:
+        """Store an icon code at a cell, allocating its chunk if needed.
+
+        Args:
+            x (int): The x value of the cell.
+            y (int): The y value of the cell.
+            code (int): The icon code to store.
+        """
+        key = (x >> SHIFT, y >> SHIFT)
+        if (chunk := self._chunks.get(key)) is None:
+            chunk = self._chunks[key] = bytearray(SIZE * SIZE)
+        index = (y & MASK) << SHIFT | x & MASK
+        old_code = chunk[index]
+        chunk[index] = code
+        self._stored += (code != self.UNSTORED) - (old_code != self.UNSTORED)
+
+    def set_row(self, x: int, y: int, codes: bytes) -> None:
+        """Store a run of icon codes along a row, a chunk at a time.
+
+        Args:
+            x (int): The x value of the first cell.
+            y (int): The y value of the row.
+            codes (bytes): The icon codes to store, left to right.
+        """
+        chunks = self._chunks
+        row = (y & MASK) << SHIFT
+        done = 0
+        while done < len(codes):
+            col = (x + done) & MASK
+            segment = codes[done:done + SIZE - col]
+            key = ((x + done) >> SHIFT, y >> SHIFT)
+            if (chunk := chunks.get(key)) is None:
+                chunk = chunks[key] = bytearray(SIZE * SIZE)
+            start = row + col
+            stop = start + len(segment)
+            self._stored += chunk[start:stop].count(
+                self.UNSTORED
+            ) - segment.count(self.UNSTORED)
+            chunk[start:stop] = segment
+            done += len(segment)
+
+    @classmethod
+    def translation(cls) -> bytes:
+        """Return a table translating icon characters into icon codes.
+
+        The table is meant for bytes.translate, and maps every character
+        that is not an icon to UNSTORED.
+
+        Returns:
+            bytes: The 256 byte translation table.
+        """
+        table = bytearray(256)
+        for icon, code in cls.CODES.items():
+            table[ord(icon.value)] = code
+        return bytes(table)
+
+    def icon(self, coordinate: Coordinate) -> Optional[Icon]:
+        """Return the icon stored at a coordinate, ignoring occupation.
+
+        Args:
+            coordinate (Coordinate): The coordinate to look up.
+
+        Returns:
+            Optional[Icon]: The icon, or None if undiscovered or not stored.
+        """
+        return self.ICONS[self.get_code(*coordinate)]
+
+    def set_icon(self, coordinate: Coordinate, icon: Optional[Icon]) -> None:
+        """Store an icon at a coordinate.
+
+        Args:
+            coordinate (Coordinate): The coordinate to store at.
+            icon (Optional[Icon]): The icon, or None if undiscovered.
+        """
+        self.set_code(*coordinate, self.code(icon))
+
+    def coordinates(self, code: Optional[int] = None) -> Iterator[Coordinate]:
+        """Iterate over the coordinates of stored cells, row by row.
+
+        Args:
+            code (Optional[int], optional): Only yield cells holding this
+                code. Defaults to None, which yields every stored cell.
+
+        Yields:
+            Coordinate: The coordinate of a stored cell.
+        """
+        bands: Dict[int, List[Tuple[int, bytearray]]] = {}
+        for (chunk_x, chunk_y), chunk in sorted(self._chunks.items()):
+            bands.setdefault(chunk_y, []).append((chunk_x << SHIFT, chunk))
+        for chunk_y in sorted(bands):
+            band = bands[chunk_y]
+            for row in range(SIZE):
+                y = chunk_y << SHIFT | row
+                start = row << SHIFT
+                for left, chunk in band:
+                    cells = chunk[start:start + SIZE]
+                    if code is None:
+                        for col, value in enumerate(cells):
+                            if value:
+                                yield Coordinate(left + col, y)
+                    else:
+                        for col in self._find_all(cells, code):
+                            yield Coordinate(left + col, y)
+
+    @staticmethod
+    def _find_all(cells: bytes, code: int) -> Iterator[int]:
+        """Yield every index holding a code, using bytes.find."""
+        index = cells.find(code)
+        while index >= 0:
+            yield index
+            index = cells.find(code, index + 1)
+
+    def __contains__(self, coordinate: Coordinate) -> bool:
+        """Return whether a cell is stored at a coordinate."""
+        return self.get_code(*coordinate) != self.UNSTORED
+
+    def __len__(self) -> int:
+        """Return the number of stored cells."""
+        return self._stored
+
+    def chunks(self) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+        """Iterate over the allocated chunks, in the order of their keys.
+
+        Returns:
+            Iterator[Tuple[Tuple[int, int], bytes]]: The key of each chunk,
+                and a copy of its row major icon codes.
+        """
+        for key, chunk in sorted(self._chunks.items()):
+            yield key, bytes(chunk)
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[Tuple[Tuple[int, int], bytes]]
+    ) -> Grid:
+        """Build a grid from chunks, as returned by chunks.
+
+        Args:
+            chunks (Iterable[Tuple[Tuple[int, int], bytes]]): The key and
+                row major icon codes of each chunk.
+
+        Raises:
+            ValueError: If a chunk does not hold CHUNK_SIZE squared codes.
+
+        Returns:
+            Grid: The grid, without occupancy.
+        """
+        grid = cls()
+        for (chunk_x, chunk_y), cells in chunks:
+            if len(cells) != SIZE * SIZE:
+                raise ValueError(f"Expected {SIZE * SIZE} cells in a chunk")
+            grid._chunks[chunk_x, chunk_y] = bytearray(cells)
+            grid._stored += len(cells) - cells.count(cls.UNSTORED)
+        return grid
+
+    def chunk_stats(self) -> Iterator[ChunkStats]:
+        """Count the cells of every allocated chunk, by what they hold.
+
+        Yields:
+            ChunkStats: The counts of a chunk, in the order of their keys.
+        """
+        mineral = self.CODES[Icon.MINERAL]
+        for key, chunk in sorted(self._chunks.items()):
+            stored = len(chunk) - chunk.count(self.UNSTORED)
+            yield ChunkStats(
+                key,
+                stored,
+                stored - chunk.count(self.UNDISCOVERED),
+                chunk.count(mineral),
+            )
+
+    def connected_chunks(self, x: int, y: int) -> Set[Tuple[int, int]]:
+        """Return the allocated chunks joined, side by side, to a cell's.
+
+        A cell only neighbours cells of its own chunk or of a chunk sharing
+        a side with it, so no path from the cell leaves these chunks.
+
+        Args:
+            x (int): The x value of the cell.
+            y (int): The y value of the cell.
+
+        Returns:
+            Set[Tuple[int, int]]: The keys of the chunks, empty if the
+                cell's chunk is not allocated.
+        """
+        start = self.chunk_key(x, y)
+        if start not in self._chunks:
+            return set()
+        connected = {start}
+        stack = [start]
+        while stack:
+            chunk_x, chunk_y = stack.pop()
+            for key in (
+                (chunk_x, chunk_y - 1),
+                (chunk_x, chunk_y + 1),
+                (chunk_x + 1, chunk_y),
+                (chunk_x - 1, chunk_y),
+            ):
+                if key in self._chunks and key not in connected:
+                    connected.add(key)
+                    stack.append(key)
+        return connected
+
+    def copy_cells(
+        self, keys: Optional[Iterable[Tuple[int, int]]] = None
+    ) -> Tuple[int, int, int, int, bytes]:
+        """Return a copy of the icon codes, along with the grid bounds.
+
+        The bounds are those of the copied chunks, and cells of other
+        chunks within them hold UNSTORED.
+
+        Args:
+            keys (Optional[Iterable[Tuple[int, int]]], optional): The keys
+                of the allocated chunks to copy. Defaults to every chunk.
+
+        Returns:
+            Tuple[int, int, int, int, bytes]: The left and top coordinates,
+                the width and the height of the grid, and the row major
+                icon codes.
+        """
+        chunks = self._chunks
+        if keys is not None:
+            chunks = {key: chunks[key] for key in keys}
+        if not chunks:
+            return 0, 0, 0, 0, b""
+        chunk_xs = [chunk_x for chunk_x, _ in chunks]
+        chunk_ys = [chunk_y for _, chunk_y in chunks]
+        left, top = min(chunk_xs), min(chunk_ys)
+        width = (max(chunk_xs) - left + 1) << SHIFT
+        height = (max(chunk_ys) - top + 1) << SHIFT
+        cells = bytearray(width * height)
+        for (chunk_x, chunk_y), chunk in chunks.items():
+            col = (chunk_x - left) << SHIFT
+            first_row = (chunk_y - top) << SHIFT
+            for row in range(SIZE):
+                dest = (first_row + row) * width + col
+                start = row << SHIFT
+                cells[dest:dest + SIZE] = chunk[start:start + SIZE]
+        return left << SHIFT, top << SHIFT, width, height, bytes(cells)
+
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the icon codes.
+
+        Returns:
+            int: The size of the allocated chunks in bytes.
+        """
+        return len(self._chunks) * SIZE * SIZE
+
+
+class GridTile(Tile):
+    """A Tile that reads and writes its state through a Grid.
+
+    These views are created on look up and are cheap to throw away; any
+    changes made through them are stored in the grid, through the store of
+    the grid's owner if it has one.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        coordinate: Coordinate,
+        store: Optional[Callable[[Coordinate, Icon], None]] = None,
+    ) -> None:
+        """Initialize the view.
+
+        Args:
+            grid (Grid): The grid holding the tile's state.
+            coordinate (Coordinate): The coordinate of the tile.
+            store (Optional[Callable[[Coordinate, Icon], None]], optional):
+                Stores an icon written through the view, such as a map's,
+                which keeps its frontier and change log up to date.
+                Defaults to storing it in the grid.
+        """
+        self._grid = grid
+        self._coordinate = coordinate
+        self._store = store or grid.set_icon
+
+    @property
+    def _icon(self) -> Optional[Icon]:
+        return self._grid.icon(self._coordinate)
+
+    @_icon.setter
+    def _icon(self, icon: Icon) -> None:
+        self._store(self._coordinate, icon)
+
+    @property
+    def _occupation(self) -> Optional[Drone]:
+        return self._grid.occupancy.get(self._coordinate)
+
+    @_occupation.setter
+    def _occupation(self, drone: Optional[Drone]) -> None:
+        if drone:
+            self._grid.occupancy[self._coordinate] = drone
+        else:
+            self._grid.occupancy.pop(self._coordinate, None)
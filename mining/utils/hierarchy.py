@@ -0,0 +1,381 @@
+"""Hierarchical path finding (HPA*) over square clusters of tiles."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+from .search import build_path, manhattan
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+    from .search import WeightFunction
+
+    ClusterKey = Tuple[int, int]
+    Border = Tuple[ClusterKey, ClusterKey]
+    Edges = Dict[Coordinate, Tuple[int, List[Coordinate]]]
+
+
+class ClusterGraph:
+    """An abstract graph of the entrances between clusters of tiles.
+
+    The map is split into square clusters. Wherever two neighbouring
+    clusters share a run of pathable tiles along their border, one or two
+    entrances are placed on it. Entrances in the same cluster are joined by
+    the cheapest path that stays within the cluster, and those paths are
+    cached. Only clusters around changed tiles are rebuilt, before the next
+    query.
+    """
+
+    # border runs at least this long get an entrance at each end
+    LONG_ENTRANCE = 6
+
+    def __init__(self, weight: WeightFunction, cluster_size: int = 16):
+        """Initialize an empty graph.
+
+        Args:
+            weight (WeightFunction): Cost of entering a coordinate. It must
+                only change for coordinates passed to notify.
+            cluster_size (int, optional): The width and height of every
+                cluster. Defaults to 16.
+        """
+        self._weight = weight
+        self.cluster_size = cluster_size
+        self._dirty: Set[ClusterKey] = set()
+        self._borders: Dict[Border, List[Tuple[Coordinate, Coordinate]]] = {}
+        self._nodes: Dict[ClusterKey, Set[Coordinate]] = {}
+        self._intra: Dict[Coordinate, Edges] = {}
+        self._inter: Dict[Coordinate, Dict[Coordinate, int]] = {}
+
+    def cluster(self, coordinate: Coordinate) -> ClusterKey:
+        """Return the key of the cluster holding a coordinate.
+
+        Args:
+            coordinate (Coordinate): The coordinate.
+
+        Returns:
+            ClusterKey: The cluster's column and row.
+        """
+        return (
+            coordinate.x // self.cluster_size,
+            coordinate.y // self.cluster_size,
+        )
+
+    def notify(self, coordinate: Coordinate) -> None:
+        """Record that the weight of a coordinate has changed.
+
+        Args:
+            coordinate (Coordinate): The changed coordinate.
+        """
+        self._dirty.add(self.cluster(coordinate))
+
+    def find_path(
+        self, start: Coordinate, end: Coordinate
+    ) -> List[Coordinate]:
+        """Find a path between two points through the abstract graph.
+
+        The path is not always the cheapest possible, but is close to it. As
+        with astar, the end may always be entered, even from a neighbouring
+        cluster when it is not pathable itself.
+
+        Args:
+            start (Coordinate): The start point for the search.
+            end (Coordinate): The end point for the search.
+
+        Returns:
+            List[Coordinate]: The path including start and end, or an empty
+                list if no path was found.
+        """
+        if start == end:
+            return [start]
+        self._refresh()
+        exits = self._local_search(start, self.cluster(start), end=end)
+        entries = self._entries(end)
+        best: Tuple[float, List[Coordinate]] = (float("inf"), [])
+        # paths that only cross the clusters of the start and the end
+        for node, cost in exits[0].items():
+            if node in entries[0] and cost + entries[0][node] < best[0]:
+                best = (cost + entries[0][node], [node])
+        if best[1]:
+            best = (best[0], self._refine(best[1], exits, entries))
+        cost, abstract_path = self._abstract_search(
+            start, end, exits[0], entries[0]
+        )
+        if cost < best[0]:
+            best = (cost, self._refine(abstract_path, exits, entries))
+        return best[1]
+
+    def _entries(
+        self, end: Coordinate
+    ) -> Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]]:
+        """Search towards the end from its cluster and its neighbours'.
+
+        An end on a cluster border may only be reachable through the cluster
+        next to it, which the abstract graph does not connect to the end
+        when the end is not pathable, so the clusters of its pathable
+        neighbours are searched as well.
+
+        Args:
+            end (Coordinate): The end point for the search.
+
+        Returns:
+            Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]]: The
+                cost of reaching the end from every tile reached, and the
+                next tile on the way.
+        """
+        end_key = self.cluster(end)
+        costs, parents = self._local_search(
+            end, end_key, end=end, reverse=True
+        )
+        goal_cost = self._enter_cost(end, end)
+        for neighbor in end.cardinals():
+            key = self.cluster(neighbor)
+            if key == end_key or self._weight(neighbor) is None:
+                continue
+            neighbor_costs, neighbor_parents = self._local_search(
+                neighbor, key, reverse=True
+            )
+            neighbor_parents[neighbor] = end
+            for node, cost in neighbor_costs.items():
+                if (cost := cost + goal_cost) < costs.get(node, cost + 1):
+                    costs[node] = cost
+                    parents[node] = neighbor_parents[node]
+        return costs, parents
+
+    def _abstract_search(
+        self,
+        start: Coordinate,
+        end: Coordinate,
+        exits: Dict[Coordinate, int],
+        entries: Dict[Coordinate, int],
+    ) -> Tuple[float, List[Coordinate]]:
+        """A* over entrances, from the start's exits to the end's entries."""
+        start_nodes = self._nodes.get(self.cluster(start), set())
+        scores: Dict[Coordinate, int] = {}
+        parents: Dict[Coordinate, Coordinate] = {}
+        tie_breaker = count()
+        heap: List[Tuple[int, int, int, Coordinate]] = []
+        for node in start_nodes & exits.keys():
+            scores[node] = exits[node]
+            heuristic = manhattan(node, end)
+            heappush(
+                heap,
+                (exits[node] + heuristic, heuristic, next(tie_breaker), node),
+            )
+        best_cost, best_node = float("inf"), None
+        closed = set()
+        while heap:
+            estimate, _, _, node = heappop(heap)
+            if estimate >= best_cost:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            score = scores[node]
+            if node in entries:
+                if score + entries[node] < best_cost:
+                    best_cost, best_node = score + entries[node], node
+            for neighbor, cost in self._neighbors(node):
+                if neighbor in closed:
+                    continue
+                if (new_score := score + cost) < scores.get(
+                    neighbor, new_score + 1
+                ):
+                    scores[neighbor] = new_score
+                    parents[neighbor] = node
+                    heuristic = manhattan(neighbor, end)
+                    heappush(
+                        heap,
+                        (
+                            new_score + heuristic,
+                            heuristic,
+                            next(tie_breaker),
+                            neighbor,
+                        ),
+                    )
+        if best_node is None:
+            return best_cost, []
+        return best_cost, build_path(parents, best_node)
+
+    def _neighbors(
+        self, node: Coordinate
+    ) -> Iterable[Tuple[Coordinate, int]]:
+        for neighbor, (cost, _) in self._intra.get(node, {}).items():
+            yield neighbor, cost
+        yield from self._inter.get(node, {}).items()
+
+    def _refine(
+        self,
+        abstract_path: List[Coordinate],
+        exits: Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]],
+        entries: Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]],
+    ) -> List[Coordinate]:
+        """Turn a path of entrances into a path of neighbouring tiles."""
+        path = build_path(exits[1], abstract_path[0])
+        for node, next_node in zip(abstract_path, abstract_path[1:]):
+            if next_node in self._inter.get(node, {}):
+                path.append(next_node)
+            else:
+                path.extend(self._intra[node][next_node][1][1:])
+        node = abstract_path[-1]
+        while (node := entries[1].get(node)) is not None:
+            path.append(node)
+        return path
+
+    def _local_search(
+        self,
+        source: Coordinate,
+        key: ClusterKey,
+        end: Optional[Coordinate] = None,
+        reverse: bool = False,
+    ) -> Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]]:
+        """Run Dijkstra from a source without leaving its cluster.
+
+        A reverse search finds the cost of reaching the source from every
+        tile instead, and each tile's parent is the next tile on its way.
+
+        Args:
+            source (Coordinate): Where the search starts.
+            key (ClusterKey): The cluster to stay within.
+            end (Optional[Coordinate], optional): A tile that may always be
+                entered. Defaults to None.
+            reverse (bool, optional): Whether to search towards the source.
+                Defaults to False.
+
+        Returns:
+            Tuple[Dict[Coordinate, int], Dict[Coordinate, Coordinate]]: The
+                cost and parent of every tile reached.
+        """
+        costs: Dict[Coordinate, int] = {source: 0}
+        parents: Dict[Coordinate, Coordinate] = {}
+        closed = set()
+        heap: List[Tuple[int, Coordinate]] = [(0, source)]
+        while heap:
+            node_cost, node = heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            if reverse:
+                # moving from a neighbour onto this node
+                step_cost = self._enter_cost(node, end)
+                if step_cost is None:
+                    continue
+            elif node != source and node == end:
+                continue
+            for neighbor in node.cardinals():
+                if neighbor in closed or self.cluster(neighbor) != key:
+                    continue
+                if reverse:
+                    if self._weight(neighbor) is None:
+                        continue
+                    cost = step_cost
+                elif (cost := self._enter_cost(neighbor, end)) is None:
+                    continue
+                new_cost = node_cost + cost
+                if new_cost < costs.get(neighbor, new_cost + 1):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = node
+                    heappush(heap, (new_cost, neighbor))
+        return costs, parents
+
+    def _enter_cost(
+        self, coordinate: Coordinate, end: Optional[Coordinate]
+    ) -> Optional[int]:
+        if (cost := self._weight(coordinate)) is None and coordinate == end:
+            return 1
+        return cost
+
+    def _refresh(self) -> None:
+        """Rebuild the entrances and paths of changed clusters."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        affected = set(dirty)
+        borders = set()
+        for cx, cy in dirty:
+            borders.add(((cx, cy), (cx + 1, cy)))
+            borders.add(((cx, cy), (cx, cy + 1)))
+            borders.add(((cx - 1, cy), (cx, cy)))
+            borders.add(((cx, cy - 1), (cx, cy)))
+        for border in borders:
+            old = self._borders.pop(border, [])
+            new = self._find_entrances(border)
+            if new:
+                self._borders[border] = new
+            if old != new:
+                affected.update(border)
+            for first, second in old:
+                self._inter.get(first, {}).pop(second, None)
+                self._inter.get(second, {}).pop(first, None)
+            for first, second in new:
+                self._inter.setdefault(first, {})[second] = self._weight(
+                    second
+                )
+                self._inter.setdefault(second, {})[first] = self._weight(
+                    first
+                )
+        for key in affected:
+            self._build_cluster(key)
+
+    def _find_entrances(
+        self, border: Border
+    ) -> List[Tuple[Coordinate, Coordinate]]:
+        """Place entrances on every run of pathable tiles along a border."""
+        (cx, cy), (other_cx, _) = border
+        size = self.cluster_size
+        if other_cx != cx:
+            x = (cx + 1) * size - 1
+            pairs = [
+                (Coordinate(x, y), Coordinate(x + 1, y))
+                for y in range(cy * size, (cy + 1) * size)
+            ]
+        else:
+            y = (cy + 1) * size - 1
+            pairs = [
+                (Coordinate(x, y), Coordinate(x, y + 1))
+                for x in range(cx * size, (cx + 1) * size)
+            ]
+        entrances = []
+        run: List[Tuple[Coordinate, Coordinate]] = []
+        for pair in pairs + [None]:
+            if pair and all(self._weight(coord) is not None for coord in pair):
+                run.append(pair)
+                continue
+            if len(run) >= self.LONG_ENTRANCE:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        return entrances
+
+    def _build_cluster(self, key: ClusterKey) -> None:
+        """Rebuild the cached paths between the entrances of a cluster."""
+        for node in self._nodes.pop(key, ()):
+            self._intra.pop(node, None)
+            if not self._inter.get(node):
+                self._inter.pop(node, None)
+        cx, cy = key
+        nodes = set()
+        for border in (
+            ((cx, cy), (cx + 1, cy)),
+            ((cx, cy), (cx, cy + 1)),
+            ((cx - 1, cy), (cx, cy)),
+            ((cx, cy - 1), (cx, cy)),
+        ):
+            for pair in self._borders.get(border, ()):
+                nodes.update(
+                    coord for coord in pair if self.cluster(coord) == key
+                )
+        if not nodes:
+            return
+        self._nodes[key] = nodes
+        for node in nodes:
+            costs, parents = self._local_search(node, key)
+            self._intra[node] = {
+                other: (costs[other], build_path(parents, other))
+                for other in nodes
+                if other != node and other in costs
+            }
@@ -23,7 +23,7 @@ class Icon(Enum):
         Returns:
             bool: True if traversable, else False.
         """
-        return self in [Icon.DEPLOY_ZONE, Icon.ACID, Icon.EMPTY]
+        return self in TRAVERSABLE_ICONS
 
     def health_cost(self) -> int:
         """Return the health cost for traversing over this tile.
@@ -66,3 +66,6 @@ class Icon(Enum):
             Mapping[str, str]: The unicode mappings.
         """
         return {icon.name: icon.unicode() for icon in cls.__members__.values()}
+
+
+TRAVERSABLE_ICONS = frozenset((Icon.DEPLOY_ZONE, Icon.ACID, Icon.EMPTY))
@@ -0,0 +1,90 @@
+"""Streaming loaders for map files.
+
+A map file holds one row of icon characters per line, top to bottom. A
+digit is a mineral tile holding that many minerals, and a mineral icon
+holds one. Files are read a row at a time and every row is decoded with
+bytes methods, so no object is created per character and a file is never
+held in memory as a whole.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from .icon import Icon
+from .map import Map
+
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Tuple
+
+# digits become the mineral icon
+MINERAL_DIGITS = bytes.maketrans(
+    b"0123456789", Icon.MINERAL.value.encode("ascii") * 10
+)
+MINERAL_AMOUNTS = re.compile(rb"[0-9*]")
+
+
+def read_rows(path: str) -> Iterator[bytes]:
+    """Stream the rows of a map file, without their line endings.
+
+    Args:
+        path (str): The map file.
+
+    Yields:
+        bytes: The characters of a row, top to bottom.
+    """
+    with open(path, "rb") as map_file:
+        for line in map_file:
+            yield line.rstrip(b"\r\n")
+
+
+def decode_row(line: bytes) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """Split a row of a map file into icon characters and mineral amounts.
+
+    Args:
+        line (bytes): The row, without its line ending.
+
+    Returns:
+        Tuple[bytes, List[Tuple[int, int]]]: The row with every digit
+            replaced by the mineral icon, and the x value and amount of
+            every mineral in the row.
+    """
+    amounts = [
+        (match.start(), int(match[0]) if match[0].isdigit() else 1)
+        for match in MINERAL_AMOUNTS.finditer(line)
+    ]
+    return line.translate(MINERAL_DIGITS), amounts
+
+
+def load_map(
+    path: str, map_id: int = 0, density: Optional[float] = None
+) -> Map:
+    """Load a map file into a fully discovered Map.
+
+    Args:
+        path (str): The map file.
+        map_id (int, optional): The id of the map. Defaults to 0.
+        density (Optional[float], optional): The mineral density of the
+            map. Defaults to the share of tiles in the file that are
+            minerals.
+
+    Raises:
+        ValueError: If the file holds a character that is not an icon.
+
+    Returns:
+        Map: The map.
+    """
+    map_ = Map(map_id, density or 0.0)
+    tiles = 0
+
+    def rows() -> Iterator[bytes]:
+        nonlocal tiles
+        for line in read_rows(path):
+            tiles += len(line)
+            yield line.translate(MINERAL_DIGITS)
+
+    map_.load_rows(rows())
+    if density is None and tiles:
+        map_.density = len(map_.untasked_minerals) / tiles
+    return map_
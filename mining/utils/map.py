@@ -2,15 +2,53 @@
 
 from __future__ import annotations
 
-from queue import PriorityQueue
+from array import array
+from heapq import heappush, heapreplace
+from itertools import count as counter
 from typing import TYPE_CHECKING, overload
 
+from .assignment import (
+    INFINITY,
+    SpatialIndex,
+    greedy_assignment,
+    optimal_assignment,
+)
+from .context import DecodedContext
 from .coordinate import Coordinate
+from .flow_field import FlowField
+from .grid import ChunkStats, Grid, GridTile
+from .hierarchy import ClusterGraph
 from .icon import Icon
+from .path_tree import ShortestPathTree
+from .replan import PathRepairer
+from .reservation import ReservationTable
+from .packed import coordinates, pack, unpack
+from .search import (
+    jump_point_search,
+    manhattan,
+    packed_astar,
+    packed_nearest_goals,
+)
 from .tile import Tile
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
 if TYPE_CHECKING:
-    from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+    from typing import (
+        AbstractSet,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        Set,
+        Tuple,
+        Union,
+    )
 
     from mining.zerg_units.drones import Drone
 
@@ -27,6 +65,26 @@ class Map:
         Icon.ACID: 10,
         None: 1,
     }
+    # undiscovered tiles next to these icons are on the frontier; scouts
+    # have always explored past minerals too
+    FRONTIER_ICONS = frozenset(
+        (Icon.DEPLOY_ZONE, Icon.ACID, Icon.EMPTY, Icon.MINERAL)
+    )
+    # weights indexed by grid icon code, unstored tiles are not pathable
+    CODE_WEIGHTS = [None, *map(NODE_WEIGHTS.get, Grid.ICONS[1:])]
+    # icon codes by icon character, for loading rows in bulk
+    CHAR_CODES = Grid.translation()
+    # the icon code of a drone, reported over the terrain under it
+    ZERG_CODE = Grid.code(Icon.ZERG)
+    # stored tiles above which dijkstra searches hierarchically
+    HIERARCHY_THRESHOLD = 250_000
+    # minerals considered per miner when assigning a batch of miners
+    MINERAL_CANDIDATES = 2
+    # the most miners assigned at once with the optimal assignment
+    OPTIMAL_BATCH = 32
+    # the fewest recent changes remembered for changes_since; at most twice
+    # as many are kept, at 8 bytes each
+    CHANGE_LOG_LIMIT = 4096
 
     def __init__(self, map_id: int, density: float) -> None:
         """Initialize a Map with a context object.
@@ -36,117 +94,489 @@ class Map:
         """
         self.map_id = map_id
         self.density = density
+        # the deploy zone, known once the first context arrives
+        self.origin: Optional[Coordinate] = None
         # a set of the coords of minerals and drone id tasked to mining it
-        self.untasked_minerals: Set[Coordinate] = set()
+        self.untasked_minerals = SpatialIndex()
         self.tasked_minerals: Set[Coordinate] = set()
-        self._stored_tiles_: Dict[Coordinate, Tile] = {}
+        self._grid = Grid()
+        # undiscovered tiles bordering a traversable discovered tile
+        self._frontier: Set[Coordinate] = set()
+        # D* Lite search state of drone paths, by drone id
+        self._repairers: Dict[int, PathRepairer] = {}
+        # shortest paths from the origin, created on first use
+        self._origin_tree: Optional[ShortestPathTree] = None
+        # flow fields by target, with the map version they are up to date to
+        self._flow_fields: Dict[Coordinate, Tuple[int, FlowField]] = {}
+        # abstract graph for large maps, created on first use
+        self._cluster_graph: Optional[ClusterGraph] = None
+        # the tiles drone paths hold at each tick
+        self.reservations = ReservationTable()
         self.scout_count = 0
-
-    def dijkstra(self, start: Coordinate, end: Coordinate) -> List[Coordinate]:
-        """Apply Dijkstra's Algorithm to find a path between two points.
+        # the destinations of the scouts on the map, by drone id
+        self.scout_targets: Dict[int, Coordinate] = {}
+        # counts tile changes, each change is stamped with the new count
+        self._version = 0
+        # the packed coordinates of the latest changes, oldest first; the
+        # change at index i was stamped with version _log_floor + i + 1
+        self._change_log = array("q")
+        # changes_since cannot reach back before this version
+        self._log_floor = 0
+        # the latest version of every grid chunk with a changed tile
+        self._chunk_versions: Dict[Tuple[int, int], int] = {}
+
+    def dijkstra(
+        self, start: Coordinate, end: Coordinate, jump_points: bool = False
+    ) -> List[Coordinate]:
+        """Find the cheapest path between two points.
+
+        This is kept for compatibility. It searches with A*, unless the map
+        has more than HIERARCHY_THRESHOLD tiles, in which case the cached
+        cluster graph is searched instead, as it is for paths to and from
+        the origin. Drones on tiles are not taken into account by the
+        cluster graph.
 
         Args:
             start (Coordinate): The start point for the search
             end (Coordinate): The end point for the search
+            jump_points (bool, optional): Whether to search with Jump Point
+                Search instead, regardless of the map size. Defaults to
+                False.
         Returns:
             list(Coordinate): Path in the form of a Coordinate list
         """
-        visited: Set[Coordinate] = set()
-        parents_map: Dict[Coordinate, Coordinate] = {}
-        path_found = False
-        pqueue: PriorityQueue[Tuple[int, Coordinate]] = PriorityQueue()
-        pqueue.put((0, start))
-        while not pqueue.empty():
-            _, node = pqueue.get()
-            if node in visited:
-                continue
-            if node == end:
-                path_found = True
-                break
+        if jump_points:
+            return self.astar(start, end, jump_points=True)
+        if self._hierarchical():
+            return self.hierarchical_path(start, end)
+        return self.astar(start, end)
+
+    def _hierarchical(self) -> bool:
+        """Whether the map is large enough to search the cluster graph."""
+        return len(self._grid) > self.HIERARCHY_THRESHOLD
+
+    def hierarchical_path(
+        self, start: Coordinate, end: Coordinate
+    ) -> List[Coordinate]:
+        """Find a path between two points with hierarchical path finding.
+
+        The search runs over a graph of entrances between clusters of tiles,
+        which is cached and only rebuilt for clusters whose tiles changed.
+        Paths are close to, but not always, the cheapest: on random maps
+        with walls, acid and minerals, about 40% of paths are longer than
+        the cheapest, and paths cost 4.5% more on average.
 
-            neighbors = node.cardinals()
-            if end in neighbors:
-                path_found = True
-                parents_map[end] = node
-                break
+        Args:
+            start (Coordinate): The start point for the search.
+            end (Coordinate): The end point for the search.
 
-            visited.add(node)
-            neighbors_gen = (
-                neighbor for neighbor in neighbors if neighbor not in visited
-            )
-            self._add_to_path(
-                node,
-                neighbors_gen,
-                parents_map,
-                pqueue,
-            )
-        return (
-            self._build_final_path(start, end, parents_map)
-            if path_found
-            else []
-        )
+        Returns:
+            List[Coordinate]: The path including start and end, or an empty
+                list if no path was found.
+        """
+        if self._cluster_graph is None:
+            self._cluster_graph = ClusterGraph(self.terrain_weight)
+            for coordinate in self._grid.coordinates():
+                self._cluster_graph.notify(coordinate)
+        return self._cluster_graph.find_path(start, end)
 
-    def _add_to_path(
-        self,
-        node: Coordinate,
-        neighbors: Iterable[Coordinate],
-        parents_map: Dict[Coordinate, Coordinate],
-        pqueue: PriorityQueue[Tuple[int, Coordinate]],
-    ) -> None:
-        for neighbor_coord in neighbors:
-            if (neighbor := self.get(neighbor_coord, None)) is None:
-                # tile not in map
-                continue
-            if neighbor.icon and neighbor.icon not in self.NODE_WEIGHTS:
-                # tile not pathable
-                continue
-            parents_map[neighbor.coordinate] = node
-            pqueue.put((self.NODE_WEIGHTS[neighbor.icon], neighbor.coordinate))
+    def astar(
+        self, start: Coordinate, end: Coordinate, jump_points: bool = False
+    ) -> List[Coordinate]:
+        """Apply the A* algorithm to find the cheapest path between points.
+
+        Tiles are weighted by NODE_WEIGHTS. Tiles that are not in the map, or
+        whose icon has no weight, are not pathable; the end tile may always
+        be reached.
 
-    def _build_final_path(
+        Jump Point Search finds a path of the same cost, but skips across
+        open ground instead of queueing every tile, which is usually faster
+        on large explored areas.
+
+        Args:
+            start (Coordinate): The start point for the search.
+            end (Coordinate): The end point for the search.
+            jump_points (bool, optional): Whether to use Jump Point Search.
+                Defaults to False.
+
+        Returns:
+            List[Coordinate]: The path including start and end, or an empty
+                list if no path was found.
+        """
+        if jump_points:
+            return jump_point_search(start, end, self.weight)
+        path = packed_astar(pack(*start), pack(*end), self.packed_weight)
+        return coordinates(path)
+
+    def nearest_paths(
         self,
         start: Coordinate,
-        end: Coordinate,
-        parents_map: Dict[Coordinate, Coordinate],
-    ) -> list[Coordinate]:
-        curr = end
-        final_path: List[Coordinate] = [end]
-        while curr != start:
-            coord = parents_map[curr]
-            final_path.append(coord)
-            curr = coord
-            if start in coord.cardinals():
-                break
-        final_path.append(start)
-        final_path = final_path[::-1]
-        return final_path
+        goals: AbstractSet[Coordinate],
+        limit: int = 1,
+    ) -> List[List[Coordinate]]:
+        """Find paths to the closest reachable goals with a single search.
+
+        Args:
+            start (Coordinate): The start point for the search.
+            goals (AbstractSet[Coordinate]): The coordinates to search for.
+            limit (int, optional): The most paths to return. Defaults to 1.
+
+        Returns:
+            List[List[Coordinate]]: Paths including start and goal, ordered
+                from cheapest to most expensive.
+        """
+        paths = packed_nearest_goals(
+            pack(*start),
+            {pack(*goal) for goal in goals},
+            self.packed_weight,
+            limit,
+        )
+        return [coordinates(path) for path in paths]
+
+    def weight(self, coordinate: Coordinate) -> Optional[int]:
+        """Return the cost of moving onto the tile at the coordinate.
+
+        Args:
+            coordinate (Coordinate): The coordinate of the tile.
+
+        Returns:
+            Optional[int]: The cost, or None if the tile is not pathable.
+        """
+        grid = self._grid
+        occupancy = grid.occupancy
+        if occupancy and (drone := occupancy.get(coordinate)):
+            return self.NODE_WEIGHTS.get(drone.icon)
+        return grid.lookup(coordinate, self.CODE_WEIGHTS)
+
+    def packed_weight(self, key: int) -> Optional[int]:
+        """Return the cost of moving onto the tile at a packed coordinate.
+
+        This is weight for searches that run on packed keys.
+
+        Args:
+            key (int): The packed coordinate of the tile.
+
+        Returns:
+            Optional[int]: The cost, or None if the tile is not pathable.
+        """
+        x, y = unpack(key)
+        occupancy = self._grid.occupancy
+        # occupancy is keyed by coordinates, which equal plain tuples
+        if occupancy and (drone := occupancy.get((x, y))):
+            return self.NODE_WEIGHTS.get(drone.icon)
+        return self.CODE_WEIGHTS[self._grid.get_code(x, y)]
+
+    def terrain_weight(self, coordinate: Coordinate) -> Optional[int]:
+        """Return the cost of moving onto a tile, ignoring drones on it.
+
+        Drones move every tick without the map being told, so searches that
+        keep state between ticks use this instead of weight.
+
+        Args:
+            coordinate (Coordinate): The coordinate of the tile.
+
+        Returns:
+            Optional[int]: The cost, or None if the tile is not pathable.
+        """
+        return self._grid.lookup(coordinate, self.CODE_WEIGHTS)
+
+    def path_from_origin(self, coordinate: Coordinate) -> List[Coordinate]:
+        """Return the cheapest path from the map's origin to a coordinate.
+
+        Paths come from a shortest path tree rooted at the origin, which is
+        kept up to date as tiles are discovered. Maps with more than
+        HIERARCHY_THRESHOLD tiles search the cluster graph instead, whose
+        paths are not always the cheapest.
+
+        Args:
+            coordinate (Coordinate): The end of the path.
+
+        Returns:
+            List[Coordinate]: The path including origin and coordinate, or an
+                empty list if the coordinate is unreachable.
+        """
+        if self._hierarchical():
+            return self.hierarchical_path(self.origin, coordinate)
+        return self._get_origin_tree().path_to(coordinate)
+
+    def path_to_origin(self, coordinate: Coordinate) -> List[Coordinate]:
+        """Return the cheapest path from a coordinate to the map's origin.
+
+        As with path_from_origin, maps with more than HIERARCHY_THRESHOLD
+        tiles search the cluster graph. Once a map has no frontier left, its
+        tiles rarely change, so when NumPy is installed the path is read off
+        a flow field to the origin instead of the origin tree.
+
+        Args:
+            coordinate (Coordinate): The start of the path.
+
+        Returns:
+            List[Coordinate]: The path including coordinate and origin, or an
+                empty list if the coordinate is unreachable.
+        """
+        if self._hierarchical():
+            return self.hierarchical_path(coordinate, self.origin)
+        if np is not None and not self._frontier:
+            return self.flow_field(self.origin).path_from(coordinate)
+        return self._get_origin_tree().path_from(coordinate)
+
+    def _get_origin_tree(self) -> ShortestPathTree:
+        tree = self._origin_tree
+        if tree is None or tree.root != self.origin:
+            tree = ShortestPathTree(self.terrain_weight, self.origin)
+            self._origin_tree = tree
+        return tree
+
+    def flow_field(self, target: Coordinate) -> FlowField:
+        """Return the distance to a target from every tile on the map.
+
+        Fields are cached, so drones heading to the same target share one
+        field. A cached field catches up with the tiles changed since it
+        was last used: tiles that got cheaper are applied to it, and any
+        other change builds it again. NumPy is required.
+
+        Args:
+            target (Coordinate): The target of the field.
+
+        Returns:
+            FlowField: The field, which gives each tile's next step.
+        """
+        cached = self._flow_fields.get(target)
+        if cached is not None:
+            version, field = cached
+            if version == self._version:
+                return field
+            changes = self.changes_since(version)
+            if changes is None or not field.update(
+                (coordinate, self.terrain_weight(coordinate))
+                for coordinate in changes
+            ):
+                cached = None
+        if cached is None:
+            field = FlowField(self._grid, self.CODE_WEIGHTS, target)
+        self._flow_fields[target] = self._version, field
+        return field
+
+    def repair_path(
+        self, drone: Drone, start: Coordinate, goal: Coordinate
+    ) -> List[Coordinate]:
+        """Repair a drone's path to its goal around newly discovered tiles.
+
+        The search state is kept for each drone, so later repairs towards the
+        same goal only redo the work affected by tiles that changed since.
+
+        Args:
+            drone (Drone): The drone whose path is repaired.
+            start (Coordinate): The drone's current location.
+            goal (Coordinate): The destination of the drone.
+
+        Returns:
+            List[Coordinate]: The path including start and goal, or an empty
+                list if the goal can no longer be reached.
+        """
+        repairer = self._repairers.get(id(drone))
+        if repairer is None or repairer.goal != goal:
+            repairer = PathRepairer(self.terrain_weight, start, goal)
+            self._repairers[id(drone)] = repairer
+        return repairer.repair(start)
+
+    def reserve_path(
+        self, drone: Drone, path: List[Coordinate]
+    ) -> List[Coordinate]:
+        """Retime a drone's path around other drones, and reserve it.
+
+        The path is planned again from its first to its last tile against
+        the reservations of every other drone, waiting or stepping aside
+        where their paths cross, so that reserved paths never collide. If no
+        such path is found in time, the path is returned unchanged and the
+        drone only holds the tile it stands on for a few ticks, so other
+        drones plan around it.
+
+        Args:
+            drone (Drone): The drone that will follow the path.
+            path (List[Coordinate]): The path, from the drone's position.
+
+        Returns:
+            List[Coordinate]: The reserved path, with a repeated tile for
+                each step spent waiting, or the unchanged path.
+        """
+        drone_id = id(drone)
+        if len(path) < 2:
+            self.reservations.release(drone_id)
+            return path
+        start = path[0]
+
+        def weight(coordinate: Coordinate) -> Optional[int]:
+            # reservations lag a tick behind blocked drones, so do not step
+            # straight onto a drone that stands next to the start
+            if manhattan(coordinate, start) == 1:
+                return self.weight(coordinate)
+            return self.terrain_weight(coordinate)
+
+        planned = self.reservations.plan(
+            drone_id,
+            start,
+            path[-1],
+            weight,
+            len(path) + ReservationTable.WAIT_SLACK,
+            drone.moves,
+        )
+        if not planned:
+            self.reservations.reserve(
+                drone_id, path[:1] * ReservationTable.WAIT_SLACK, drone.moves
+            )
+            return path
+        self.reservations.reserve(drone_id, planned, drone.moves)
+        return planned
+
+    def delay_path(self, drone: Drone, path: List[Coordinate]) -> None:
+        """Move a delayed drone's reservation to start at the current tick.
+
+        A drone whose move was blocked is a tick behind its reservation, so
+        other drones would plan around where it would have been. Drones that
+        hold no reservation are left alone.
+
+        Args:
+            drone (Drone): The delayed drone.
+            path (List[Coordinate]): Its remaining path, from its position.
+        """
+        if id(drone) in self.reservations:
+            self.reservations.reserve(id(drone), path, drone.moves)
+
+    def release_path(self, drone: Drone) -> None:
+        """Drop the search state, reservations and target of a drone's path.
+
+        Args:
+            drone (Drone): The drone which no longer travels on this map.
+        """
+        self._repairers.pop(id(drone), None)
+        self.reservations.release(id(drone))
+        self.scout_targets.pop(id(drone), None)
 
     def update_context(self, context: Context) -> None:
-        """Update the adjacency list for the Map with a context object.
+        """Update the Map with a single context object.
 
         Arguments:
             context (Context): The context object to use to update
-                the Map.
-            origin (bool): Whether or not the passed context object
-                is the origin of the map.
-        """
-        x = context.x
-        y = context.y
-        symbols = [context.north, context.south, context.east, context.west]
-        zerg_position = Coordinate(x, y)
-        if len(self._stored_tiles_) == 0:
-            self.origin = zerg_position
-            self.add_tile(Tile(self.origin, Icon.DEPLOY_ZONE))
-
-        for symbol, coordinate in zip(symbols, zerg_position.cardinals()):
-            icon = Icon(symbol)
-            tile = Tile(coordinate, icon)
-            self._stored_tiles_[coordinate] = tile
-            self._track_mineral(icon, coordinate)
-            for neighbor_coordinate in coordinate.cardinals():
-                if self.get(neighbor_coordinate, None) is None:
-                    neighbor_tile = Tile(neighbor_coordinate)
-                    self._stored_tiles_[neighbor_coordinate] = neighbor_tile
+                the Map, decoded or not.
+        """
+        self.apply_contexts((context,))
+
+    def apply_contexts(self, contexts: Iterable[Context]) -> int:
+        """Update the Map with the contexts drones reported in a tick.
+
+        The tiles of every context are gathered first, so a tile reported
+        by several drones is only stored once, with the icon of the last
+        report. Tiles whose icon did not change are skipped, along with the
+        undiscovered placeholders around them, so they do not show up in
+        changes_since. The first context given to an empty map sets its
+        origin.
+
+        Args:
+            contexts (Iterable[Context]): The contexts, decoded or not, in
+                the order they were reported.
+
+        Returns:
+            int: The version of the map before the contexts were applied,
+                so changes_since lists the tiles they changed.
+        """
+        version = self._version
+        grid = self._grid
+        get_code = grid.get_code
+        discovered = Grid.UNDISCOVERED
+        zerg = self.ZERG_CODE
+        codes: Dict[Coordinate, int] = {}
+        for context in contexts:
+            context = DecodedContext.decode(context)
+            zerg_position = Coordinate(context.x, context.y)
+            if len(grid) == 0:
+                self.origin = zerg_position
+                self._set_icon(zerg_position, Icon.DEPLOY_ZONE)
+            for code, coordinate in zip(
+                context.codes, zerg_position.cardinals()
+            ):
+                if code == zerg and (
+                    coordinate in codes or get_code(*coordinate) > discovered
+                ):
+                    # drones move on, keep the terrain that is under them
+                    continue
+                codes[coordinate] = code
+
+        icons = Grid.ICONS
+        for coordinate, code in codes.items():
+            if get_code(*coordinate) != code:
+                self._store_icon(coordinate, icons[code])
+        return version
+
+    def load_rows(self, rows: Iterable[bytes]) -> None:
+        """Store fully discovered rows of icon characters, in bulk.
+
+        Each row is translated into icon codes and stored in one go, so the
+        rows can be streamed from a file without a Tile per character. Row
+        y starts at (0, y), minerals are tracked and the first deployment
+        zone becomes the origin. The map must be empty.
+
+        Args:
+            rows (Iterable[bytes]): The rows, top to bottom.
+
+        Raises:
+            ValueError: If the map is not empty, or a row holds a character
+                that is not an icon.
+        """
+        if len(self._grid):
+            raise ValueError("Rows can only be loaded into an empty map")
+        translation = self.CHAR_CODES
+        deploy_zone = ord(Icon.DEPLOY_ZONE.value)
+        mineral = Icon.MINERAL.value.encode("ascii")
+        above: bytes = b""
+        row: Optional[bytes] = None
+        y = -1
+        for y, below in enumerate(rows):
+            codes = below.translate(translation)
+            if (x := codes.find(Grid.UNSTORED)) != -1:
+                raise ValueError(f"Unknown icon {below[x:x + 1]!r} at {x, y}")
+            self._grid.set_row(0, y, codes)
+            self._row_loaded(y, len(codes))
+            if self.origin is None and (x := below.find(deploy_zone)) != -1:
+                self.origin = Coordinate(x, y)
+            x = below.find(mineral)
+            while x != -1:
+                self.untasked_minerals.add(Coordinate(x, y))
+                x = below.find(mineral, x + 1)
+            if row is not None:
+                self._add_edge_frontier(y - 1, row, above, below)
+            above, row = row or b"", below
+        if row is not None:
+            self._add_edge_frontier(y, row, above, b"")
+
+    def _row_loaded(self, y: int, width: int) -> None:
+        """Stamp a row loaded in bulk, too large for the change log."""
+        self._version += 1
+        self._log_floor = self._version
+        del self._change_log[:]
+        size = Grid.CHUNK_SIZE
+        for x in range(0, width, size):
+            self._chunk_versions[Grid.chunk_key(x, y)] = self._version
+
+    def _add_edge_frontier(
+        self, y: int, row: bytes, above: bytes, below: bytes
+    ) -> None:
+        """Add the frontier of a loaded row, next to where rows end.
+
+        Inside the rows every tile is discovered, so only tiles at the ends
+        of a row, or past the end of the row above or below, can border an
+        undiscovered tile.
+        """
+        grid = self._grid
+        width = len(row)
+        for x in {0, width - 1, *range(min(len(above), len(below)), width)}:
+            if not 0 <= x < width:
+                continue
+            if Icon(chr(row[x])) not in self.FRONTIER_ICONS:
+                continue
+            for neighbor in Coordinate(x, y).cardinals():
+                if grid.icon(neighbor) is None:
+                    self._frontier.add(neighbor)
 
     def add_tile(self, tile: Tile) -> None:
         """Add tile to map.
@@ -154,14 +584,182 @@ class Map:
         Args:
             tile (Tile): The tile to add.
         """
-        self._stored_tiles_[tile.coordinate] = tile
+        if tile._icon:
+            self._set_icon(tile.coordinate, tile._icon)
+        elif tile.coordinate not in self._grid:
+            self._set_undiscovered(tile.coordinate)
+        if tile.occupied_drone:
+            self._grid.occupancy[tile.coordinate] = tile.occupied_drone
+
+    def _set_icon(self, coordinate: Coordinate, icon: Icon) -> None:
+        """Store a discovered icon and keep the frontier up to date.
+
+        Only the tile and its neighbours are checked, so the cost does not
+        depend on the size of the map.
+        """
+        grid = self._grid
+        old_icon = grid.icon(coordinate)
+        if old_icon is icon:
+            return
+        grid.set_icon(coordinate, icon)
+        self._tile_changed(coordinate)
+        self._frontier.discard(coordinate)
+        if icon in self.FRONTIER_ICONS:
+            for neighbor in coordinate.cardinals():
+                if grid.icon(neighbor) is None:
+                    self._frontier.add(neighbor)
+        elif old_icon in self.FRONTIER_ICONS:
+            for neighbor in coordinate.cardinals():
+                if not self._borders_frontier_icon(neighbor):
+                    self._frontier.discard(neighbor)
+
+    def _store_icon(self, coordinate: Coordinate, icon: Icon) -> None:
+        """Store a discovered icon as if a drone reported it.
+
+        Minerals are tracked, and placeholders are stored for the
+        neighbours that are not known yet. Icons written through the tiles
+        of the map are stored here too.
+        """
+        self._set_icon(coordinate, icon)
+        if icon is Icon.MINERAL:
+            self._track_mineral(icon, coordinate)
+        grid = self._grid
+        for neighbor in coordinate.cardinals():
+            if neighbor not in grid:
+                self._set_undiscovered(neighbor)
+
+    def _set_undiscovered(self, coordinate: Coordinate) -> None:
+        """Store a placeholder for a tile that is not discovered yet."""
+        self._grid.set_code(*coordinate, Grid.UNDISCOVERED)
+        self._tile_changed(coordinate)
+
+    def _tile_changed(self, coordinate: Coordinate) -> None:
+        """Tell searches that keep state that a tile's weight changed.
+
+        The change is also stamped with a new version, for changes_since,
+        which flow fields catch up with, and for dirty_chunks.
+        """
+        for repairer in self._repairers.values():
+            repairer.notify(coordinate)
+        if self._origin_tree is not None:
+            self._origin_tree.notify(coordinate)
+        if self._cluster_graph is not None:
+            self._cluster_graph.notify(coordinate)
+        self._version = version = self._version + 1
+        log = self._change_log
+        log.append(pack(*coordinate))
+        if len(log) > 2 * self.CHANGE_LOG_LIMIT:
+            # forget the oldest changes in one go, so trimming is cheap
+            forgotten = len(log) - self.CHANGE_LOG_LIMIT
+            del log[:forgotten]
+            self._log_floor += forgotten
+        self._chunk_versions[Grid.chunk_key(*coordinate)] = version
+
+    @property
+    def version(self) -> int:
+        """The version of the map, raised whenever a tile changes."""
+        return self._version
+
+    def changes_since(self, version: int) -> Optional[List[Coordinate]]:
+        """Return the tiles that changed after a version of the map.
+
+        Only the tiles changed since are visited, so a renderer or cache
+        that remembers the version it last saw can catch up in time
+        proportional to what changed. Only the latest CHANGE_LOG_LIMIT
+        changes are sure to be remembered, and rows loaded in bulk are not
+        listed, so a reader that falls further behind must start over, or
+        catch up with dirty_chunks.
+
+        Args:
+            version (int): The version last seen, such as the version of
+                the map when it was last drawn.
+
+        Returns:
+            Optional[List[Coordinate]]: The changed tiles, each listed
+                once, in the order of their latest change, or None if the
+                changes cannot be listed and every tile must be read again.
+        """
+        if version < self._log_floor:
+            return None
+        # keep the latest change of each tile
+        latest = dict.fromkeys(
+            reversed(self._change_log[version - self._log_floor:])
+        )
+        changes = coordinates(latest)
+        changes.reverse()
+        return changes
+
+    def dirty_chunks(self, version: int) -> Set[Tuple[int, int]]:
+        """Return the grid chunks with a tile that changed after a version.
+
+        Chunks are squares of Grid.CHUNK_SIZE tiles, keyed as by
+        Grid.chunk_key. Unlike changes_since, every version can be asked
+        about.
+
+        Args:
+            version (int): The version last seen.
+
+        Returns:
+            Set[Tuple[int, int]]: The keys of the changed chunks.
+        """
+        return {
+            chunk
+            for chunk, chunk_version in self._chunk_versions.items()
+            if chunk_version > version
+        }
+
+    def chunk_stats(self) -> List[ChunkStats]:
+        """Count the tiles of every grid chunk, by what they hold.
+
+        Returns:
+            List[ChunkStats]: The counts of each allocated chunk,
+                in the order of their keys.
+        """
+        return list(self._grid.chunk_stats())
+
+    def _borders_frontier_icon(self, coordinate: Coordinate) -> bool:
+        icon = self._grid.icon
+        return any(
+            icon(neighbor) in self.FRONTIER_ICONS
+            for neighbor in coordinate.cardinals()
+        )
+
+    def frontier(self) -> AbstractSet[Coordinate]:
+        """Return the undiscovered tiles next to open or mineral tiles.
+
+        The frontier is kept up to date as tiles are discovered. The returned
+        set is live and must not be modified; copy it to keep a snapshot.
+
+        Returns:
+            AbstractSet[Coordinate]: The coordinates on the frontier.
+        """
+        return self._frontier
+
+    def undiscovered_around(self, coordinate: Coordinate) -> Set[Coordinate]:
+        """Return the undiscovered tiles among a tile and its neighbours.
+
+        These are the tiles a drone reveals by reaching the tile, or by
+        stopping next to it when the tile itself is undiscovered.
+
+        Args:
+            coordinate (Coordinate): The coordinate of the tile.
+
+        Returns:
+            Set[Coordinate]: The undiscovered coordinates.
+        """
+        icon = self._grid.icon
+        return {
+            nearby
+            for nearby in (coordinate, *coordinate.cardinals())
+            if icon(nearby) is None
+        }
 
     def _track_mineral(self, icon: Icon, coordinate: Coordinate) -> None:
         if icon == Icon.MINERAL and coordinate not in self.tasked_minerals:
             self.untasked_minerals.add(coordinate)
 
-    def task_miner(self, miner: Drone) -> None:
-        """Task the miner with mining an available mineral.
+    def task_miner(self, miner: Drone) -> bool:
+        """Task the miner with mining the closest available mineral.
 
         The miner will have their path variable set, and the mineral
         they are tasked with will be removed from the untasked_minerals
@@ -169,10 +767,81 @@ class Map:
 
         Args:
             miner (Drone): The miner to task.
+
+        Returns:
+            bool: Whether there was a mineral for the miner.
+        """
+        return bool(self.assign_miners([miner]))
+
+    def assign_miners(
+        self, miners: Sequence[Drone], optimal: bool = False
+    ) -> List[Drone]:
+        """Task a batch of idle miners with the closest minerals.
+
+        Miners start at the origin, so the cheapest minerals to reach are
+        found by walking the mineral index outwards from it, until no mineral
+        left can be cheaper than those found. A miner is only matched with a
+        mineral if it would survive the acid on the way there and back. The
+        cheapest pairs are taken first, unless optimal is set and the batch
+        is at most OPTIMAL_BATCH miners, in which case the total cost of the
+        batch is minimized.
+
+        Args:
+            miners (Sequence[Drone]): The idle miners.
+            optimal (bool, optional): Whether to minimize the total cost of
+                small batches. Defaults to False.
+
+        Returns:
+            List[Drone]: The miners that were tasked, closest first.
         """
-        mineral = self.untasked_minerals.pop()
-        self.tasked_minerals.add(mineral)
-        miner.path = self.dijkstra(self.origin, mineral)
+        if not miners or not self.untasked_minerals:
+            return []
+        paths = self._nearest_mineral_paths(
+            len(miners) * self.MINERAL_CANDIDATES
+        )
+        costs = [
+            [self._mining_cost(miner, path) for path in paths]
+            for miner in miners
+        ]
+        if optimal and len(miners) <= self.OPTIMAL_BATCH:
+            pairs = optimal_assignment(costs)
+        else:
+            pairs = greedy_assignment(costs)
+        tasked = []
+        for row, col in pairs:
+            mineral = paths[col][-1]
+            self.untasked_minerals.discard(mineral)
+            self.tasked_minerals.add(mineral)
+            miners[row].path = paths[col][:]
+            tasked.append(miners[row])
+        return tasked
+
+    def _nearest_mineral_paths(self, count: int) -> List[List[Coordinate]]:
+        """Return paths from the origin to the cheapest untasked minerals."""
+        # a path never costs less than the manhattan distance, so the walk
+        # stops once that alone exceeds the most expensive path kept
+        found: List[Tuple[int, int, List[Coordinate]]] = []
+        order = counter()
+        for bound, mineral in self.untasked_minerals.nearest(self.origin):
+            if len(found) == count and bound >= -found[0][0]:
+                break
+            if not (path := self.path_from_origin(mineral)):
+                continue
+            cost = sum(self.terrain_weight(coord) or 1 for coord in path[1:])
+            entry = (-cost, next(order), path)
+            if len(found) < count:
+                heappush(found, entry)
+            elif cost < -found[0][0]:
+                heapreplace(found, entry)
+        return [path for _, _, path in sorted(found, reverse=True)]
+
+    def _mining_cost(self, miner: Drone, path: List[Coordinate]) -> float:
+        """Return the ticks for a miner to reach a mineral, if it can."""
+        acid = sum(self._grid.icon(coord) == Icon.ACID for coord in path)
+        if 2 * acid * Icon.ACID.health_cost() >= miner.health:
+            return INFINITY
+        cost = sum(self.terrain_weight(coord) or 1 for coord in path[1:])
+        return cost / miner.moves
 
     @overload
     def get(
@@ -210,11 +879,19 @@ class Map:
             List[Tile]: The unexplored tile list.
         """
         return [
-            tile
-            for tile in self._stored_tiles_.values()
-            if not tile.discovered
+            GridTile(self._grid, coordinate, self._store_icon)
+            for coordinate in self._grid.coordinates(Grid.UNDISCOVERED)
         ]
 
+    def tiles(self) -> Iterator[Tile]:
+        """Iterate over every tile stored in the map.
+
+        Yields:
+            Tile: A view of a stored tile.
+        """
+        for coordinate in self._grid.coordinates():
+            yield GridTile(self._grid, coordinate, self._store_icon)
+
     def __getitem__(self, key: Union[Tile, Coordinate]) -> Tile:
         """Get the tile with the specified coordinates from the map.
 
@@ -232,7 +909,9 @@ class Map:
         """
         if isinstance(key, Tile):
             key = key.coordinate
-        return self._stored_tiles_[key]
+        if key not in self._grid:
+            raise KeyError(key)
+        return GridTile(self._grid, key, self._store_icon)
 
     def __iter__(self):
         """Iterate over this map.
@@ -240,7 +919,7 @@ class Map:
         Yields:
             _type_: The iterator.
         """
-        yield from self._stored_tiles_
+        yield from self._grid.coordinates()
 
     def __repr__(self) -> str:
         """Return a representation of this object.
@@ -250,4 +929,4 @@ class Map:
         Returns:
             str: The string representation of this object.
         """
-        return f"Map({list(self._stored_tiles_)})"
+        return f"Map({list(self)})"
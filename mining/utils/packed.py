@@ -0,0 +1,124 @@
+"""Coordinates packed into single integers, for the inner loops of searches.
+
+A packed key is ``y * STRIDE + x``, so the neighbours of a key are found by
+adding fixed offsets, and keys hash and compare as plain integers instead of
+as tuples. Coordinates from -HALF up to HALF - 1 on both axes can be packed.
+Searches run on keys internally, and only turn the paths they return back
+into Coordinates.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Tuple
+
+SHIFT = 32
+STRIDE = 1 << SHIFT
+HALF = STRIDE >> 1
+# the offsets of the cardinal neighbours of a key, north, south, east, west
+OFFSETS: Tuple[int, int, int, int] = (-STRIDE, STRIDE, 1, -1)
+# direction names by the offset of a neighbour
+DIRECTIONS: Dict[int, str] = {
+    -STRIDE: "north",
+    STRIDE: "south",
+    1: "east",
+    -1: "west",
+    0: "center",
+}
+
+
+def pack(x: int, y: int) -> int:
+    """Pack the x and y values of a coordinate into a key.
+
+    Args:
+        x (int): The x value.
+        y (int): The y value.
+
+    Returns:
+        int: The key.
+    """
+    return y * STRIDE + x
+
+
+def unpack(key: int) -> Tuple[int, int]:
+    """Return the x and y values packed into a key.
+
+    Args:
+        key (int): The key.
+
+    Returns:
+        Tuple[int, int]: The x and y values.
+    """
+    y, x = divmod(key + HALF, STRIDE)
+    return x - HALF, y
+
+
+def coordinate(key: int) -> Coordinate:
+    """Return the coordinate packed into a key.
+
+    Args:
+        key (int): The key.
+
+    Returns:
+        Coordinate: The coordinate.
+    """
+    y, x = divmod(key + HALF, STRIDE)
+    return Coordinate(x - HALF, y)
+
+
+def coordinates(keys: Iterable[int]) -> List[Coordinate]:
+    """Return the coordinates packed into keys, such as a path.
+
+    Args:
+        keys (Iterable[int]): The keys.
+
+    Returns:
+        List[Coordinate]: The coordinates, in the same order.
+    """
+    return [coordinate(key) for key in keys]
+
+
+def neighbors(key: int) -> Tuple[int, int, int, int]:
+    """Return the keys of the cardinal neighbours of a key.
+
+    Args:
+        key (int): The key.
+
+    Returns:
+        Tuple[int, int, int, int]: The neighbours to the north, south, east
+            and west.
+    """
+    return (key - STRIDE, key + STRIDE, key + 1, key - 1)
+
+
+def direction(key: int, neighbor: int) -> str:
+    """Return the direction of a neighbouring key.
+
+    Args:
+        key (int): The key.
+        neighbor (int): A cardinal neighbour of the key, or the key itself.
+
+    Returns:
+        str: The direction, as Coordinate.direction names it, or an empty
+            string if the keys are not neighbours.
+    """
+    return DIRECTIONS.get(neighbor - key, "")
+
+
+def distance(key: int, other: int) -> int:
+    """Return the manhattan distance between two keys.
+
+    Args:
+        key (int): The first key.
+        other (int): The second key.
+
+    Returns:
+        int: The distance along the grid.
+    """
+    y, x = divmod(key + HALF, STRIDE)
+    other_y, other_x = divmod(other + HALF, STRIDE)
+    return abs(x - other_x) + abs(y - other_y)
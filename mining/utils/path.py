@@ -0,0 +1,229 @@
+"""A path that is walked by moving a cursor along an array of coordinates."""
+
+from __future__ import annotations
+
+from array import array
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, List, Optional
+
+
+class Path:
+    """A path that is walked by moving a cursor along an array of coordinates.
+
+    The coordinates of the whole path, walked and ahead, are kept as packed
+    x, y pairs. The cursor splits them into the steps ahead, with the
+    destination last, and the steps traveled, with the most recent first.
+    Taking a step, taking it back and turning around only move the cursor
+    or flip its heading, so none of them copy the path.
+
+    Indexing, iterating and the length of a path are those of the steps
+    ahead, and a path is equal to any sequence of the same steps ahead.
+    """
+
+    __slots__ = ("_coordinates", "_cursor", "_heading")
+
+    def __init__(self, coordinates: Iterable[Coordinate] = ()) -> None:
+        """Initialize a path with nothing traveled yet.
+
+        Args:
+            coordinates (Iterable[Coordinate], optional): The steps ahead,
+                with the destination last. Defaults to an empty path.
+        """
+        self._coordinates = array("i", chain.from_iterable(coordinates))
+        self._cursor = 0
+        # 1 while heading to the end of the array, -1 while heading back
+        self._heading = 1
+
+    @classmethod
+    def resume(
+        cls, ahead: Iterable[Coordinate], traveled: Iterable[Coordinate]
+    ) -> Path:
+        """Create a path that has been partly traveled.
+
+        Args:
+            ahead (Iterable[Coordinate]): The steps ahead, with the
+                destination last.
+            traveled (Iterable[Coordinate]): The steps traveled, with the
+                most recent first.
+
+        Returns:
+            Path: The path.
+        """
+        path = cls(reversed(list(traveled)))
+        path._cursor = len(path._coordinates) // 2
+        path._coordinates.extend(chain.from_iterable(ahead))
+        return path
+
+    def _index(self, step: int) -> int:
+        """Return the array index of the x value of a step ahead."""
+        if self._heading > 0:
+            return 2 * (self._cursor + step)
+        return 2 * (self._cursor - 1 - step)
+
+    def __len__(self) -> int:
+        """Return the number of steps ahead."""
+        if self._heading > 0:
+            return len(self._coordinates) // 2 - self._cursor
+        return self._cursor
+
+    def __getitem__(self, step: int) -> Coordinate:
+        """Return a step ahead, the next step being 0.
+
+        Args:
+            step (int): The step, negative steps counting back from the
+                destination.
+
+        Raises:
+            IndexError: If there is no such step ahead.
+
+        Returns:
+            Coordinate: The coordinate of the step.
+        """
+        length = len(self)
+        if step < 0:
+            step += length
+        if not 0 <= step < length:
+            raise IndexError("Path index out of range")
+        index = self._index(step)
+        coordinates = self._coordinates
+        return Coordinate(coordinates[index], coordinates[index + 1])
+
+    def __iter__(self) -> Iterator[Coordinate]:
+        """Iterate over the steps ahead, ending with the destination."""
+        coordinates, heading = self._coordinates, self._heading
+        index = self._index(0)
+        for _ in range(len(self)):
+            yield Coordinate(coordinates[index], coordinates[index + 1])
+            index += 2 * heading
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether another path or sequence has the same steps ahead.
+
+        Args:
+            other (object): The other path or sequence.
+
+        Returns:
+            bool: True if the steps ahead are the same.
+        """
+        try:
+            return len(self) == len(other) and all(
+                step == other_step for step, other_step in zip(self, other)
+            )
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Return the string representation of the steps ahead."""
+        return f"Path({list(self)})"
+
+    @property
+    def destination(self) -> Optional[Coordinate]:
+        """The last step ahead, or None if there is none."""
+        return self[-1] if len(self) else None
+
+    @property
+    def previous(self) -> Optional[Coordinate]:
+        """The step traveled most recently, or None if there is none."""
+        coordinates, cursor = self._coordinates, self._cursor
+        if self._heading > 0:
+            if not cursor:
+                return None
+            return Coordinate(
+                coordinates[2 * cursor - 2], coordinates[2 * cursor - 1]
+            )
+        if 2 * cursor == len(coordinates):
+            return None
+        return Coordinate(coordinates[2 * cursor], coordinates[2 * cursor + 1])
+
+    def traveled(self) -> List[Coordinate]:
+        """Return the steps traveled, with the most recent first.
+
+        Returns:
+            List[Coordinate]: The steps traveled.
+        """
+        self.reverse()
+        try:
+            return list(self)
+        finally:
+            self.reverse()
+
+    def advance(self) -> Coordinate:
+        """Take the next step, which becomes the most recent step traveled.
+
+        Raises:
+            IndexError: If there is no step ahead.
+
+        Returns:
+            Coordinate: The step taken.
+        """
+        step = self[0]
+        self._cursor += self._heading
+        return step
+
+    def rewind(self) -> Coordinate:
+        """Take back the most recent step, which becomes the next step.
+
+        Raises:
+            IndexError: If no step has been traveled.
+
+        Returns:
+            Coordinate: The step taken back.
+        """
+        self.reverse()
+        try:
+            return self.advance()
+        finally:
+            self.reverse()
+
+    def reverse(self) -> None:
+        """Turn around, so the steps traveled are the steps ahead.
+
+        The steps ahead become the steps traveled, the next step first.
+        """
+        self._heading = -self._heading
+
+    def skip(self) -> Coordinate:
+        """Drop the next step without traveling it.
+
+        Only the steps between it and the end of the array are moved, so
+        dropping the last step ahead copies nothing.
+
+        Raises:
+            IndexError: If there is no step ahead.
+
+        Returns:
+            Coordinate: The step dropped.
+        """
+        step = self[0]
+        index = self._index(0)
+        del self._coordinates[index : index + 2]
+        if self._heading < 0:
+            self._cursor -= 1
+        return step
+
+    def replace_ahead(self, coordinates: Iterable[Coordinate]) -> None:
+        """Replace the steps ahead, keeping the steps traveled.
+
+        Args:
+            coordinates (Iterable[Coordinate]): The new steps ahead, with
+                the destination last.
+        """
+        if self._heading < 0:
+            # lay the steps traveled out forward again, before the cursor
+            traveled = self.traveled()
+            self._coordinates = array(
+                "i", chain.from_iterable(reversed(traveled))
+            )
+            self._cursor = len(traveled)
+            self._heading = 1
+        else:
+            del self._coordinates[2 * self._cursor :]
+        self._coordinates.extend(chain.from_iterable(coordinates))
+
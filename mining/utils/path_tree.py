@@ -0,0 +1,225 @@
+"""A shortest path tree from a single root, kept up to date incrementally."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING
+
+from .search import build_path
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Set, Tuple
+
+    from .coordinate import Coordinate
+    from .search import WeightFunction
+
+INFINITY = float("inf")
+
+
+class ShortestPathTree:
+    """The cheapest paths from a root to every reachable coordinate.
+
+    Changed coordinates are collected with notify and applied on the next
+    query. Cheaper or newly pathable tiles continue the Dijkstra search from
+    where they join the tree; tiles that got more expensive invalidate only
+    their own subtree, which is then rebuilt from its surroundings.
+    """
+
+    def __init__(self, weight: WeightFunction, root: Coordinate) -> None:
+        """Initialize the tree and search it from the root.
+
+        Args:
+            weight (WeightFunction): Cost of entering a coordinate. It must
+                only change for coordinates passed to notify.
+            root (Coordinate): The coordinate every path starts at.
+        """
+        self._weight = weight
+        self.root = root
+        self._distance: Dict[Coordinate, float] = {root: 0}
+        self._parent: Dict[Coordinate, Coordinate] = {}
+        self._children: Dict[Coordinate, Set[Coordinate]] = {}
+        self._changed: Set[Coordinate] = set()
+        self._heap: List[Tuple[float, Coordinate]] = [(0, root)]
+        self._search()
+
+    @classmethod
+    def restore(
+        cls,
+        weight: WeightFunction,
+        root: Coordinate,
+        parents: Dict[Coordinate, Tuple[Coordinate, float]],
+        changed: Iterable[Coordinate] = (),
+    ) -> ShortestPathTree:
+        """Rebuild a saved tree without searching again.
+
+        Ties between paths of equal cost are kept as they were, which a new
+        search would not guarantee.
+
+        Args:
+            weight (WeightFunction): Cost of entering a coordinate.
+            root (Coordinate): The coordinate every path starts at.
+            parents (Dict[Coordinate, Tuple[Coordinate, float]]): The parent
+                and distance of every coordinate in the tree but the root.
+            changed (Iterable[Coordinate], optional): Coordinates notified
+                since the last query. Defaults to none.
+
+        Returns:
+            ShortestPathTree: The tree.
+        """
+        tree = cls.__new__(cls)
+        tree._weight = weight
+        tree.root = root
+        tree._distance = {root: 0}
+        tree._parent = {}
+        tree._children = {}
+        for coordinate, (parent, distance) in parents.items():
+            tree._distance[coordinate] = distance
+            tree._parent[coordinate] = parent
+            tree._children.setdefault(parent, set()).add(coordinate)
+        tree._changed = set(changed)
+        tree._heap = []
+        return tree
+
+    def state(
+        self,
+    ) -> Tuple[Dict[Coordinate, Tuple[Coordinate, float]], Set[Coordinate]]:
+        """Return what restore needs to rebuild the tree.
+
+        Returns:
+            Tuple[Dict[Coordinate, Tuple[Coordinate, float]], Set[Coordinate]]:
+                The parent and distance of every coordinate but the root,
+                and the coordinates notified since the last query.
+        """
+        distance = self._distance
+        parents = {
+            coordinate: (parent, distance[coordinate])
+            for coordinate, parent in self._parent.items()
+        }
+        return parents, set(self._changed)
+
+    def notify(self, coordinate: Coordinate) -> None:
+        """Record that the weight of a coordinate has changed.
+
+        Args:
+            coordinate (Coordinate): The changed coordinate.
+        """
+        self._changed.add(coordinate)
+
+    def distance(self, coordinate: Coordinate) -> float:
+        """Return the cost of the cheapest path from the root.
+
+        Args:
+            coordinate (Coordinate): The end of the path.
+
+        Returns:
+            float: The cost, or infinity if the coordinate is unreachable.
+        """
+        self._refresh()
+        return self._distance.get(coordinate, INFINITY)
+
+    def path_to(self, coordinate: Coordinate) -> List[Coordinate]:
+        """Return the cheapest path from the root to a coordinate.
+
+        A coordinate that can not be entered, such as a mineral, is reached
+        through its cheapest neighbour in the tree.
+
+        Args:
+            coordinate (Coordinate): The end of the path.
+
+        Returns:
+            List[Coordinate]: The path including root and coordinate, or an
+                empty list if the coordinate is unreachable.
+        """
+        self._refresh()
+        if coordinate in self._distance:
+            return build_path(self._parent, coordinate)
+        neighbor = min(
+            coordinate.cardinals(),
+            key=lambda neighbor: self._distance.get(neighbor, INFINITY),
+        )
+        if neighbor not in self._distance:
+            return []
+        path = build_path(self._parent, neighbor)
+        path.append(coordinate)
+        return path
+
+    def path_from(self, coordinate: Coordinate) -> List[Coordinate]:
+        """Return the cheapest path from a coordinate back to the root.
+
+        Args:
+            coordinate (Coordinate): The start of the path.
+
+        Returns:
+            List[Coordinate]: The path including coordinate and root, or an
+                empty list if the coordinate is unreachable.
+        """
+        path = self.path_to(coordinate)
+        path.reverse()
+        return path
+
+    def _refresh(self) -> None:
+        """Apply changed coordinates to the tree."""
+        if not self._changed:
+            return
+        changed, self._changed = self._changed, set()
+        distance = self._distance
+        for coordinate in changed:
+            if coordinate == self.root or coordinate not in distance:
+                continue
+            cost = self._weight(coordinate)
+            parent_distance = distance[self._parent[coordinate]]
+            if cost is None or parent_distance + cost > distance[coordinate]:
+                self._invalidate(coordinate)
+        for coordinate in changed:
+            self._relax_from_neighbors(coordinate)
+        self._search()
+
+    def _invalidate(self, coordinate: Coordinate) -> None:
+        """Remove a subtree and seed its tiles from their surroundings."""
+        removed = []
+        stack = [coordinate]
+        while stack:
+            node = stack.pop()
+            removed.append(node)
+            del self._distance[node]
+            stack.extend(self._children.pop(node, ()))
+        self._children[self._parent[coordinate]].discard(coordinate)
+        for node in removed:
+            del self._parent[node]
+        for node in removed:
+            self._relax_from_neighbors(node)
+
+    def _relax_from_neighbors(self, coordinate: Coordinate) -> None:
+        """Offer a coordinate the cheapest path through its neighbours."""
+        if coordinate == self.root:
+            return
+        if (cost := self._weight(coordinate)) is None:
+            return
+        for neighbor in coordinate.cardinals():
+            if (neighbor_distance := self._distance.get(neighbor)) is not None:
+                self._relax(neighbor, coordinate, neighbor_distance + cost)
+
+    def _relax(
+        self, parent: Coordinate, coordinate: Coordinate, distance: float
+    ) -> None:
+        if distance >= self._distance.get(coordinate, INFINITY):
+            return
+        if (old_parent := self._parent.get(coordinate)) is not None:
+            self._children[old_parent].discard(coordinate)
+        self._distance[coordinate] = distance
+        self._parent[coordinate] = parent
+        self._children.setdefault(parent, set()).add(coordinate)
+        heappush(self._heap, (distance, coordinate))
+
+    def _search(self) -> None:
+        """Continue the Dijkstra search until the queue is empty."""
+        heap, distance, weight = self._heap, self._distance, self._weight
+        while heap:
+            node_distance, node = heappop(heap)
+            if node_distance != distance.get(node):
+                continue
+            for neighbor in node.cardinals():
+                if neighbor == self.root:
+                    continue
+                if (cost := weight(neighbor)) is not None:
+                    self._relax(node, neighbor, node_distance + cost)
@@ -0,0 +1,172 @@
+"""Incremental path repair with the D* Lite algorithm."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .search import manhattan
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Set, Tuple
+
+    from .coordinate import Coordinate
+    from .search import WeightFunction
+
+    Key = Tuple[float, float]
+
+INFINITY = float("inf")
+
+
+class PathRepairer:
+    """Keeps D* Lite search state for a path so that it can be repaired.
+
+    The search runs backwards from the goal, so the start is free to move as
+    the drone travels. When tiles change, only the part of the search that
+    depends on them is recomputed on the next repair.
+    """
+
+    def __init__(
+        self,
+        weight: WeightFunction,
+        start: Coordinate,
+        goal: Coordinate,
+        goal_weight: int = 1,
+    ) -> None:
+        """Initialize the repairer.
+
+        Args:
+            weight (WeightFunction): Cost of entering a coordinate. It must
+                only change for coordinates passed to notify.
+            start (Coordinate): Where the path starts.
+            goal (Coordinate): Where the path ends.
+            goal_weight (int, optional): Cost of entering the goal if it is
+                otherwise not enterable. Defaults to 1.
+        """
+        self._weight = weight
+        self._goal_weight = goal_weight
+        self._start = start
+        self._last_start = start
+        self.goal = goal
+        self._key_modifier = 0
+        self._g: Dict[Coordinate, float] = {}
+        self._rhs: Dict[Coordinate, float] = {goal: 0}
+        self._open: Dict[Coordinate, Key] = {}
+        self._heap: List[Tuple[Key, int, Coordinate]] = []
+        self._tie_breaker = count()
+        self._changed: Set[Coordinate] = set()
+        self._push(goal)
+
+    def notify(self, coordinate: Coordinate) -> None:
+        """Record that the weight of a coordinate has changed.
+
+        Args:
+            coordinate (Coordinate): The changed coordinate.
+        """
+        self._changed.add(coordinate)
+
+    def repair(self, start: Coordinate) -> List[Coordinate]:
+        """Move the start of the path and repair it around changed tiles.
+
+        Args:
+            start (Coordinate): The new start of the path.
+
+        Returns:
+            List[Coordinate]: The cheapest path including start and goal, or
+                an empty list if the goal cannot be reached.
+        """
+        if start != self._start:
+            self._key_modifier += manhattan(self._last_start, start)
+            self._last_start = self._start = start
+        changed, self._changed = self._changed, set()
+        for coordinate in changed:
+            self._update_vertex(coordinate)
+            for neighbor in coordinate.cardinals():
+                self._update_vertex(neighbor)
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    def _cost(self, coordinate: Coordinate) -> float:
+        if (cost := self._weight(coordinate)) is None:
+            return self._goal_weight if coordinate == self.goal else INFINITY
+        return cost
+
+    def _key(self, coordinate: Coordinate) -> Key:
+        best = min(
+            self._g.get(coordinate, INFINITY),
+            self._rhs.get(coordinate, INFINITY),
+        )
+        return (
+            best + manhattan(self._start, coordinate) + self._key_modifier,
+            best,
+        )
+
+    def _push(self, coordinate: Coordinate) -> None:
+        key = self._key(coordinate)
+        self._open[coordinate] = key
+        heappush(self._heap, (key, next(self._tie_breaker), coordinate))
+
+    def _top_key(self) -> Key:
+        """Return the smallest key in the queue, dropping stale entries."""
+        heap = self._heap
+        while heap and self._open.get(heap[0][2]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0] if heap else (INFINITY, INFINITY)
+
+    def _update_vertex(self, coordinate: Coordinate) -> None:
+        if coordinate != self.goal:
+            if coordinate != self._start and self._weight(coordinate) is None:
+                # nothing can pass through this tile
+                rhs = INFINITY
+            else:
+                rhs = min(
+                    self._cost(neighbor) + self._g.get(neighbor, INFINITY)
+                    for neighbor in coordinate.cardinals()
+                )
+            self._rhs[coordinate] = rhs
+        self._open.pop(coordinate, None)
+        if self._g.get(coordinate, INFINITY) != self._rhs.get(
+            coordinate, INFINITY
+        ):
+            self._push(coordinate)
+
+    def _compute_shortest_path(self) -> None:
+        g, rhs, start = self._g, self._rhs, self._start
+        while self._top_key() < self._key(start) or g.get(
+            start, INFINITY
+        ) != rhs.get(start, INFINITY):
+            if not self._heap:
+                break
+            old_key, _, node = heappop(self._heap)
+            del self._open[node]
+            if old_key < (new_key := self._key(node)):
+                self._open[node] = new_key
+                heappush(self._heap, (new_key, next(self._tie_breaker), node))
+            elif g.get(node, INFINITY) > rhs.get(node, INFINITY):
+                g[node] = rhs[node]
+                for neighbor in node.cardinals():
+                    self._update_vertex(neighbor)
+            else:
+                g[node] = INFINITY
+                self._update_vertex(node)
+                for neighbor in node.cardinals():
+                    self._update_vertex(neighbor)
+
+    def _extract_path(self) -> List[Coordinate]:
+        node = self._start
+        if self._g.get(node, INFINITY) == INFINITY:
+            return []
+        path = [node]
+        visited = {node}
+        while node != self.goal:
+            node = min(
+                node.cardinals(),
+                key=lambda neighbor: self._cost(neighbor)
+                + self._g.get(neighbor, INFINITY),
+            )
+            if node in visited:
+                return []
+            visited.add(node)
+            path.append(node)
+        return path
@@ -0,0 +1,238 @@
+"""Space-time reservations, for planning drone paths around each other."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .search import build_path, manhattan
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Tuple, Union
+
+    from .coordinate import Coordinate
+    from .search import WeightFunction
+
+    CellKey = Tuple[Coordinate, int]
+    EdgeKey = Tuple[Coordinate, Coordinate, int]
+    State = Tuple[Coordinate, int]
+
+
+class ReservationTable:
+    """Which drone holds each tile at each tick.
+
+    A drone's path is reserved tick by tick, as well as every move between
+    two tiles, so later paths can be planned to neither share a tile nor
+    swap places with it. Looking up a tile at a tick is a single dict look
+    up. The table keeps its own clock; reservations fall away once their
+    tick has passed.
+    """
+
+    # extra steps a planned path may spend waiting for other drones
+    WAIT_SLACK = 8
+    # nodes a plan may expand per step of the path being planned
+    EXPANSION_FACTOR = 16
+
+    def __init__(self) -> None:
+        """Initialize an empty table at tick 0."""
+        self.tick = 0
+        self._cells: Dict[CellKey, int] = {}
+        self._edges: Dict[EdgeKey, int] = {}
+        self._by_drone: Dict[int, List[Union[CellKey, EdgeKey]]] = {}
+        self._by_tick: Dict[int, List[Union[CellKey, EdgeKey]]] = {}
+
+    def advance(self) -> None:
+        """Move the clock to the next tick, dropping the past tick."""
+        for key in self._by_tick.pop(self.tick, ()):
+            if len(key) == 2:
+                self._cells.pop(key, None)
+            else:
+                self._edges.pop(key, None)
+        self.tick += 1
+
+    def owner(self, coordinate: Coordinate, tick: int) -> Optional[int]:
+        """Return the id of the drone holding a tile at a tick.
+
+        Args:
+            coordinate (Coordinate): The tile.
+            tick (int): The tick.
+
+        Returns:
+            Optional[int]: The drone's id, or None if the tile is free.
+        """
+        return self._cells.get((coordinate, tick))
+
+    def is_free(
+        self, coordinate: Coordinate, tick: int, drone_id: int
+    ) -> bool:
+        """Return whether a drone may hold a tile at a tick.
+
+        Args:
+            coordinate (Coordinate): The tile.
+            tick (int): The tick.
+            drone_id (int): The drone's id.
+
+        Returns:
+            bool: True if the tile is free, or held by the drone itself.
+        """
+        return self._cells.get((coordinate, tick), drone_id) == drone_id
+
+    def can_move(
+        self,
+        origin: Coordinate,
+        target: Coordinate,
+        tick: int,
+        drone_id: int,
+    ) -> bool:
+        """Return whether a drone may move between two tiles at a tick.
+
+        The move is blocked if the target is held, or if another drone is
+        moving the opposite way at the same tick.
+
+        Args:
+            origin (Coordinate): The tile moved from.
+            target (Coordinate): The tile moved to.
+            tick (int): The tick the target is reached.
+            drone_id (int): The drone's id.
+
+        Returns:
+            bool: Whether the move is free of conflicts.
+        """
+        return self.is_free(target, tick, drone_id) and (
+            self._edges.get((target, origin, tick), drone_id) == drone_id
+        )
+
+    def reserve(
+        self, drone_id: int, path: List[Coordinate], moves: int = 1
+    ) -> None:
+        """Reserve a path for a drone, replacing its previous reservation.
+
+        The first tile of the path is held at the current tick, and the
+        drone takes moves steps of the path every tick. A repeated tile is a
+        step spent waiting.
+
+        Args:
+            drone_id (int): The drone's id.
+            path (List[Coordinate]): The path, from the drone's position.
+            moves (int, optional): Steps the drone takes per tick. Defaults
+                to 1.
+        """
+        self.release(drone_id)
+        keys = self._by_drone[drone_id] = []
+        previous = None
+        for step, coordinate in enumerate(path):
+            tick = self.tick + step // moves
+            cell = (coordinate, tick)
+            self._cells[cell] = drone_id
+            keys.append(cell)
+            self._by_tick.setdefault(tick, []).append(cell)
+            if previous is not None and previous != coordinate:
+                edge = (previous, coordinate, tick)
+                self._edges[edge] = drone_id
+                keys.append(edge)
+                self._by_tick[tick].append(edge)
+            previous = coordinate
+
+    def release(self, drone_id: int) -> None:
+        """Drop every reservation a drone holds.
+
+        Args:
+            drone_id (int): The drone's id.
+        """
+        for key in self._by_drone.pop(drone_id, ()):
+            table = self._cells if len(key) == 2 else self._edges
+            if table.get(key) == drone_id:
+                del table[key]
+
+    def __contains__(self, drone_id: object) -> bool:
+        return drone_id in self._by_drone
+
+    def plan(
+        self,
+        drone_id: int,
+        start: Coordinate,
+        goal: Coordinate,
+        weight: WeightFunction,
+        horizon: int,
+        moves: int = 1,
+        goal_weight: int = 1,
+    ) -> List[Coordinate]:
+        """Find a path that keeps clear of every other drone's reservations.
+
+        This is A* over tiles and steps, where a drone may also wait on its
+        tile for a step, which costs as much as walking onto an empty tile.
+        The search gives up after a number of expansions proportional to
+        the horizon, so a goal boxed in by other drones fails quickly.
+
+        Args:
+            drone_id (int): The drone's id.
+            start (Coordinate): Where the drone is at the current tick.
+            goal (Coordinate): Where the path ends, enterable as in astar.
+            weight (WeightFunction): Cost of entering a coordinate.
+            horizon (int): The most steps the path may take.
+            moves (int, optional): Steps the drone takes per tick. Defaults
+                to 1.
+            goal_weight (int, optional): Cost of entering a goal that is
+                otherwise not enterable. Defaults to 1.
+
+        Returns:
+            List[Coordinate]: The path from start to goal, with a repeated
+                tile for each step spent waiting, or an empty list if no
+                path was found.
+        """
+        first_tick = self.tick
+        budget = horizon * self.EXPANSION_FACTOR
+        start_state: State = (start, 0)
+        g_score: Dict[State, int] = {start_state: 0}
+        parents: Dict[State, State] = {}
+        closed = set()
+        tie_breaker = count()
+        heuristic = manhattan(start, goal)
+        heap: List[Tuple[int, int, int, State]] = [
+            (heuristic, heuristic, next(tie_breaker), start_state)
+        ]
+        while heap and budget:
+            _, _, _, state = heappop(heap)
+            coordinate, step = state
+            if coordinate == goal:
+                return [
+                    coordinate for coordinate, _ in build_path(parents, state)
+                ]
+            if state in closed or step >= horizon:
+                continue
+            closed.add(state)
+            budget -= 1
+            tick = first_tick + (step + 1) // moves
+            score = g_score[state]
+            for neighbor in (*coordinate.cardinals(), coordinate):
+                if neighbor == coordinate:
+                    cost = 1
+                    if not self.is_free(neighbor, tick, drone_id):
+                        continue
+                else:
+                    if (cost := weight(neighbor)) is None:
+                        if neighbor != goal:
+                            continue
+                        cost = goal_weight
+                    if not self.can_move(coordinate, neighbor, tick, drone_id):
+                        continue
+                next_state = (neighbor, step + 1)
+                if next_state in closed:
+                    continue
+                new_score = score + cost
+                if new_score >= g_score.get(next_state, new_score + 1):
+                    continue
+                g_score[next_state] = new_score
+                parents[next_state] = state
+                heuristic = manhattan(neighbor, goal)
+                heappush(
+                    heap,
+                    (
+                        new_score + heuristic,
+                        heuristic,
+                        next(tie_breaker),
+                        next_state,
+                    ),
+                )
+        return []
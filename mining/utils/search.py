@@ -0,0 +1,412 @@
+"""Heap based path searches over a weighted grid of coordinates."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .coordinate import Coordinate
+from .packed import HALF, OFFSETS, STRIDE, coordinate, coordinates, pack
+
+if TYPE_CHECKING:
+    from typing import AbstractSet, Callable, Dict, List, Optional, Tuple
+
+    WeightFunction = Callable[[Coordinate], Optional[int]]
+    PackedWeightFunction = Callable[[int], Optional[int]]
+    Step = Tuple[int, int]
+
+# the weight of tiles that jump point search can skip over
+UNIFORM_WEIGHT = 1
+HORIZONTAL: Tuple[Step, ...] = ((1, 0), (-1, 0))
+ALL_STEPS: Tuple[Step, ...] = ((0, -1), (0, 1), (1, 0), (-1, 0))
+
+
+def manhattan(start: Coordinate, end: Coordinate) -> int:
+    """Return the manhattan distance between two coordinates.
+
+    Args:
+        start (Coordinate): The first coordinate.
+        end (Coordinate): The second coordinate.
+
+    Returns:
+        int: The distance along the grid between both coordinates.
+    """
+    return abs(start.x - end.x) + abs(start.y - end.y)
+
+
+def astar(
+    start: Coordinate,
+    end: Coordinate,
+    weight: WeightFunction,
+    goal_weight: int = 1,
+) -> List[Coordinate]:
+    """Find the cheapest path between two points with the A* algorithm.
+
+    The weight function returns the cost of entering a coordinate, or None
+    if the coordinate cannot be entered. The end coordinate is always
+    enterable; if the weight function rejects it, goal_weight is used as the
+    cost of the final step instead. This allows paths to end at tiles, such
+    as minerals, that a drone can reach but not walk through.
+
+    The search runs on packed keys, see packed_astar.
+
+    Args:
+        start (Coordinate): The start point for the search.
+        end (Coordinate): The end point for the search.
+        weight (WeightFunction): Cost of entering a coordinate.
+        goal_weight (int, optional): Cost of entering an end coordinate that
+            is otherwise not enterable. Defaults to 1.
+
+    Returns:
+        List[Coordinate]: The path, including start and end, or an empty
+            list if no path exists.
+    """
+    path = packed_astar(
+        pack(*start),
+        pack(*end),
+        lambda key: weight(coordinate(key)),
+        goal_weight,
+    )
+    return coordinates(path)
+
+
+def packed_astar(
+    start: int, end: int, weight: PackedWeightFunction, goal_weight: int = 1
+) -> List[int]:
+    """Find the cheapest path between two packed keys with A*.
+
+    This is astar on packed coordinate keys, with a weight function that
+    takes a key, so no coordinate is built for the tiles searched.
+
+    Ties between nodes with the same estimated cost are broken towards the
+    node closest to the end, then by insertion order, so nodes never have to
+    be compared with each other.
+
+    Args:
+        start (int): The key of the start point.
+        end (int): The key of the end point.
+        weight (PackedWeightFunction): Cost of entering a key.
+        goal_weight (int, optional): Cost of entering an end key that is
+            otherwise not enterable. Defaults to 1.
+
+    Returns:
+        List[int]: The keys of the path, including start and end, or an
+            empty list if no path exists.
+    """
+    if start == end:
+        return [start]
+    g_score: Dict[int, int] = {start: 0}
+    parents: Dict[int, int] = {}
+    closed = set()
+    tie_breaker = count()
+    end_y, end_x = divmod(end + HALF, STRIDE)
+    start_y, start_x = divmod(start + HALF, STRIDE)
+    heuristic = abs(start_x - end_x) + abs(start_y - end_y)
+    open_heap: List[Tuple[int, int, int, int]] = [
+        (heuristic, heuristic, next(tie_breaker), start)
+    ]
+    while open_heap:
+        _, _, _, node = heappop(open_heap)
+        if node == end:
+            return build_path(parents, end)
+        if node in closed:
+            continue
+        closed.add(node)
+        node_score = g_score[node]
+        for offset in OFFSETS:
+            neighbor = node + offset
+            if neighbor in closed:
+                continue
+            cost = weight(neighbor)
+            if cost is None:
+                if neighbor != end:
+                    continue
+                cost = goal_weight
+            score = node_score + cost
+            if score >= g_score.get(neighbor, score + 1):
+                continue
+            g_score[neighbor] = score
+            parents[neighbor] = node
+            y, x = divmod(neighbor + HALF, STRIDE)
+            heuristic = abs(x - end_x) + abs(y - end_y)
+            heappush(
+                open_heap,
+                (score + heuristic, heuristic, next(tie_breaker), neighbor),
+            )
+    return []
+
+
+def jump_point_search(
+    start: Coordinate,
+    end: Coordinate,
+    weight: WeightFunction,
+    goal_weight: int = 1,
+) -> List[Coordinate]:
+    """Find the cheapest path between two points with Jump Point Search.
+
+    Paths over tiles of uniform weight are only expanded where they have to
+    turn, which skips the many equally cheap paths across open ground.
+    Canonical paths move vertically before horizontally, so a horizontal
+    jump only stops where a wall or a more expensive tile forces a turn,
+    and a vertical jump stops where a horizontal jump from it would. Tiles
+    of any other weight, such as acid, are jump points themselves and are
+    expanded in every direction like in astar. The result costs the same as
+    an astar path, with the end enterable in the same way.
+
+    Args:
+        start (Coordinate): The start point for the search.
+        end (Coordinate): The end point for the search.
+        weight (WeightFunction): Cost of entering a coordinate.
+        goal_weight (int, optional): Cost of entering an end coordinate that
+            is otherwise not enterable. Defaults to 1.
+
+    Returns:
+        List[Coordinate]: The path, including start and end, or an empty
+            list if no path exists.
+    """
+    if start == end:
+        return [start]
+
+    def uniform(x: int, y: int) -> bool:
+        return weight(Coordinate(x, y)) == UNIFORM_WEIGHT
+
+    def forced(x: int, y: int, dx: int) -> List[Step]:
+        """Return the turns forced after a horizontal step onto x, y."""
+        turns = []
+        for dy in (-1, 1):
+            side = Coordinate(x, y + dy)
+            if not uniform(x - dx, y + dy) and (
+                side == end or weight(side) is not None
+            ):
+                turns.append((0, dy))
+        return turns
+
+    # the jump point found scanning a row from each tile, so that the
+    # scans from every tile of a vertical jump never repeat each other
+    row_scans: Dict[Tuple[int, int, int], Optional[Coordinate]] = {}
+
+    def scan(x: int, y: int, dx: int) -> Optional[Coordinate]:
+        """Return the next jump point along a row, if there is one."""
+        scanned = []
+        point = None
+        while (key := (x, y, dx)) not in row_scans:
+            scanned.append(key)
+            x += dx
+            coord = Coordinate(x, y)
+            if coord == end:
+                point = coord
+                break
+            if (step := weight(coord)) is None:
+                break
+            if step != UNIFORM_WEIGHT or forced(x, y, dx):
+                point = coord
+                break
+        else:
+            point = row_scans[key]
+        for key in scanned:
+            row_scans[key] = point
+        return point
+
+    def jump(
+        x: int, y: int, dx: int, dy: int
+    ) -> Optional[Tuple[Coordinate, int]]:
+        """Step from x, y until a jump point, returning it and its cost."""
+        if dx:
+            if (coord := scan(x, y, dx)) is None:
+                return None
+            last = weight(coord)
+            if last is None:
+                last = goal_weight
+            return coord, abs(coord.x - x) - 1 + last
+        cost = 0
+        while True:
+            y += dy
+            coord = Coordinate(x, y)
+            step = weight(coord)
+            if coord == end:
+                return coord, cost + (goal_weight if step is None else step)
+            if step is None:
+                return None
+            cost += step
+            if (
+                step != UNIFORM_WEIGHT
+                or scan(x, y, 1) is not None
+                or scan(x, y, -1) is not None
+            ):
+                return coord, cost
+
+    g_score: Dict[Coordinate, int] = {start: 0}
+    parents: Dict[Coordinate, Coordinate] = {}
+    arrivals: Dict[Coordinate, Step] = {}
+    closed = set()
+    tie_breaker = count()
+    heuristic = manhattan(start, end)
+    open_heap: List[Tuple[int, int, int, Coordinate]] = [
+        (heuristic, heuristic, next(tie_breaker), start)
+    ]
+    while open_heap:
+        _, _, _, node = heappop(open_heap)
+        if node == end:
+            return _fill_jumps(build_path(parents, end))
+        if node in closed:
+            continue
+        closed.add(node)
+        node_score = g_score[node]
+        arrival = arrivals.get(node)
+        if arrival is None or weight(node) != UNIFORM_WEIGHT:
+            steps = ALL_STEPS
+        elif arrival[0]:
+            steps = (arrival, *forced(node.x, node.y, arrival[0]))
+        else:
+            steps = (arrival, *HORIZONTAL)
+        for dx, dy in steps:
+            if (found := jump(node.x, node.y, dx, dy)) is None:
+                continue
+            neighbor, cost = found
+            if neighbor in closed:
+                continue
+            score = node_score + cost
+            if score >= g_score.get(neighbor, score + 1):
+                continue
+            g_score[neighbor] = score
+            parents[neighbor] = node
+            arrivals[neighbor] = (dx, dy)
+            heuristic = manhattan(neighbor, end)
+            heappush(
+                open_heap,
+                (score + heuristic, heuristic, next(tie_breaker), neighbor),
+            )
+    return []
+
+
+def _fill_jumps(jump_points: List[Coordinate]) -> List[Coordinate]:
+    """Expand a path of jump points in straight lines into every tile."""
+    path = jump_points[:1]
+    for point in jump_points[1:]:
+        x, y = path[-1]
+        dx = (point.x > x) - (point.x < x)
+        dy = (point.y > y) - (point.y < y)
+        while (x, y) != point:
+            x += dx
+            y += dy
+            path.append(Coordinate(x, y))
+    return path
+
+
+def nearest_goals(
+    start: Coordinate,
+    goals: AbstractSet[Coordinate],
+    weight: WeightFunction,
+    limit: int = 1,
+    goal_weight: int = 1,
+) -> List[List[Coordinate]]:
+    """Find the cheapest paths to the closest of many goals in one search.
+
+    A single Dijkstra expansion is run from the start, and stops once the
+    limit of goals has been reached or no more tiles can be expanded. Goals
+    are enterable in the same way as the end of an astar search, but paths
+    are never continued through them. The search runs on packed keys, see
+    packed_nearest_goals.
+
+    Args:
+        start (Coordinate): The start point for the search.
+        goals (AbstractSet[Coordinate]): The coordinates to search for.
+        weight (WeightFunction): Cost of entering a coordinate.
+        limit (int, optional): The most paths to return. Defaults to 1.
+        goal_weight (int, optional): Cost of entering a goal that is
+            otherwise not enterable. Defaults to 1.
+
+    Returns:
+        List[List[Coordinate]]: Paths, including start and goal, ordered
+            from cheapest to most expensive.
+    """
+    paths = packed_nearest_goals(
+        pack(*start),
+        {pack(*goal) for goal in goals},
+        lambda key: weight(coordinate(key)),
+        limit,
+        goal_weight,
+    )
+    return [coordinates(path) for path in paths]
+
+
+def packed_nearest_goals(
+    start: int,
+    goals: AbstractSet[int],
+    weight: PackedWeightFunction,
+    limit: int = 1,
+    goal_weight: int = 1,
+) -> List[List[int]]:
+    """Find the cheapest paths to the closest of many packed keys.
+
+    This is nearest_goals on packed coordinate keys, with a weight function
+    that takes a key.
+
+    Args:
+        start (int): The key of the start point.
+        goals (AbstractSet[int]): The keys to search for.
+        weight (PackedWeightFunction): Cost of entering a key.
+        limit (int, optional): The most paths to return. Defaults to 1.
+        goal_weight (int, optional): Cost of entering a goal that is
+            otherwise not enterable. Defaults to 1.
+
+    Returns:
+        List[List[int]]: The keys of the paths, including start and goal,
+            ordered from cheapest to most expensive.
+    """
+    if not goals or limit < 1:
+        return []
+    g_score: Dict[int, int] = {start: 0}
+    parents: Dict[int, int] = {}
+    closed = set()
+    tie_breaker = count()
+    open_heap: List[Tuple[int, int, int]] = [(0, next(tie_breaker), start)]
+    paths: List[List[int]] = []
+    while open_heap:
+        node_score, _, node = heappop(open_heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        if node in goals:
+            paths.append(build_path(parents, node))
+            if len(paths) == limit:
+                break
+            if node != start:
+                continue
+        for offset in OFFSETS:
+            neighbor = node + offset
+            if neighbor in closed:
+                continue
+            cost = weight(neighbor)
+            if cost is None:
+                if neighbor not in goals:
+                    continue
+                cost = goal_weight
+            score = node_score + cost
+            if score >= g_score.get(neighbor, score + 1):
+                continue
+            g_score[neighbor] = score
+            parents[neighbor] = node
+            heappush(open_heap, (score, next(tie_breaker), neighbor))
+    return paths
+
+
+def build_path(
+    parents: Dict[Coordinate, Coordinate], end: Coordinate
+) -> List[Coordinate]:
+    """Walk a parent mapping back from the end to build a path.
+
+    Args:
+        parents (Dict[Coordinate, Coordinate]): Each visited coordinate
+            mapped to the coordinate it was reached from.
+        end (Coordinate): The last coordinate of the path.
+
+    Returns:
+        List[Coordinate]: The path, ordered from the search start to end.
+    """
+    path = [end]
+    while (end := parents.get(end)) is not None:
+        path.append(end)
+    path.reverse()
+    return path
@@ -1,3 +1,5 @@
 """Package for all Zerg units."""
 from .overlord import Overlord
+from .snapshot import load_snapshot, save_snapshot
+from .strategy import Strategy, Upgrade
 from .zerg import Zerg
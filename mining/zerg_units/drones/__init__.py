@@ -1,4 +1,5 @@
 """Package for Zerg Drones, which will be deployed to maps."""
 from .drone import Drone, State
+from .fleet import Fleet
 from .miner import MinerDrone
 from .scout import ScoutDrone
@@ -3,38 +3,119 @@
 from __future__ import annotations
 
 import logging
-from enum import Enum, auto
 from typing import TYPE_CHECKING, TypeVar
 
-from mining.utils import Coordinate, Directions, Icon, Map, Tile
+from mining.utils import (
+    Coordinate,
+    DecodedContext,
+    Directions,
+    Icon,
+    Map,
+    Path,
+    Tile,
+)
+from mining.utils.context import CARDINALS
 from mining.zerg_units.zerg import Zerg
 
+from .fleet import Fleet, State
+
 if TYPE_CHECKING:
-    from typing import List, Optional, Type
+    from typing import Optional, Sequence, Type
 
     from mining.utils import Context
     from mining.zerg_units import Overlord
 
 
 class Drone(Zerg):
-    """Parent class for all drone zerg units."""
+    """Parent class for all drone zerg units.
+
+    A drone's health, carried minerals, steps, moves, state and position
+    are kept in the arrays of a Fleet, at the drone's slot.
+    """
+
+    __slots__ = (
+        "_overlord",
+        "_fleet",
+        "_slot",
+        "_path",
+        "map",
+        "_previous_tile",
+        "_old_state",
+    )
 
     max_health = 40
     max_capacity = 10
     max_moves = 1
 
-    def __init__(self, overlord: Overlord) -> None:
-        """Initialize a Drone."""
+    def __init__(
+        self, overlord: Overlord, fleet: Optional[Fleet] = None
+    ) -> None:
+        """Initialize a Drone.
+
+        Args:
+            overlord (Overlord): The Overlord of the drone.
+            fleet (Optional[Fleet], optional): The fleet that keeps the
+                drone's stats. Defaults to the Overlord's fleet.
+        """
+        self._fleet = overlord.fleet if fleet is None else fleet
+        self._slot = self._fleet.add(self.max_health, self.max_moves)
         super().__init__(self.max_health)
         self._overlord = overlord
-        self._capacity = 0
-        self._path_to_goal: List["Coordinate"] = []
-        self._path_traveled: List["Coordinate"] = []
-        self._steps = 0
-        self.state = State.WAITING
+        # no Path is made for a drone until it is given one
+        self._path: Optional[Path] = None
         self.map: Optional[Map]
         self._previous_tile: Optional[Tile] = None
 
+    @property
+    def fleet(self) -> Fleet:
+        """The fleet that keeps this drone's stats."""
+        return self._fleet
+
+    @property
+    def slot(self) -> int:
+        """This drone's slot in its fleet."""
+        return self._slot
+
+    @property
+    def _health(self) -> int:
+        return self._fleet.health[self._slot]
+
+    @_health.setter
+    def _health(self, health: int) -> None:
+        self._fleet.health[self._slot] = health
+
+    @property
+    def _capacity(self) -> int:
+        return self._fleet.carried[self._slot]
+
+    @_capacity.setter
+    def _capacity(self, carried: int) -> None:
+        self._fleet.carried[self._slot] = carried
+
+    @property
+    def _steps(self) -> int:
+        return self._fleet.steps[self._slot]
+
+    @_steps.setter
+    def _steps(self, steps: int) -> None:
+        self._fleet.steps[self._slot] = steps
+
+    @property
+    def state(self) -> State:
+        """The state this drone is in."""
+        return self._fleet.STATES[self._fleet.state[self._slot]]
+
+    @state.setter
+    def state(self, state: State) -> None:
+        self._fleet.state[self._slot] = state.value
+
+    @property
+    def position(self) -> Coordinate:
+        """Where this drone was when it last acted."""
+        return Coordinate(
+            self._fleet.x[self._slot], self._fleet.y[self._slot]
+        )
+
     @property
     def capacity(self) -> int:
         """The max mineral capacity for this drone.
@@ -62,33 +143,45 @@ class Drone(Zerg):
         return self.max_moves
 
     @property
-    def path(self) -> List["Coordinate"]:
+    def path(self) -> Path:
         """The path this drone will take to its destination.
 
         The destination of this drone will always be the final element of this
-        list. Setting the path implicitly sets the destination.
+        path. Setting the path implicitly sets the destination, and forgets
+        the steps traveled.
         """
-        return self._path_to_goal
+        return self._path or Path()
 
     @path.setter
-    def path(self, new_path: List[Coordinate]) -> None:
-        self._path_to_goal = new_path
-        self._path_traveled = []
+    def path(self, new_path: Sequence[Coordinate]) -> None:
+        self._path = Path(new_path)
+        self.reserve_path()
         # traveling if path length is greater than 2 (start, dest)
         self.state = State.TRAVELING if len(new_path) > 2 else State.WAITING
 
+    def reserve_path(self) -> None:
+        """Retime the path around other drones' paths, and reserve it.
+
+        Nothing is reserved until the drone has been deployed to a map.
+        """
+        if getattr(self, "map", None) and self._path:
+            self._path.replace_ahead(
+                self.map.reserve_path(self, list(self._path))
+            )
+
     @property
     def dest(self) -> Optional[Coordinate]:
         """The coordinates of the current intended destination of this drone.
 
         This value will automatically be set when the path is updated.
         """
-        return self._path_to_goal[-1] if self._path_to_goal else None
+        return self._path.destination if self._path else None
 
     def take_damage(self, damage) -> bool:
         """Take damage.
 
-        If the drone died, the Overlord will be notified.
+        If the drone died, the Overlord will be notified. If the Overlord's
+        game is being recorded, the damage is recorded too.
 
         Args:
             damage (int): The damage to take.
@@ -96,6 +189,8 @@ class Drone(Zerg):
         Returns:
             bool: False if taking damage caused the drone to die.
         """
+        if recorder := self._overlord.recorder:
+            recorder.damage(self, damage)
         self._health -= damage
         if not (alive := self._health > 0):
             # If the drone times out before the action can be returned, this
@@ -142,6 +237,7 @@ class Drone(Zerg):
                 "max_health": health,
                 "max_capacity": capacity,
                 "max_moves": moves,
+                "__slots__": (),
             },
         )
         cost = new_drone_type.get_init_cost()
@@ -171,45 +267,101 @@ class Drone(Zerg):
     def action(self, context: Context) -> str:
         """Perform some action, based on the type of drone.
 
+        The context is decoded once here, and the decoded context is what
+        the Overlord and the map are given. If the Overlord's game is being
+        recorded, the context and the direction are recorded too.
+
         Args:
             context (Context): The context surrounding the drone.
 
+        Returns:
+            str: The direction the drone would like to move.
+        """
+        context = DecodedContext.decode(context)
+        direction = self._act(context)
+        if recorder := self._overlord.recorder:
+            recorder.move(self, context, direction)
+        return direction
+
+    def _act(self, context: DecodedContext) -> str:
+        """Perform the action of this type of drone.
+
+        Args:
+            context (DecodedContext): The context surrounding the drone.
+
         Returns:
             str: The direction the drone would like to move.
         """
         self._overlord.enqueue_map_update(self, context)
+        self._fleet.x[self._slot] = context.x
+        self._fleet.y[self._slot] = context.y
         result = Directions.CENTER.name
         # do not move if no path set
         if self.path:
             result = self._travel(context)
         else:
             self._finish_traveling()
-        current_tile = self.map.get(Coordinate(context.x, context.y), None)
-        if current_tile is not None:
-            current_tile._unoccupy()
-            if current_tile.icon == Icon.ACID:
-                self.take_damage(3)  # Acid deals 3 damage
-            current_tile._occupy(self)
+        self._occupy_current(context)
         if self.state == State.REVERSING:
             self.state = self._old_state
             self._swap_path()
         return result
 
-    def _travel(self, context: Context):
+    def _occupy_current(self, context: Context) -> None:
+        """Mark the drone's current tile as occupied by this drone.
+
+        A drone standing on acid takes its damage here, unless the game
+        deals acid damage itself.
+
+        Args:
+            context (Context): The context surrounding the drone.
+        """
+        current_tile = self.map.get(Coordinate(context.x, context.y), None)
+        if current_tile is not None and current_tile.discovered:
+            current_tile._unoccupy()
+            if (
+                current_tile.icon == Icon.ACID
+                and not self._overlord.game_deals_damage
+            ):
+                self.take_damage(Icon.ACID.health_cost())
+            current_tile._occupy(self)
+
+    def _travel(self, context: DecodedContext):
         curr_tile = self.map[Coordinate(context.x, context.y)]
         dest = self._update_path(curr_tile)
-        adj_tiles = {
-            Directions.NORTH.name: context.north,
-            Directions.SOUTH.name: context.south,
-            Directions.EAST.name: context.east,
-            Directions.WEST.name: context.west,
-        }
+        if dest == curr_tile.coordinate and self.path:
+            # a repeated tile on a reserved path, wait for the way to clear
+            return Directions.CENTER.name
         direction = self._choose_direction(curr_tile.coordinate, dest, context)
-        if direction in adj_tiles and adj_tiles[direction] == Icon.WALL.value:
-            self.path = []
-            direction = Directions.CENTER.name
+        if direction in CARDINALS and context.icon(direction) is Icon.WALL:
+            direction = self._repair_path(curr_tile, context)
         return direction
 
+    def _repair_path(self, curr_tile: Tile, context: DecodedContext) -> str:
+        """Repair the path around a wall found on the next step.
+
+        The context is given to the map straight away, so the repair can
+        happen without waiting for the Overlord to process map updates.
+
+        Args:
+            curr_tile (Tile): The drone's current tile.
+            context (DecodedContext): The context surrounding the drone.
+
+        Returns:
+            str: The direction the drone should head on the repaired path.
+        """
+        self.map.update_context(context)
+        path = self.map.repair_path(self, curr_tile.coordinate, self.dest)
+        if len(path) < 2:
+            self.path = []
+            return Directions.CENTER.name
+        self._path.replace_ahead(path)
+        self.reserve_path()
+        dest = self._update_path(curr_tile)
+        if dest == curr_tile.coordinate and self.path:
+            return Directions.CENTER.name
+        return self._choose_direction(curr_tile.coordinate, dest, context)
+
     def _update_path(self, curr_tile: Tile) -> Coordinate:
         """Check if the current location is on the path, and remove if so.
 
@@ -220,13 +372,16 @@ class Drone(Zerg):
             Coordinate: The intended next destination of the drone.
         """
         next_step = self.path[0]
-        # only pop if last action caused movement
+        # only advance if last action caused movement
         if curr_tile.coordinate == next_step:
             self._handle_occupation(curr_tile)
-            self._path_traveled.insert(0, self.path.pop(0))
+            self._path.advance()
             # if false, currently at destination
             if self.path:
                 next_step = self.path[0]
+        elif getattr(self, "map", None):
+            # the last move was blocked, keep the reservation in step
+            self.map.delay_path(self, [curr_tile.coordinate, *self.path])
         return next_step
 
     def reverse_path(self) -> None:
@@ -236,19 +391,20 @@ class Drone(Zerg):
         self._swap_path()
 
     def _swap_path(self) -> None:
-        self._path_to_goal, self._path_traveled = (
-            self._path_traveled,
-            self._path_to_goal,
-        )
+        if self._path is not None:
+            self._path.reverse()
 
     def _handle_occupation(self, curr_tile: Tile) -> None:
-        curr_tile.occupied_drone = self
-        if self._previous_tile:
-            self._previous_tile.occupied_drone = None
+        previous = self._previous_tile
+        if previous and previous.occupied_drone is self:
+            previous.occupied_drone = None
+        if curr_tile.discovered:
+            curr_tile.occupied_drone = self
+        # else the tile is only known once the Overlord reads the context
         self._previous_tile = curr_tile
 
     def _choose_direction(
-        self, curr: Coordinate, dest: Coordinate, context: Context
+        self, curr: Coordinate, dest: Coordinate, context: DecodedContext
     ) -> str:
         """Choose which cardinal direction the drone should head.
 
@@ -258,7 +414,7 @@ class Drone(Zerg):
         Args:
             curr (Coordinate): The drone's current location.
             dest (Coordinate): The destination of the drone.
-            context (Context): The context surrounding the drone.
+            context (DecodedContext): The context surrounding the drone.
 
         Returns:
             str: The direction the drone should head to reach the destination.
@@ -267,8 +423,7 @@ class Drone(Zerg):
         if direction == Directions.CENTER.name:
             self._finish_traveling()
         else:
-            target = Icon(getattr(context, direction.lower()))
-            self._handle_moving(target)
+            self._handle_moving(context.icon(direction))
         return direction
 
     def _handle_moving(self, target: Icon) -> None:
@@ -283,7 +438,7 @@ class Drone(Zerg):
 
     def _hit_mineral(self, target: Icon) -> bool:
         if (
-            is_mineral := (target == Icon.MINERAL.value)
+            is_mineral := (target is Icon.MINERAL)
         ) and self._capacity <= self.max_capacity:
             self._capacity += 1
         return is_mineral
@@ -346,13 +501,4 @@ class Drone(Zerg):
         logger.info(f"{drone_type} {drone_id} {message}")
 
 
-class State(Enum):
-    """States that a zerg Drone can be in."""
-
-    TRAVELING = auto()
-    WORKING = auto()
-    WAITING = auto()
-    REVERSING = auto()
-
-
 T = TypeVar("T", bound=Drone)
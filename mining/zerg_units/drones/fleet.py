@@ -0,0 +1,171 @@
+"""The changing stats of a whole fleet of drones, in contiguous arrays."""
+
+from __future__ import annotations
+
+from array import array
+from enum import Enum, auto
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class State(Enum):
+    """States that a zerg Drone can be in."""
+
+    TRAVELING = auto()
+    WORKING = auto()
+    WAITING = auto()
+    REVERSING = auto()
+
+
+class Fleet:
+    """The changing stats of a whole fleet of drones, in contiguous arrays.
+
+    Every drone is given a slot, and its health, carried minerals, steps
+    taken, moves per tick, state and last known position are kept at that
+    slot of one array per stat. A drone object only holds its slot, so
+    thousands of drones take little memory, and fleet wide operations run
+    over the arrays instead of over drone objects. A drone is dead once its
+    health is down to 0, and its slot is never reused.
+    """
+
+    # states, and their names, by the value stored for them
+    STATES: Tuple[Optional[State], ...] = (None, *State)
+    NAMES: Tuple[str, ...] = ("", *(state.name for state in State))
+    # slots damaged at once above which NumPy is used, when installed
+    VECTOR_THRESHOLD = 64
+
+    def __init__(self) -> None:
+        """Initialize an empty fleet."""
+        self.health = array("i")
+        self.carried = array("i")
+        self.steps = array("i")
+        self.moves = array("i")
+        self.x = array("i")
+        self.y = array("i")
+        self.state = bytearray()
+
+    def add(self, health: int, moves: int) -> int:
+        """Give a new, waiting drone a slot.
+
+        Args:
+            health (int): The drone's health.
+            moves (int): The drone's moves per tick.
+
+        Returns:
+            int: The slot.
+        """
+        self.health.append(health)
+        self.carried.append(0)
+        self.steps.append(0)
+        self.moves.append(moves)
+        self.x.append(0)
+        self.y.append(0)
+        self.state.append(State.WAITING.value)
+        return len(self.state) - 1
+
+    def damage(self, slots: Sequence[int], damage: int) -> List[int]:
+        """Damage many drones at once.
+
+        Drones that are already dead are not damaged again.
+
+        Args:
+            slots (Sequence[int]): The distinct slots of the drones.
+            damage (int): The damage each drone takes.
+
+        Returns:
+            List[int]: The slots of the drones this killed.
+        """
+        if np is not None and len(slots) > self.VECTOR_THRESHOLD:
+            # a view of the array, which cannot grow until it is let go of
+            health = np.frombuffer(self.health, dtype=np.int32)
+            indexes = np.asarray(slots, dtype=np.intp)
+            alive = indexes[health[indexes] > 0]
+            health[alive] -= damage
+            return alive[health[alive] <= 0].tolist()
+        killed = []
+        health = self.health
+        for slot in slots:
+            if health[slot] <= 0:
+                continue
+            health[slot] -= damage
+            if health[slot] <= 0:
+                killed.append(slot)
+        return killed
+
+    def in_state(self, state: State) -> List[int]:
+        """Return the slots of the living drones in a state.
+
+        Args:
+            state (State): The state.
+
+        Returns:
+            List[int]: The slots, in order.
+        """
+        states, health, value = self.state, self.health, state.value
+        if np is not None and len(states) > self.VECTOR_THRESHOLD:
+            matches = (np.frombuffer(states, dtype=np.uint8) == value) & (
+                np.frombuffer(health, dtype=np.int32) > 0
+            )
+            return np.flatnonzero(matches).tolist()
+        slots = []
+        slot = states.find(value)
+        while slot != -1:
+            if health[slot] > 0:
+                slots.append(slot)
+            slot = states.find(value, slot + 1)
+        return slots
+
+    def alive(self) -> int:
+        """Return the number of living drones."""
+        if np is not None and len(self.health) > self.VECTOR_THRESHOLD:
+            health = np.frombuffer(self.health, dtype=np.int32)
+            return int(np.count_nonzero(health > 0))
+        return sum(health > 0 for health in self.health)
+
+    def rows(self, slots: Iterable[int]) -> List[Tuple[str, int, int, int]]:
+        """Return the stats of drones, a row per drone, for the dashboard.
+
+        Args:
+            slots (Iterable[int]): The slots of the drones.
+
+        Returns:
+            List[Tuple[str, int, int, int]]: The state name, health, carried
+                minerals and moves of every drone. The state of a dead
+                drone is "DEAD".
+        """
+        names = self.NAMES
+        state, health = self.state, self.health
+        carried, moves = self.carried, self.moves
+        return [
+            (
+                names[state[slot]] if health[slot] > 0 else "DEAD",
+                health[slot],
+                carried[slot],
+                moves[slot],
+            )
+            for slot in slots
+        ]
+
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the arrays.
+
+        Returns:
+            int: The size of the arrays in bytes.
+        """
+        columns = (self.health, self.carried, self.steps, self.moves)
+        return (
+            sum(column.itemsize * len(column) for column in columns)
+            + (self.x.itemsize + self.y.itemsize) * len(self.x)
+            + len(self.state)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of slots given out, dead drones included."""
+        return len(self.state)
@@ -3,31 +3,39 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from mining.utils import Icon
+from mining.utils import DecodedContext, Icon
 
 from .drone import Drone, State
 
 if TYPE_CHECKING:
     from typing import List, Optional
 
-    from mining.utils import Context, Coordinate
+    from mining.utils import Coordinate
     from mining.zerg_units import Overlord
 
+    from .fleet import Fleet
+
 
 class MinerDrone(Drone):
     """Miner drone, whose primary purpose is to mine minerals."""
 
+    __slots__ = ("_mineral_location", "_mineral_direction")
+
     max_health = 30
     max_capacity = 10
     max_moves = 2
 
-    def __init__(self, overlord: "Overlord") -> None:
+    def __init__(
+        self, overlord: "Overlord", fleet: Optional[Fleet] = None
+    ) -> None:
         """Initialize a Miner.
 
         Args:
             overlord (Overlord): The Overlord owning this drone.
+            fleet (Optional[Fleet], optional): The fleet that keeps the
+                drone's stats. Defaults to the Overlord's fleet.
         """
-        super().__init__(overlord)
+        super().__init__(overlord, fleet)
         self._mineral_location: Optional["Coordinate"] = None
 
     @property
@@ -38,55 +46,69 @@ class MinerDrone(Drone):
     @Drone.path.setter
     def path(self, new_path: List["Coordinate"]) -> None:
         """Set the path this drone will take towards the tasked mineral."""
+        if not new_path:
+            # the mineral cannot be reached, it is given up on once the
+            # miner finds it is not next to it
+            Drone.path.fset(self, new_path)
+            return
         # separate mineral tile as new attribute
         self._mineral_location = new_path.pop()
         self._mineral_direction = new_path[-1].direction(
             self._mineral_location
-        )
+        ).upper()
         Drone.path.fset(self, new_path)
 
-    def action(self, context: "Context") -> str:
+    def _act(self, context: DecodedContext) -> str:
         # sourcery skip: assign-if-exp, reintroduce-else
-        """Perform some action.
+        """Perform the action of a miner.
 
         A miner will move towards an assigned mineral, and mine it until the
         mineral is depleted. After done mining, the miner will return to the
         landing zone and await retrieval from the overlord.The miner will
         return early if its capacity is maxed out or if continued mining will
-        cause it to die.
+        cause it to die. A full miner gives the rest of its mineral back, so
+        another miner can be tasked with it.
 
         Args:
-            context (Context): The drone's current location.
+            context (DecodedContext): The drone's current location.
 
         Returns:
             str: The intended next destination of the drone.
         """
-        result = super().action(context)
+        result = super()._act(context)
         if self.state == State.WORKING:
             return self._mine(context)
         else:
             return result
 
-    def _mine(self, context: "Context") -> str:
+    def _mine(self, context: DecodedContext) -> str:
         """Mine the miner's tasked mineral until it is depleted.
 
         Args:
-            context (Context): The surrounding context of the miner.
+            context (DecodedContext): The surrounding context of the miner.
 
         Returns:
             str: The direction the miner wants to move.
         """
-        dest_icon = getattr(context, self._mineral_direction)
-        if self._hit_mineral(dest_icon):
-            return self._mineral_direction.upper()
-        self._deplete_mineral()
-        return super().action(context)
-
-    def _deplete_mineral(self):
+        dest_icon = context.icon(self._mineral_direction)
+        if dest_icon is not Icon.MINERAL:
+            self._deplete_mineral()
+        elif self._capacity >= self.capacity:
+            # full, leave the rest of the mineral to another miner
+            self._deplete_mineral(untask=True)
+        elif self._hit_mineral(dest_icon):
+            return self._mineral_direction
+        return super()._act(context)
+
+    def _deplete_mineral(self, untask: bool = False):
         if self.map and self._mineral_location:
             self.map.tasked_minerals.remove(self._mineral_location)
+            if untask:
+                self.map.untasked_minerals.add(self._mineral_location)
             self._mineral_location = None
-            Drone.path.fset(self, self._path_traveled)
+            traveled = [] if self._path is None else self._path.traveled()
+            home = self.map.path_to_origin(traveled[0]) if traveled else []
+            Drone.path.fset(self, home or traveled)
             self.state = State.TRAVELING
 
     def _finish_traveling(self):
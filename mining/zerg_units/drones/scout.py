@@ -4,64 +4,94 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from mining.utils import Directions, Icon
+from mining.utils import DecodedContext, Directions, Icon
 
 from .drone import Drone
 
 if TYPE_CHECKING:
-    from mining.utils import Context, Coordinate, Tile
+    from typing import Optional, Sequence
+
+    from mining.utils import Coordinate, Tile
     from mining.zerg_units import Overlord
 
+    from .fleet import Fleet
+
 
 class ScoutDrone(Drone):
     """Scout drone, whose primary purpose is revealing the map."""
 
+    __slots__ = ()
+
     max_health = 40
     max_capacity = 5
     max_moves = 1
 
-    def __init__(self, overlord: Overlord) -> None:
+    def __init__(
+        self, overlord: Overlord, fleet: Optional[Fleet] = None
+    ) -> None:
         """Initialize a ScoutDrone.
 
         Args:
             overlord (Overlord): The Overlord owning this drone.
+            fleet (Optional[Fleet], optional): The fleet that keeps the
+                drone's stats. Defaults to the Overlord's fleet.
         """
-        super().__init__(overlord)
+        super().__init__(overlord, fleet)
 
     @property
     def icon(self) -> Icon:
         """The icon of this drone type."""
         return Icon.SCOUT
 
-    def action(self, context: Context) -> str:
-        """Perform some action, based on the type of drone.
+    @Drone.path.setter
+    def path(self, new_path: Sequence[Coordinate]) -> None:
+        """Set the path this scout will take, and claim its destination."""
+        Drone.path.fset(self, new_path)
+        self._claim_dest()
+
+    def _claim_dest(self) -> None:
+        """Keep the scout's destination in its map's scout targets.
+
+        Other scouts avoid the tiles around the targets, so a scout drops
+        its target once it has no path left.
+        """
+        if not getattr(self, "map", None):
+            return
+        if (dest := self.dest) is not None:
+            self.map.scout_targets[id(self)] = dest
+        else:
+            self.map.scout_targets.pop(id(self), None)
+
+    def _act(self, context: DecodedContext) -> str:
+        """Perform the action of a scout.
 
         The scout will check if its current location is the deployment zone and
         if it is blocked by non-traversable tiles on all side. If so, it will
         request to be recalled, otherwise continue on its path.
 
         Args:
-            context (Context): The context surrounding the scout.
+            context (DecodedContext): The context surrounding the scout.
 
         Returns:
             str: The direction the scout would like to move.
         """
-        cardinals = [
-            Icon(context.north),
-            Icon(context.south),
-            Icon(context.east),
-            Icon(context.west),
-        ]
-        if all(not icon.traversable() for icon in cardinals):
+        if not any(context.traversable):
             self._overlord.enqueue_map_update(self, context)
+            self._occupy_current(context)
             self._finish_traveling()
             self._overlord.request_pickup(self)
             return Directions.CENTER.name
-        return super().action(context)
+        return super()._act(context)
 
     def _update_path(self, curr_tile: Tile) -> Coordinate:
-        if self.path[0] == self.dest:
-            # next step is an undiscovered tile, stop here
-            self.path.pop(0)
+        if (
+            self.path[0] == self.dest
+            and self.map.terrain_weight(self.dest) is None
+        ):
+            # the target cannot be stepped on, stop next to it
+            self._path.skip()
+            self._claim_dest()
             return curr_tile.coordinate
-        return super()._update_path(curr_tile)
+        next_step = super()._update_path(curr_tile)
+        self._claim_dest()
+        return next_step
@@ -6,15 +6,17 @@ import random
 from queue import SimpleQueue
 from typing import TYPE_CHECKING
 
-from mining.utils import DEFAULT_TILE, Coordinate, Icon, Map
+from mining.utils import Coordinate, Icon, Map
 
-from .drones import Drone, MinerDrone, ScoutDrone, State
+from .drones import Drone, Fleet, MinerDrone, ScoutDrone, State
+from .strategy import Strategy
 from .zerg import Zerg
 
 if TYPE_CHECKING:
     from typing import Dict, List, Optional, Set, Tuple, Type
 
     from mining.GUI.dashboard import Dashboard
+    from mining.simulation.recording import Recorder
     from mining.utils import Context
 
 
@@ -23,12 +25,23 @@ class Overlord(Zerg):
 
     DEPLOY = "DEPLOY"
     RETURN = "RETURN"
+    # reachable frontier tiles considered for each scout target
+    SCOUT_CANDIDATES = 8
+    # how a scout target is chosen among them: "gain" for the most tiles
+    # revealed per step, "random" to skip some candidates at random
+    EXPLORATION = "gain"
+    # whether small batches of miners are matched to minerals optimally
+    OPTIMAL_ASSIGNMENT = False
+    # how refined minerals are spent on drones, unless given another
+    STRATEGY = Strategy()
 
     def __init__(
         self,
         total_ticks: int,
         refined_minerals: int,
         dashboard: Dashboard,
+        strategy: Optional[Strategy] = None,
+        seed: Optional[int] = None,
     ) -> None:
         """Initialize the Overlord.
 
@@ -36,13 +49,29 @@ class Overlord(Zerg):
             total_ticks (int): Total ticks allowed for mining.
             refined_minerals (int): Total given minerals.
             dashboard (_type_, optional): The GUI dashboard. Defaults to None.
+            strategy (Optional[Strategy], optional): How minerals are spent
+                on drones. Defaults to STRATEGY.
+            seed (Optional[int], optional): The seed of every random choice,
+                so a game can be played again. Defaults to a random seed.
         """
         self.dashboard = dashboard
+        self.strategy = strategy or self.STRATEGY
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self._random = random.Random(seed)
+        self.fleet = Fleet()
+        # the health, minerals, state and position of every drone
+        self.game_deals_damage = False
+        # drones take acid damage themselves, unless the game deals it
+        self.recorder: Optional[Recorder] = None
+        # records the maps, actions and damage of the game, if it is set
         self.drones: Dict[int, Drone] = {}
         # a drone id as key and drone as value
         self._deployed: Dict[int, Optional[Map]] = {}
         # a drone id as key and map id as value
-        self._idle_drones: Dict[Type[Drone], Set[Drone]] = {}
+        self._idle_drones: Dict[Type[Drone], Dict[Drone, None]] = {}
+        # drones by type, in the order they became idle
         self._update_queue: SimpleQueue[
             Tuple[Map, Drone, Context]
         ] = SimpleQueue()
@@ -51,6 +80,8 @@ class Overlord(Zerg):
         # a queue of pick up requests from drones
         self._maps: Dict[int, Map] = {}
         # a map id as key and Map as value
+        self._tasked_miners: List[Tuple[Map, Drone]] = []
+        # miners given a mineral, waiting to be deployed
         scouts, miners, classes = self._create_drone_classes(refined_minerals)
         for _ in range(scouts):
             self._create_drone(classes["Scout"])
@@ -74,86 +105,65 @@ class Overlord(Zerg):
     def _create_drone_classes(self, minerals: int) -> Tuple[int, int, dict]:
         """Create custom drone classes based on number of minerals.
 
+        Minerals are spent as the Overlord's strategy says: on drones
+        first, and on upgrades with what is left over.
+
         Args:
             minerals (int): Number of allotted minerals for drone
                 creation
 
         Returns:
-            List(Drone): List of drone classes containing a custom
-            ScoutDrone and MinerDrone
+            Tuple[int, int, dict]: The number of scouts and miners to
+                create, and the custom ScoutDrone and MinerDrone classes
+                keyed by role
         """
-        # Maximum desired drones to create at instantiation,
-        # leaving leftover minerals for drone stat upgrades
-        MAX_ALLOWABLE_DRONES = 12
-        # Minimum drone: 10HP, 5 Capacity, 1 Move = 5 Minerals
-        MIN_DRONE_DEFAULTS = (10, 5, 1)
-        MIN_MINERALS = 5
-        # +10HP = 1 Mineral,
-        HP_COST = 1
-        # +5 Capacity = 1 Mineral,
-        CAP_COST = 1
-        # +1 Move = 3 Minerals
-        MOVE_COST = 3
-
-        max_drones = minerals // 5
-        max_drones = min(max_drones, MAX_ALLOWABLE_DRONES)
-        num_scouts = max_drones // 2
-        num_scouts = max(num_scouts, 1)
+        strategy = self.strategy
+        max_drones = min(minerals // strategy.drone_cost, strategy.max_drones)
+        num_scouts = max(int(max_drones * strategy.scout_share), 1)
         num_miners = max_drones - num_scouts
-
-        leftover = minerals - (MAX_ALLOWABLE_DRONES * MIN_MINERALS)
-
-        scout_hp, scout_cap, scout_moves = MIN_DRONE_DEFAULTS
-        miner_hp, miner_cap, miner_moves = MIN_DRONE_DEFAULTS
-
-        drone_classes: Dict[str, Type[Drone]] = {}
+        counts = {"Scout": num_scouts, "Miner": num_miners}
+
+        # leftover minerals go to drone stat upgrades
+        leftover = minerals - strategy.max_drones * strategy.drone_cost
+        names = ("health", "capacity", "moves")
+        stats = {
+            role: dict(zip(names, strategy.base_stats)) for role in counts
+        }
         while leftover > 0:
-            if scout_hp < 40:
-                leftover = self._purchase_part(leftover, HP_COST, num_scouts)
-                if leftover is None:
-                    break
-                scout_hp += 10
-            elif miner_cap < 10:
-                leftover = self._purchase_part(leftover, CAP_COST, num_miners)
-                if leftover is None:
-                    break
-                miner_cap += 5
-            elif miner_hp < 40:
-                leftover = self._purchase_part(leftover, HP_COST, num_miners)
-                if leftover is None:
+            for upgrade in strategy.upgrades:
+                stat = stats[upgrade.role]
+                limit = upgrade.limit
+                if counts[upgrade.role] and (
+                    limit is None or stat[upgrade.stat] < limit
+                ):
                     break
-                miner_hp += 10
-            elif miner_moves < 2:
-                leftover = self._purchase_part(leftover, MOVE_COST, num_miners)
-                if leftover is None:
-                    break
-                miner_moves += 1
             else:
-                leftover = self._purchase_part(leftover, HP_COST, num_scouts)
-                if leftover is None:
-                    break
-                scout_hp += 10
+                break
+            leftover = self._purchase_part(
+                leftover, upgrade.cost, counts[upgrade.role]
+            )
+            if leftover is None:
+                break
+            stat[upgrade.stat] += upgrade.step
 
-        custom_scout_type = Drone.drone_blueprint(
-            scout_hp, scout_cap, scout_moves, "Custom Scout", ScoutDrone
-        )
-        custom_miner_type = Drone.drone_blueprint(
-            miner_hp, miner_cap, miner_moves, "Custom Miner", MinerDrone
-        )
-        drone_classes["Scout"] = custom_scout_type
-        drone_classes["Miner"] = custom_miner_type
+        drone_classes: Dict[str, Type[Drone]] = {}
+        roles = (("Scout", ScoutDrone), ("Miner", MinerDrone))
+        for role, drone_class in roles:
+            drone_classes[role] = Drone.drone_blueprint(
+                *stats[role].values(), f"Custom {role}", drone_class
+            )
 
         return (num_scouts, num_miners, drone_classes)
 
     def _create_drone(self, drone_type: Type[Drone]) -> None:
         """Create a new zerg drone of the specified drone type."""
-        new_drone = drone_type(self)
+        new_drone = drone_type(self, self.fleet)
         drone_id = id(new_drone)
         self.drones[drone_id] = new_drone
         self._deployed[drone_id] = None
-        self._idle_drones.setdefault(drone_type.__bases__[0], set()).add(
+        self._idle_drones.setdefault(drone_type.__bases__[0], {})[
             new_drone
-        )
+        ] = None
 
     def mark_drone_dead(self, drone: Drone) -> None:
         """Mark a drone as dead.
@@ -165,6 +175,7 @@ class Overlord(Zerg):
         if map_ := drone.map:
             del self._deployed[drone_id]
             del self.drones[drone_id]
+            map_.release_path(drone)
             if isinstance(drone, ScoutDrone):
                 map_.scout_count -= 1
 
@@ -175,23 +186,31 @@ class Overlord(Zerg):
             map_id (int): The id of the map.
             summary (float): The density of minerals in the map.
         """
+        if self.recorder:
+            self.recorder.add_map(map_id, summary)
         physical_map = Map(map_id, summary)
         self._maps[map_id] = physical_map
         self.dashboard.create_map_gui(physical_map)
         self.dashboard.update_drone_table(self.drones.values())
 
-    def _select_map(self) -> Map:
+    def _select_map(self) -> Optional[Map]:
         """Select the map to deploy a scout to.
 
+        Maps that have been fully explored are skipped.
+
         Returns:
-            int: The id of the chosen map
+            Optional[Map]: The chosen map, or None if every map is explored
         """
-        map_ = min(
-            self._maps.values(),
+        unexplored = [
+            map_
+            for map_ in self._maps.values()
+            if map_.origin is None or map_.frontier()
+        ]
+        return min(
+            unexplored,
             key=lambda map_: (map_.scout_count, map_.density),
+            default=None,
         )
-        map_.scout_count += 1
-        return map_
 
     def enqueue_map_update(self, drone: Drone, context: Context) -> None:
         """Enqueue a map update of the drone's location and its context.
@@ -219,20 +238,17 @@ class Overlord(Zerg):
         if drone.map:
             self._pickup_queue.put((drone.map, drone))
 
-    def _distance_sort(self, start: Coordinate, end: Coordinate):
-        """Return raw distance between two Coordinates"""
-        start_x, start_y = start
-        end_x, end_y = end
-        return (start_x - end_x) + (start_y - end_y)
-
     def _assign_scout_target(
         self, map_: Map, start: Coordinate
     ) -> List[Coordinate]:
         """Assigns a scout an exploration target.
 
-        Iterates through unexplored tiles in order of closest raw
-        distance between tiles and calls Dijkstra's algorithm to
-        find path between tiles, returning it if one was found.
+        Searches once from the start for paths to the closest reachable
+        frontier tiles. With "gain" exploration, the path revealing the most
+        undiscovered tiles per step is taken, not counting tiles other
+        scouts are already heading for, so that scouts spread out; ties go
+        to the closest. With "random" exploration, candidates are walked
+        from closest to furthest, skipping some at random.
 
         Args:
             map_id (int): id of map to search on
@@ -240,35 +256,33 @@ class Overlord(Zerg):
         Returns:
             List[Coordinate]: Path from Start to End Coordinates
         """
-        unexplored_tiles = map_.get_unexplored_tiles()
-        unexplored_tiles.sort(
-            key=lambda tile: self._distance_sort(start, tile.coordinate),
-            reverse=True,
+        paths = map_.nearest_paths(
+            start, map_.frontier(), self.SCOUT_CANDIDATES
         )
-        random.seed()
-        for tile in unexplored_tiles:
-            if random.randint(1, 2) == 2:
-                continue
-            coord = tile.coordinate
-            neighbor_icons = (
-                map_.get(coord, DEFAULT_TILE).icon
-                for coord in coord.cardinals()
-            )
-            if not any(
-                True
-                for icon in neighbor_icons
-                if icon
-                in [Icon.MINERAL, Icon.EMPTY, Icon.DEPLOY_ZONE, Icon.ACID]
-            ):
-                continue
-            if path := map_.dijkstra(start, tile.coordinate):
+        if self.EXPLORATION == "random":
+            for path in paths:
+                if self._random.randint(1, 2) == 2:
+                    continue
                 return path
+            return paths[0] if paths else []
+
+        claimed: Set[Coordinate] = set()
+        for dest in map_.scout_targets.values():
+            if dest != start:
+                claimed |= map_.undiscovered_around(dest)
 
-        return []
+        def gain(path: List[Coordinate]) -> float:
+            revealed = map_.undiscovered_around(path[-1]) - claimed
+            return len(revealed) / max(len(path) - 1, 1)
+
+        return max(paths, key=gain, default=[])
 
     def _set_drone_path(self, drone: Drone, context: Context) -> None:
         """Give a drone a path based on their role and context.
 
+        A scout with nothing left to explore heads back to the deploy zone,
+        and asks to be picked up once it is there.
+
         Args:
             drone (Drone): The drone whose path will be set.
             context (Context): The context of the drone.
@@ -276,10 +290,15 @@ class Overlord(Zerg):
         if drone.map:
             start = Coordinate(context.x, context.y)
             path = self._assign_scout_target(drone.map, start)
+            if not path and start != drone.map.origin:
+                # nothing left to explore, head back to be picked up
+                path = drone.map.path_to_origin(start)
             drone.path = path
+            if not path and start == drone.map.origin:
+                # make room on the deploy zone
+                self.request_pickup(drone)
 
     def action(self, context=None) -> str:
-        # sourcery skip: assign-if-exp, reintroduce-else
         """Perform some action, based on the context of the situation.
 
         Args:
@@ -290,51 +309,115 @@ class Overlord(Zerg):
             str: The action for the overlord to perform
         """
         self._update_map()
-
-        if action := self._recall_drones():
-            return action
-
-        if action := self._deploy_miners():
-            return action
-
-        return self._deploy_scouts()
+        action = (
+            self._recall_drones()
+            or self._deploy_miners()
+            or self._deploy_scouts()
+        )
+        if self.recorder:
+            self.recorder.tick(action)
+        return action
 
     def _update_map(self) -> None:
         """Update the Overlord's Dashboard with new Map data."""
+        for map_ in self._maps.values():
+            map_.reservations.advance()
         self._process_updates()
 
     def _recall_drones(self) -> str:
-        if self._pickup_queue.empty():
-            return ""
+        """Return the first drone that asked to be picked up, if it can be.
+
+        Only a drone still deployed to the map, with no path left and
+        standing on the deploy zone is picked up. Other requests are
+        dropped, so a repeated request cannot return a drone twice.
+
+        Returns:
+            str: The RETURN action, or an empty string if no drone is
+                returned.
+        """
+        while not self._pickup_queue.empty():
+            map_, drone = self._pickup_queue.get()
+            drone_id = id(drone)
+            # drop repeated requests, and drones away from the deploy zone
+            if self._deployed.get(drone_id) is not map_ or drone.path:
+                continue
+            origin = map_.get(map_.origin, None) if map_.origin else None
+            if origin is None or origin.occupied_drone is not drone:
+                continue
+            origin.occupied_drone = None
+            map_.release_path(drone)
+            if isinstance(drone, ScoutDrone):
+                map_.scout_count -= 1
+            self._deployed[drone_id] = None
+            drone.map = None
+            self._idle_drones[type(drone).__bases__[0]][drone] = None
+            drone.reset_minerals()
+            return f"{self.RETURN} {drone_id}"
+        return ""
 
-        map_, drone = self._pickup_queue.get()
-        if isinstance(drone, ScoutDrone):
-            map_.scout_count -= 1
-        self._idle_drones[type(drone).__bases__[0]].add(drone)
-        drone.reset_minerals()
-        return f"{self.RETURN} {id(drone)}"
+    @staticmethod
+    def _origin_blocked(map_: Map) -> bool:
+        """Whether a drone stands on, or is stepping onto, a deploy zone."""
+        if map_.origin is None:
+            return False
+        origin = map_.get(map_.origin, None)
+        if origin is not None and (
+            origin.occupied_drone is not None or origin.icon == Icon.ZERG
+        ):
+            return True
+        # drones report their tile before moving, so look a tick ahead
+        tick = map_.reservations.tick
+        return any(
+            map_.reservations.owner(map_.origin, tick + ahead) is not None
+            for ahead in (0, 1)
+        )
 
     def _deploy_miners(self) -> str:
-        for map_ in self._maps.values():
-            if map_.untasked_minerals and self._idle_drones[MinerDrone]:
-                if (origin := map_.get(map_.origin, None)) is not None:
-                    if origin.icon == Icon.ZERG:
-                        continue
-                miner = self._idle_drones[MinerDrone].pop()
-                map_.task_miner(miner)
-                return self._deploy_drone(map_, miner)
+        if not self._tasked_miners:
+            self._task_miners()
+        for index, (map_, miner) in enumerate(self._tasked_miners):
+            if self._origin_blocked(map_):
+                continue
+            del self._tasked_miners[index]
+            return self._deploy_drone(map_, miner)
         return ""
 
+    def _task_miners(self) -> None:
+        """Match every idle miner to a mineral, a map at a time."""
+        idle = self._idle_drones.get(MinerDrone, {})
+        for map_ in self._maps.values():
+            if not idle:
+                return
+            if map_.untasked_minerals:
+                tasked = map_.assign_miners(
+                    list(idle), self.OPTIMAL_ASSIGNMENT
+                )
+                for miner in tasked:
+                    del idle[miner]
+                self._tasked_miners.extend((map_, miner) for miner in tasked)
+
     def _deploy_scouts(self) -> str:
         if not self._idle_drones[ScoutDrone]:
             return ""
 
-        scout = self._idle_drones[ScoutDrone].pop()
         map_ = self._select_map()
+        if map_ is None or self._origin_blocked(map_):
+            return ""
+        map_.scout_count += 1
+        scouts = self._idle_drones[ScoutDrone]
+        scout = next(iter(scouts))
+        del scouts[scout]
         return self._deploy_drone(map_, scout)
 
     def _process_updates(self) -> None:
+        """Apply the contexts drones reported this tick, a map at a time.
+
+        Each map is updated with all of its contexts in one batch, before
+        waiting scouts on it are given new paths. Waiting drones are found
+        in the fleet's state array, once per tick.
+        """
         drone_positions = []
+        updates: Dict[Map, List[Tuple[Drone, Context]]] = {}
         while not self._update_queue.empty():
             map_, drone, drone_context = self._update_queue.get()
             zerg_coord = Coordinate(drone_context.x, drone_context.y)
@@ -345,21 +428,24 @@ class Overlord(Zerg):
                     "icon": drone.icon,
                 }
             )
-            map_.update_context(drone_context)
-            if drone.state == State.WAITING and isinstance(drone, ScoutDrone):
-                self._set_drone_path(drone, drone_context)
+            updates.setdefault(map_, []).append((drone, drone_context))
+        waiting = set(self.fleet.in_state(State.WAITING))
+        for map_, map_updates in updates.items():
+            first_context = map_.origin is None
+            map_.apply_contexts(context for _, context in map_updates)
+            if first_context:
+                # the drone could not mark the unknown deploy zone itself
+                map_[map_.origin].occupied_drone = map_updates[0][0]
+            for drone, drone_context in map_updates:
+                if drone.slot in waiting and isinstance(drone, ScoutDrone):
+                    self._set_drone_path(drone, drone_context)
+                    if drone.path:
+                        waiting.discard(drone.slot)
         self.dashboard.update_maps(drone_positions)
 
-    def _detect_collisions(self, moving_drones: List[Drone]):
-        for drone in moving_drones:
-            if drone.map and drone.path:
-                next_step = drone.map[drone.path[0]]
-                if next_step and (other_drone := next_step.occupied_drone):
-                    if other_drone.path[0] == next_step:
-                        yield (drone, other_drone)
-
     def _deploy_drone(self, map_: Map, drone: Drone) -> str:
         drone_id = id(drone)
         self._deployed[drone_id] = map_
         drone.map = map_
+        drone.reserve_path()
         return f"{self.DEPLOY} {drone_id} {map_.map_id}"
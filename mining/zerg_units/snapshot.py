@@ -0,0 +1,460 @@
+"""Compact, versioned binary snapshots of everything an Overlord knows.
+
+A snapshot holds every map the Overlord has registered, with its tiles,
+minerals, origin, frontier, scout count and targets, occupancy and path
+reservations, and every living drone, with its stats, state and paths.
+The queues and random state of the Overlord are kept too, so a loaded
+Overlord carries on exactly where the saved one left off. Tiles are stored
+as the allocated chunks of the map's grid of icon codes, compressed, and
+coordinates as packed integer arrays, so saving and loading never walk an
+object graph.
+
+The shortest path tree from each origin is kept as well, since a new
+search may break ties between paths of equal cost differently; the other
+search state of a map is rebuilt when it is next needed. Drones are
+numbered by their order in the Overlord, and come back as new drones with
+new ids.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain
+from queue import SimpleQueue
+from typing import TYPE_CHECKING
+
+from mining.utils import Context, Coordinate, Map, Path
+from mining.utils.grid import Grid
+from mining.utils.path_tree import ShortestPathTree
+
+from .drones import Drone, Fleet, MinerDrone, ScoutDrone, State
+from .overlord import Overlord
+from .strategy import Strategy
+
+if TYPE_CHECKING:
+    from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Type
+
+    from mining.GUI.dashboard import Dashboard
+    from mining.utils.reservation import ReservationTable
+
+MAGIC = b"ZSNP"
+VERSION = 5
+# magic, version, seed, strategy length
+HEADER = struct.Struct("<4sBQH")
+# role, max health, max capacity, max moves, health, minerals carried,
+# state, steps, position, whether deployed, map id
+DRONE = struct.Struct("<BiiiiiBiii?i")
+ROLES: Tuple[Type[Drone], ...] = (ScoutDrone, MinerDrone)
+STATES = list(State)
+# the version, state and gaussian of the random generator
+RANDOM = struct.Struct("<B625I?d")
+
+
+class _Writer:
+    """Packs values into a stream."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+
+    def pack(self, layout: str, *values) -> None:
+        self.stream.write(struct.pack(layout, *values))
+
+    def blob(self, data: bytes) -> None:
+        self.pack("<I", len(data))
+        self.stream.write(data)
+
+    def ints(self, values: Iterable[int]) -> None:
+        packed = array("i", values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        self.blob(packed.tobytes())
+
+    def floats(self, values: Iterable[float]) -> None:
+        packed = array("d", values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        self.blob(packed.tobytes())
+
+    def coordinates(self, coordinates: Iterable[Coordinate]) -> None:
+        self.ints(chain.from_iterable(coordinates))
+
+
+class _Reader:
+    """Unpacks values from a stream."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+
+    def unpack(self, layout: str) -> tuple:
+        return struct.unpack(layout, self.stream.read(struct.calcsize(layout)))
+
+    def blob(self) -> bytes:
+        (length,) = self.unpack("<I")
+        return self.stream.read(length)
+
+    def ints(self) -> List[int]:
+        values = array("i")
+        values.frombytes(self.blob())
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+
+    def floats(self) -> List[float]:
+        values = array("d")
+        values.frombytes(self.blob())
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+
+    def coordinates(self) -> List[Coordinate]:
+        values = self.ints()
+        return [Coordinate(*pair) for pair in zip(values[::2], values[1::2])]
+
+    def coordinate(self) -> Optional[Coordinate]:
+        coordinates = self.coordinates()
+        return coordinates[0] if coordinates else None
+
+
+def _drain(queue: SimpleQueue) -> List[tuple]:
+    """Return the items of a queue, leaving the queue as it was."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get())
+    for item in items:
+        queue.put(item)
+    return items
+
+
+def save_snapshot(overlord: Overlord, stream: BinaryIO) -> None:
+    """Write everything an Overlord knows to a binary stream.
+
+    The Overlord should be saved between ticks, not while drones act.
+
+    Args:
+        overlord (Overlord): The Overlord.
+        stream (BinaryIO): Where the snapshot is written.
+    """
+    writer = _Writer(stream)
+    strategy = overlord.strategy.encode()
+    writer.pack(HEADER.format, MAGIC, VERSION, overlord.seed, len(strategy))
+    stream.write(strategy)
+    version, state, gauss = overlord._random.getstate()
+    writer.pack(RANDOM.format, version, *state, gauss is not None, gauss or 0)
+
+    drones = list(overlord.drones.values())
+    indices = {id(drone): index for index, drone in enumerate(drones)}
+    writer.pack("<I", len(drones))
+    for drone in drones:
+        _save_drone(writer, drone, overlord._deployed[id(drone)])
+
+    writer.pack("<I", len(overlord._maps))
+    for map_ in overlord._maps.values():
+        _save_map(writer, map_, indices)
+
+    for role in ROLES:
+        idle = overlord._idle_drones.get(role, {})
+        writer.ints(indices[id(drone)] for drone in idle)
+    tasked = overlord._tasked_miners
+    writer.ints(map_.map_id for map_, _ in tasked)
+    writer.ints(indices[id(drone)] for _, drone in tasked)
+    updates = _drain(overlord._update_queue)
+    writer.ints(map_.map_id for map_, _, _ in updates)
+    writer.ints(indices[id(drone)] for _, drone, _ in updates)
+    writer.ints(
+        chain.from_iterable(
+            (context.x, context.y) for _, _, context in updates
+        )
+    )
+    writer.blob(
+        "".join("".join(context[2:6]) for _, _, context in updates).encode(
+            "ascii"
+        )
+    )
+    pickups = _drain(overlord._pickup_queue)
+    writer.ints(map_.map_id for map_, _ in pickups)
+    writer.ints(indices[id(drone)] for _, drone in pickups)
+
+
+def _save_drone(writer: _Writer, drone: Drone, map_: Optional[Map]) -> None:
+    role = next(
+        index for index, role in enumerate(ROLES) if isinstance(drone, role)
+    )
+    writer.pack(
+        DRONE.format,
+        role,
+        drone.max_health,
+        drone.max_capacity,
+        drone.max_moves,
+        drone.health,
+        drone._capacity,
+        STATES.index(drone.state),
+        drone._steps,
+        *drone.position,
+        map_ is not None,
+        map_.map_id if map_ else 0,
+    )
+    writer.coordinates(drone.path)
+    path = drone._path
+    writer.coordinates([] if path is None else path.traveled())
+    previous = drone._previous_tile
+    writer.coordinates([previous.coordinate] if previous else [])
+    mineral = getattr(drone, "_mineral_location", None)
+    writer.coordinates([mineral] if mineral else [])
+    writer.blob(getattr(drone, "_mineral_direction", "").encode("ascii"))
+
+
+def _save_map(writer: _Writer, map_: Map, indices: Dict[int, int]) -> None:
+    writer.pack("<id", map_.map_id, map_.density)
+    writer.coordinates([map_.origin] if map_.origin else [])
+    writer.pack("<i", map_.scout_count)
+    chunks = list(map_._grid.chunks())
+    writer.coordinates(key for key, _ in chunks)
+    writer.blob(zlib.compress(b"".join(cells for _, cells in chunks)))
+    writer.coordinates(map_.frontier())
+    writer.coordinates(map_.untasked_minerals)
+    writer.coordinates(map_.tasked_minerals)
+    occupancy = [
+        (coordinate, indices[id(drone)])
+        for coordinate, drone in map_._grid.occupancy.items()
+        if id(drone) in indices
+    ]
+    writer.coordinates(coordinate for coordinate, _ in occupancy)
+    writer.ints(index for _, index in occupancy)
+    targets = [
+        (indices[drone_id], target)
+        for drone_id, target in map_.scout_targets.items()
+        if drone_id in indices
+    ]
+    writer.ints(index for index, _ in targets)
+    writer.coordinates(target for _, target in targets)
+
+    reservations = map_.reservations
+    writer.pack("<i", reservations.tick)
+    held = [
+        (key, indices[owner])
+        for key, owner in reservations._cells.items()
+        if owner in indices
+    ]
+    writer.coordinates(coordinate for (coordinate, _), _ in held)
+    writer.ints(tick for (_, tick), _ in held)
+    writer.ints(owner for _, owner in held)
+    edges = [
+        (key, indices[owner])
+        for key, owner in reservations._edges.items()
+        if owner in indices
+    ]
+    writer.coordinates(origin for (origin, _, _), _ in edges)
+    writer.coordinates(target for (_, target, _), _ in edges)
+    writer.ints(tick for (_, _, tick), _ in edges)
+    writer.ints(owner for _, owner in edges)
+    writer.ints(
+        indices[drone_id]
+        for drone_id in reservations._by_drone
+        if drone_id in indices
+    )
+
+    # a new tree may break ties between paths differently, so it is kept
+    tree = map_._origin_tree
+    writer.coordinates([tree.root] if tree else [])
+    if tree:
+        parents, changed = tree.state()
+        writer.coordinates(parents)
+        # a parent is a neighbour, kept as its index among the cardinals
+        writer.blob(
+            bytes(
+                coordinate.cardinals().index(parent)
+                for coordinate, (parent, _) in parents.items()
+            )
+        )
+        writer.floats(distance for _, distance in parents.values())
+        writer.coordinates(changed)
+
+
+def load_snapshot(stream: BinaryIO, dashboard: Dashboard) -> Overlord:
+    """Read an Overlord back from a snapshot.
+
+    Args:
+        stream (BinaryIO): The snapshot.
+        dashboard (Dashboard): The dashboard of the loaded Overlord.
+
+    Raises:
+        ValueError: If the stream is not a snapshot this version can read.
+
+    Returns:
+        Overlord: The Overlord, with new drones in the saved states.
+    """
+    reader = _Reader(stream)
+    magic, version, seed, length = reader.unpack(HEADER.format)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} Overlord snapshot")
+    strategy = Strategy.decode(stream.read(length))
+    # the fleet is bought with no minerals, then replaced with the saved one
+    overlord = Overlord(0, 0, dashboard, strategy, seed)
+    overlord.drones.clear()
+    overlord.fleet = Fleet()
+    overlord._deployed.clear()
+    overlord._idle_drones = {role: {} for role in ROLES}
+    random_version, *state, has_gauss, gauss = reader.unpack(RANDOM.format)
+    overlord._random.setstate(
+        (random_version, tuple(state), gauss if has_gauss else None)
+    )
+
+    (count,) = reader.unpack("<I")
+    drone_classes: Dict[tuple, Type[Drone]] = {}
+    saved = [
+        _load_drone(reader, overlord, drone_classes) for _ in range(count)
+    ]
+    drones = [drone for drone, _ in saved]
+
+    (count,) = reader.unpack("<I")
+    for _ in range(count):
+        map_ = _load_map(reader, drones)
+        overlord._maps[map_.map_id] = map_
+    for drone, map_id in saved:
+        map_ = overlord._maps[map_id] if map_id is not None else None
+        overlord._deployed[id(drone)] = map_
+        drone.map = map_
+        if map_ and (previous := drone._previous_tile) is not None:
+            drone._previous_tile = map_.get(previous, None)
+        else:
+            drone._previous_tile = None
+
+    for role in ROLES:
+        for index in reader.ints():
+            overlord._idle_drones[role][drones[index]] = None
+    for map_id, index in zip(reader.ints(), reader.ints()):
+        overlord._tasked_miners.append(
+            (overlord._maps[map_id], drones[index])
+        )
+    map_ids, owners, positions = reader.ints(), reader.ints(), reader.ints()
+    icons = reader.blob().decode("ascii")
+    for number, (map_id, index) in enumerate(zip(map_ids, owners)):
+        x, y = positions[2 * number : 2 * number + 2]
+        context = Context(x, y, *icons[4 * number : 4 * number + 4])
+        overlord._update_queue.put(
+            (overlord._maps[map_id], drones[index], context)
+        )
+    for map_id, index in zip(reader.ints(), reader.ints()):
+        overlord._pickup_queue.put((overlord._maps[map_id], drones[index]))
+
+    for map_ in overlord._maps.values():
+        dashboard.create_map_gui(map_)
+    dashboard.update_drone_table(overlord.drones.values())
+    return overlord
+
+
+def _load_drone(
+    reader: _Reader,
+    overlord: Overlord,
+    drone_classes: Dict[tuple, Type[Drone]],
+) -> Tuple[Drone, Optional[int]]:
+    """Create a drone in its saved state, and return it with its map id.
+
+    Its previous tile is left as a coordinate until the maps are loaded.
+    """
+    (
+        role,
+        *stats,
+        health,
+        carried,
+        state,
+        steps,
+        x,
+        y,
+        deployed,
+        map_id,
+    ) = reader.unpack(DRONE.format)
+    key = (role, *stats)
+    if key not in drone_classes:
+        base = ROLES[role]
+        drone_classes[key] = Drone.drone_blueprint(
+            *stats, f"Custom {base.__name__[:-5]}", base
+        )
+    drone = drone_classes[key](overlord, overlord.fleet)
+    overlord.drones[id(drone)] = drone
+    drone._health = health
+    drone._capacity = carried
+    drone.state = STATES[state]
+    drone._steps = steps
+    overlord.fleet.x[drone.slot] = x
+    overlord.fleet.y[drone.slot] = y
+    ahead, traveled = reader.coordinates(), reader.coordinates()
+    if ahead or traveled:
+        drone._path = Path.resume(ahead, traveled)
+    drone._previous_tile = reader.coordinate()
+    mineral = reader.coordinate()
+    direction = reader.blob().decode("ascii")
+    if isinstance(drone, MinerDrone):
+        drone._mineral_location = mineral
+        if direction:
+            drone._mineral_direction = direction
+    return drone, map_id if deployed else None
+
+
+def _load_map(reader: _Reader, drones: List[Drone]) -> Map:
+    map_id, density = reader.unpack("<id")
+    map_ = Map(map_id, density)
+    map_.origin = reader.coordinate()
+    (map_.scout_count,) = reader.unpack("<i")
+    keys = reader.coordinates()
+    cells = zlib.decompress(reader.blob())
+    size = Grid.CHUNK_SIZE * Grid.CHUNK_SIZE
+    map_._grid = Grid.from_chunks(
+        (key, cells[index * size:(index + 1) * size])
+        for index, key in enumerate(keys)
+    )
+    map_._frontier = set(reader.coordinates())
+    for mineral in reader.coordinates():
+        map_.untasked_minerals.add(mineral)
+    map_.tasked_minerals = set(reader.coordinates())
+    occupied = reader.coordinates()
+    map_._grid.occupancy = {
+        coordinate: drones[index]
+        for coordinate, index in zip(occupied, reader.ints())
+    }
+    scouts = reader.ints()
+    map_.scout_targets = {
+        id(drones[index]): target
+        for index, target in zip(scouts, reader.coordinates())
+    }
+
+    reservations = map_.reservations
+    (reservations.tick,) = reader.unpack("<i")
+    coordinates, ticks = reader.coordinates(), reader.ints()
+    for coordinate, tick, index in zip(coordinates, ticks, reader.ints()):
+        _reserve(reservations, (coordinate, tick), id(drones[index]))
+    origins, targets = reader.coordinates(), reader.coordinates()
+    ticks = reader.ints()
+    for origin, target, tick, index in zip(
+        origins, targets, ticks, reader.ints()
+    ):
+        _reserve(reservations, (origin, target, tick), id(drones[index]))
+    for index in reader.ints():
+        reservations._by_drone.setdefault(id(drones[index]), [])
+
+    if (root := reader.coordinate()) is not None:
+        coordinates, directions = reader.coordinates(), reader.blob()
+        parents = (
+            coordinate.cardinals()[direction]
+            for coordinate, direction in zip(coordinates, directions)
+        )
+        map_._origin_tree = ShortestPathTree.restore(
+            map_.terrain_weight,
+            root,
+            dict(zip(coordinates, zip(parents, reader.floats()))),
+            reader.coordinates(),
+        )
+    return map_
+
+
+def _reserve(
+    reservations: ReservationTable, key: tuple, drone_id: int
+) -> None:
+    """Restore a single cell or edge reservation."""
+    table = reservations._cells if len(key) == 2 else reservations._edges
+    table[key] = drone_id
+    reservations._by_drone.setdefault(drone_id, []).append(key)
+    reservations._by_tick.setdefault(key[-1], []).append(key)
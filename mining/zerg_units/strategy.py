@@ -0,0 +1,79 @@
+"""How the Overlord spends its refined minerals on drones."""
+
+from __future__ import annotations
+
+import json
+from typing import NamedTuple, Optional, Tuple
+
+
+class Upgrade(NamedTuple):
+    """A stat upgrade bought for every drone of a role.
+
+    Attributes:
+        role (str): "Scout" or "Miner".
+        stat (str): "health", "capacity" or "moves".
+        step (int): How much the stat grows by per purchase.
+        cost (int): Minerals per drone per purchase.
+        limit (Optional[int]): The stat is not upgraded past this value,
+            None for no limit.
+    """
+
+    role: str
+    stat: str
+    step: int
+    cost: int
+    limit: Optional[int] = None
+
+
+class Strategy(NamedTuple):
+    """How the Overlord spends its refined minerals on drones.
+
+    Drones are bought first, up to max_drones, and the minerals left over
+    buy upgrades. The first upgrade in the order that has not reached its
+    limit is bought for every drone of its role, until one can no longer
+    be afforded.
+
+    Attributes:
+        max_drones (int): The most drones to buy.
+        scout_share (float): The share of drones that are scouts; there is
+            always at least one.
+        drone_cost (int): Minerals per drone with the base stats.
+        base_stats (Tuple[int, int, int]): Health, capacity and moves of a
+            drone before upgrades.
+        upgrades (Tuple[Upgrade, ...]): The upgrade order.
+    """
+
+    max_drones: int = 12
+    scout_share: float = 0.5
+    drone_cost: int = 5
+    base_stats: Tuple[int, int, int] = (10, 5, 1)
+    upgrades: Tuple[Upgrade, ...] = (
+        Upgrade("Scout", "health", 10, 1, 40),
+        Upgrade("Miner", "capacity", 5, 1, 10),
+        Upgrade("Miner", "health", 10, 1, 40),
+        Upgrade("Miner", "moves", 1, 3, 2),
+        Upgrade("Scout", "health", 10, 1),
+    )
+
+    def encode(self) -> bytes:
+        """Return the strategy as compact JSON, for logs and snapshots.
+
+        Returns:
+            bytes: The encoded strategy.
+        """
+        return json.dumps(self, separators=(",", ":")).encode("ascii")
+
+    @classmethod
+    def decode(cls, data: bytes) -> Strategy:
+        """Return a strategy from its encoding.
+
+        Args:
+            data (bytes): The strategy, as returned by encode.
+
+        Returns:
+            Strategy: The strategy.
+        """
+        fields = json.loads(data)
+        fields[3] = tuple(fields[3])
+        fields[4] = tuple(Upgrade(*upgrade) for upgrade in fields[4])
+        return cls(*fields)
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 class Zerg(ABC):
     """Abstract base class for all zerg units."""
 
+    __slots__ = ()
+
     def __init__(self, health: int) -> None:
         """Initialize a zerg unit.
 